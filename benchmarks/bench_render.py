@@ -0,0 +1,414 @@
+"""
+bench_render - Rendering benchmarks for displayio.py under CPython.
+
+Builds representative scenes at several resolutions, renders them through
+``HeadlessDisplay.refresh()`` and reports frames/sec, ns/pixel and the
+peak memory each refresh allocates.
+
+Usage::
+
+    python benchmarks/bench_render.py                      # all scenes
+    python benchmarks/bench_render.py --scene radiator --size 800x480
+    python benchmarks/bench_render.py --json after.json --compare before.json
+    python benchmarks/bench_render.py --backend python     # without NumPy
+
+``--json`` writes machine-readable results; ``--compare`` prints the
+speed-up of each result relative to a previously written JSON file, so a
+regression between two commits shows up as a ratio below 1.
+
+Each scene is measured twice: ``full`` forces a complete redraw on every
+frame, ``tick`` applies a small scene update (where the scene defines one)
+and lets the display repaint only what changed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_HERE, "..", "src"))
+sys.path.insert(0, os.path.join(_HERE, "..", "examples"))
+
+import displayio  # noqa: E402
+import vectorio  # noqa: E402
+
+DEFAULT_SIZES = ((320, 240), (480, 320), (800, 480))
+
+
+# ---------------------------------------------------------------------------
+# Scene generators
+#
+# Each generator takes a display and returns ``(root_group, tick)`` where
+# ``tick`` is a callable applying one frame's worth of changes, or None.
+# ---------------------------------------------------------------------------
+
+def _palette(colors, transparent=()):
+    palette = displayio.Palette(len(colors))
+    for index, color in enumerate(colors):
+        palette[index] = color
+    for index in transparent:
+        palette.make_transparent(index)
+    return palette
+
+
+def _solid(width, height, palette, index=0, x=0, y=0):
+    bitmap = displayio.Bitmap(width, height, len(palette))
+    bitmap.fill(index)
+    return displayio.TileGrid(bitmap, pixel_shader=palette, x=x, y=y)
+
+
+def scene_radiator(display):
+    """The dashboard from ``examples/radiator.py``, ticking its counters."""
+    import radiator
+
+    root, panels, _ = radiator.build_display(display)
+    state = {"cash": 650, "pops": 0}
+
+    def tick():
+        state["cash"] += 125
+        state["pops"] += 350
+        panels["cash"].set_value("$%d" % state["cash"])
+        panels["pops"].set_value(str(state["pops"]))
+
+    return root, tick
+
+
+def scene_sprites(display, count=2000, size=8):
+    """Thousands of small opaque sprites scattered over a background."""
+    rng = random.Random(1)
+    palette = _palette([0x101010, 0xFF0000, 0x00FF00, 0x0000FF, 0xFFFF00])
+    root = displayio.Group()
+    root.append(_solid(display.width, display.height, palette))
+    sprites = []
+    for i in range(count):
+        sprite = _solid(
+            size, size, palette, 1 + i % 4,
+            rng.randrange(display.width), rng.randrange(display.height),
+        )
+        sprites.append(sprite)
+        root.append(sprite)
+
+    def tick():
+        for sprite in sprites[:20]:
+            sprite.x = (sprite.x + 3) % display.width
+
+    return root, tick
+
+
+def scene_nested(display, depth=64):
+    """A deep chain of nested Groups, each adding an offset and a sprite."""
+    palette = _palette([0x203040, 0xE0C020])
+    root = displayio.Group()
+    root.append(_solid(display.width, display.height, palette))
+    group = root
+    leaves = []
+    for _ in range(depth):
+        child = displayio.Group(x=2, y=1)
+        leaf = _solid(16, 16, palette, 1)
+        leaves.append(leaf)
+        child.append(leaf)
+        group.append(child)
+        group = child
+
+    def tick():
+        leaf = leaves[-1]
+        leaf.bitmap[0, 0] = 1 - leaf.bitmap[0, 0]
+
+    return root, tick
+
+
+def scene_opaque_layers(display, layers=4):
+    """Several full-screen opaque layers stacked on top of each other."""
+    root = displayio.Group()
+    for i in range(layers):
+        palette = _palette([0x111111 * (i + 1)])
+        root.append(_solid(display.width, display.height, palette))
+    return root, None
+
+
+def scene_transparent_sprites(display, count=200, radius=12):
+    """Mostly-transparent circle sprites, like ``circle_tilegrid``."""
+    rng = random.Random(2)
+    root = displayio.Group()
+    root.append(_solid(display.width, display.height, _palette([0x000020])))
+    size = radius * 2 + 1
+    circles = []
+    for i in range(count):
+        palette = _palette([0x000000, 0x5BC0EB + i], transparent=(0,))
+        bitmap = displayio.Bitmap(size, size, 2)
+        for py in range(size):
+            for px in range(size):
+                dx = px - radius
+                dy = py - radius
+                if dx * dx + dy * dy <= radius * radius:
+                    bitmap[px, py] = 1
+        circle = displayio.TileGrid(
+            bitmap, pixel_shader=palette,
+            x=rng.randrange(display.width), y=rng.randrange(display.height),
+        )
+        circles.append(circle)
+        root.append(circle)
+
+    def tick():
+        for circle in circles[:10]:
+            circle.y = (circle.y + 2) % display.height
+
+    return root, tick
+
+
+def scene_shapes(display, count=200, radius=12):
+    """The ``transparent_sprites`` circles as ``vectorio`` shapes."""
+    rng = random.Random(2)
+    root = displayio.Group()
+    root.append(vectorio.Rectangle(
+        pixel_shader=_palette([0x000020]),
+        width=display.width, height=display.height,
+    ))
+    circles = []
+    for i in range(count):
+        circle = vectorio.Circle(
+            pixel_shader=_palette([0x5BC0EB + i]), radius=radius,
+            x=rng.randrange(display.width) + radius,
+            y=rng.randrange(display.height) + radius,
+        )
+        circles.append(circle)
+        root.append(circle)
+
+    def tick():
+        for circle in circles[:10]:
+            circle.y = (circle.y + 2) % display.height
+
+    return root, tick
+
+
+def scene_cached_shapes(display, count=200, radius=12):
+    """Static ``shapes`` circles in a cached Group, under a moving sprite."""
+    rng = random.Random(2)
+    root = displayio.Group()
+    backdrop = displayio.Group(cache=True)
+    backdrop.append(vectorio.Rectangle(
+        pixel_shader=_palette([0x000020]),
+        width=display.width, height=display.height,
+    ))
+    for i in range(count):
+        backdrop.append(vectorio.Circle(
+            pixel_shader=_palette([0x5BC0EB + i]), radius=radius,
+            x=rng.randrange(display.width) + radius,
+            y=rng.randrange(display.height) + radius,
+        ))
+    root.append(backdrop)
+    sprite = vectorio.Rectangle(
+        pixel_shader=_palette([0xFFFFFF]), width=2 * radius, height=2 * radius,
+    )
+    root.append(sprite)
+
+    def tick():
+        sprite.x = (sprite.x + 7) % display.width
+        sprite.y = (sprite.y + 5) % display.height
+
+    return root, tick
+
+
+def scene_ticker(display, items=400, item_width=120):
+    """A long scrolling ticker: a wide strip of labels, mostly off-screen."""
+    palette = _palette([0x000000, 0xF7F1E1, 0x1E7D37], transparent=(0,))
+    root = displayio.Group()
+    root.append(_solid(display.width, display.height, _palette([0x0B1F12])))
+    strip = displayio.Group(y=display.height // 2)
+    for i in range(items):
+        item = displayio.Group(x=i * item_width)
+        item.append(_solid(item_width - 8, 20, palette, 2))
+        item.append(_solid(item_width - 24, 8, palette, 1, x=8, y=6))
+        strip.append(item)
+    root.append(strip)
+
+    def tick():
+        strip.x -= 4
+
+    return root, tick
+
+
+SCENES = {
+    "radiator": scene_radiator,
+    "sprites": scene_sprites,
+    "nested": scene_nested,
+    "opaque_layers": scene_opaque_layers,
+    "transparent_sprites": scene_transparent_sprites,
+    "shapes": scene_shapes,
+    "cached_shapes": scene_cached_shapes,
+    "ticker": scene_ticker,
+}
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def _time_frames(display, prepare, min_time, min_frames):
+    """Run ``prepare(); display.refresh()`` repeatedly; return seconds per
+    frame, excluding the time spent in *prepare*."""
+    frames = 0
+    elapsed = 0.0
+    while frames < min_frames or elapsed < min_time:
+        prepare()
+        start = time.perf_counter()
+        display.refresh()
+        elapsed += time.perf_counter() - start
+        frames += 1
+    return elapsed / frames
+
+
+def _peak_allocation(display, prepare, frames=3):
+    """Return the mean peak of memory allocated during each refresh, in
+    KiB above what was allocated when it started.
+
+    Memory allocated and freed within the refresh counts, so a frame
+    buffer built and thrown away every frame shows up here as well as
+    anything the refresh keeps; a renderer that reuses its buffers
+    stays near 0.
+    """
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(frames):
+            prepare()
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            display.refresh()
+            total += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return total / frames / 1024
+
+
+def run_benchmark(scene, width, height, min_time=0.5, min_frames=3,
+                  workers=None):
+    """Benchmark one scene at one resolution; return a list of results."""
+    display = displayio.HeadlessDisplay(
+        width, height, auto_refresh=False, workers=workers
+    )
+    root, tick = SCENES[scene](display)
+    display.show(root)
+    display.refresh()
+
+    def force_full():
+        display._drawn = None
+
+    modes = [("full", force_full)]
+    if tick is not None:
+        modes.append(("tick", tick))
+
+    results = []
+    for mode, prepare in modes:
+        seconds = _time_frames(display, prepare, min_time, min_frames)
+        results.append({
+            "scene": scene,
+            "mode": mode,
+            "width": width,
+            "height": height,
+            "fps": 1.0 / seconds if seconds else float("inf"),
+            "ms_per_frame": seconds * 1e3,
+            "ns_per_pixel": seconds * 1e9 / (width * height),
+            "peak_kib_per_refresh": _peak_allocation(display, prepare),
+        })
+    display.close()
+    return results
+
+
+def _result_key(result):
+    return "%s/%s/%dx%d" % (
+        result["scene"], result["mode"], result["width"], result["height"]
+    )
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=_HERE,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_size(text):
+    width, _, height = text.lower().partition("x")
+    return int(width), int(height)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--scene", action="append", choices=sorted(SCENES),
+        help="scene to run (repeatable; default: all)",
+    )
+    parser.add_argument(
+        "--size", action="append", type=_parse_size,
+        help="resolution WxH (repeatable; default: 320x240, 480x320, 800x480)",
+    )
+    parser.add_argument(
+        "--min-time", type=float, default=0.5,
+        help="minimum seconds to sample each measurement (default: 0.5)",
+    )
+    parser.add_argument(
+        "--backend", choices=("python", "numpy"),
+        help="render backend (default: numpy when installed)",
+    )
+    parser.add_argument(
+        "--workers", type=int,
+        help="render large refreshes with this many worker processes",
+    )
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument(
+        "--compare", help="JSON results from an earlier run to compare against"
+    )
+    args = parser.parse_args(argv)
+    if args.backend:
+        displayio.set_render_backend(args.backend)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {_result_key(r): r for r in json.load(f)["results"]}
+
+    results = []
+    print("%-34s %10s %12s %10s %12s%s" % (
+        "benchmark", "fps", "ms/frame", "ns/pixel", "peak KiB",
+        "  vs baseline" if baseline else "",
+    ))
+    for scene in args.scene or sorted(SCENES):
+        for width, height in args.size or DEFAULT_SIZES:
+            for result in run_benchmark(
+                scene, width, height, args.min_time, workers=args.workers
+            ):
+                results.append(result)
+                key = _result_key(result)
+                line = "%-34s %10.1f %12.2f %10.1f %12.1f" % (
+                    key, result["fps"], result["ms_per_frame"],
+                    result["ns_per_pixel"], result["peak_kib_per_refresh"],
+                )
+                if key in baseline:
+                    line += "  %10.2fx" % (
+                        baseline[key]["ms_per_frame"] / result["ms_per_frame"]
+                    )
+                print(line)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "revision": _git_revision(),
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "backend": displayio.get_render_backend(),
+                "results": results,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
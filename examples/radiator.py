@@ -1,12 +1,17 @@
 """
 Bloons TD6 themed information radiator for web-displayio (Pyodide).
 No MQTT and no busy loop; demo values update on a JS interval.
-"""
 
-import js
-from pyodide.ffi import create_proxy
+Call :func:`run` to start the demo in the browser, or await
+:func:`run_async` for the same demo written as a coroutine.  Importing
+the module has no side effects, so :func:`build_display` can also be
+used under plain CPython (e.g. with ``displayio.HeadlessDisplay``).
+"""
 
 import displayio
+import fontio
+import vectorio
+from adafruit_display_text import bitmap_label
 
 # Display colors
 PALETTE = displayio.Palette(8)
@@ -369,75 +374,56 @@ FONT_5X7 = {
 }
 
 
-def solid_tilegrid(width, height, color_index, x=0, y=0):
-    bitmap = displayio.Bitmap(width, height, len(PALETTE))
-    bitmap.fill(color_index)
-    return displayio.TileGrid(bitmap, pixel_shader=PALETTE, x=x, y=y)
+FONT = fontio.BuiltinFont.from_rows(
+    FONT_5X7, FONT_WIDTH + FONT_SPACING, FONT_HEIGHT
+)
+
+
+def solid_rect(width, height, color_index, x=0, y=0):
+    return vectorio.Rectangle(
+        pixel_shader=PALETTE, width=width, height=height, x=x, y=y,
+        color_index=color_index,
+    )
 
 
-def circle_tilegrid(radius, color, x=0, y=0):
-    size = radius * 2 + 1
-    bitmap = displayio.Bitmap(size, size, 2)
-    palette = displayio.Palette(2)
-    palette[0] = 0x000000
-    palette[1] = color
-    palette.make_transparent(0)
-    for py in range(size):
-        for px in range(size):
-            dx = px - radius
-            dy = py - radius
-            if dx * dx + dy * dy <= radius * radius:
-                bitmap[px, py] = 1
-    return displayio.TileGrid(bitmap, pixel_shader=palette, x=x, y=y)
+def circle(radius, color_index, x=0, y=0):
+    """A filled circle whose bounding box has its top-left corner at x, y."""
+    return vectorio.Circle(
+        pixel_shader=PALETTE, radius=radius, x=x + radius, y=y + radius,
+        color_index=color_index,
+    )
 
 
 class TextLabel:
+    """Upper-case text in the 5x7 font with its top-left corner at x, y."""
+
     def __init__(self, text, x, y, color, scale=1, max_chars=None):
-        self.scale = max(1, int(scale))
         self.max_chars = max_chars or len(text)
-        self.char_width = FONT_WIDTH + FONT_SPACING
-        width = (self.char_width * self.max_chars - FONT_SPACING) * self.scale
-        height = FONT_HEIGHT * self.scale
-
-        self.bitmap = displayio.Bitmap(width, height, 2)
-        self.palette = displayio.Palette(2)
-        self.palette[0] = 0x000000
-        self.palette[1] = color
-        self.palette.make_transparent(0)
-        self.tilegrid = displayio.TileGrid(self.bitmap, pixel_shader=self.palette, x=x, y=y)
+        self.group = bitmap_label.Label(
+            FONT,
+            color=color,
+            scale=max(1, int(scale)),
+            anchor_point=(0, 0),
+            anchored_position=(x, y),
+        )
         self.set_text(text)
 
     def set_text(self, text):
-        text = (text or "").upper()[: self.max_chars]
-        padded = text.ljust(self.max_chars)
-        self.bitmap.fill(0)
-        x = 0
-        for ch in padded:
-            self._draw_char(ch, x, 0, 1)
-            x += self.char_width * self.scale
-
-    def _draw_char(self, ch, x, y, color_index):
-        pattern = FONT_5X7.get(ch, FONT_5X7[" "])
-        for row, line in enumerate(pattern):
-            for col, bit in enumerate(line):
-                if bit == "1":
-                    for dy in range(self.scale):
-                        for dx in range(self.scale):
-                            self.bitmap[
-                                x + col * self.scale + dx,
-                                y + row * self.scale + dy,
-                            ] = color_index
+        self.group.text = (text or "").upper()[: self.max_chars]
 
 
 class StatPanel:
     def __init__(self, title, value, x, y, width, height, value_scale=2):
         self.group = displayio.Group(x=x, y=y)
 
-        self.group.append(solid_tilegrid(width, height, 3))
-        self.group.append(solid_tilegrid(width - 4, height - 4, 2, x=2, y=2))
+        # The border, fill and title never change: draw them from a cache.
+        frame = displayio.Group(cache=True)
+        frame.append(solid_rect(width, height, 3))
+        frame.append(solid_rect(width - 4, height - 4, 2, x=2, y=2))
 
         title_label = TextLabel(title, 10, 8, PALETTE[5], max_chars=10)
-        self.group.append(title_label.tilegrid)
+        frame.append(title_label.group)
+        self.group.append(frame)
 
         self.value_label = TextLabel(
             value,
@@ -447,7 +433,7 @@ class StatPanel:
             scale=value_scale,
             max_chars=8,
         )
-        self.group.append(self.value_label.tilegrid)
+        self.group.append(self.value_label.group)
 
     def set_value(self, value):
         self.value_label.set_text(value)
@@ -456,9 +442,9 @@ class StatPanel:
 class StatusBadge:
     def __init__(self, x, y):
         self.group = displayio.Group(x=x, y=y)
-        self.group.append(solid_tilegrid(140, 26, 6))
+        self.group.append(solid_rect(140, 26, 6))
         self.label = TextLabel("WEB DEMO", 10, 8, PALETTE[4], max_chars=10)
-        self.group.append(self.label.tilegrid)
+        self.group.append(self.label.group)
 
     def set_text(self, text):
         self.label.set_text(text)
@@ -466,14 +452,14 @@ class StatusBadge:
 
 class BloonTrack:
     def __init__(self, x, y, width, height):
-        self.group = displayio.Group(x=x, y=y)
-        self.group.append(solid_tilegrid(width, height, 3))
-        self.group.append(solid_tilegrid(width - 4, height - 4, 2, x=2, y=2))
+        self.group = displayio.Group(x=x, y=y, cache=True)
+        self.group.append(solid_rect(width, height, 3))
+        self.group.append(solid_rect(width - 4, height - 4, 2, x=2, y=2))
 
         title_label = TextLabel("BLOON TRACK", 10, 8, PALETTE[5], max_chars=12)
-        self.group.append(title_label.tilegrid)
+        self.group.append(title_label.group)
 
-        track = solid_tilegrid(width - 40, 6, 1, x=20, y=height // 2)
+        track = solid_rect(width - 40, 6, 1, x=20, y=height // 2)
         self.group.append(track)
 
         bloon_count = 6
@@ -481,11 +467,11 @@ class BloonTrack:
         end_x = max(start_x + 1, width - 40)
         spacing = (end_x - start_x) // (bloon_count - 1)
         offsets = [-12, 6, -8, 10, -6, 4]
-        colors = [PALETTE[7], PALETTE[6], PALETTE[5], PALETTE[7], PALETTE[6], PALETTE[5]]
+        colors = [7, 6, 5, 7, 6, 5]
         for index in range(bloon_count):
             bx = start_x + spacing * index
             by = height // 2 + offsets[index]
-            self.group.append(circle_tilegrid(14, colors[index], x=bx, y=by))
+            self.group.append(circle(14, colors[index], x=bx, y=by))
 
 
 def build_display(display):
@@ -493,13 +479,13 @@ def build_display(display):
     width = display.width
     height = display.height
 
-    root.append(solid_tilegrid(width, height, 0))
+    root.append(solid_rect(width, height, 0))
 
     header_height = 40
-    root.append(solid_tilegrid(width, header_height, 1))
+    root.append(solid_rect(width, header_height, 1))
 
     title = TextLabel("BLOONS TD6 COMMAND", 16, 10, PALETTE[4], max_chars=20)
-    root.append(title.tilegrid)
+    root.append(title.group)
 
     status_badge = StatusBadge(width - 160, 7)
     root.append(status_badge.group)
@@ -552,6 +538,9 @@ def build_display(display):
 
 
 def run():
+    import js
+    from pyodide.ffi import create_proxy
+
     canvas = js.document.getElementById("display")
     display = displayio.Display(canvas, auto_refresh=False)
 
@@ -584,4 +573,32 @@ def run():
     js.setInterval(tick_proxy, 1500)
 
 
-run()
+async def run_async(interval=1.5):
+    import asyncio
+    import js
+
+    canvas = js.document.getElementById("display")
+    display = displayio.Display(canvas)
+
+    root, panels, status_badge = build_display(display)
+    display.show(root)
+    status_badge.set_text("ASYNC DEMO")
+
+    demo_round = 1
+    demo_cash = 650
+    demo_lives = 100
+    demo_pops = 0
+
+    while True:
+        await asyncio.sleep(interval)
+        demo_round = min(99, demo_round + 1)
+        demo_cash += 125
+        demo_lives = max(1, demo_lives - 1)
+        demo_pops += 350
+
+        panels["round"].set_value(f"{demo_round:02d}")
+        panels["cash"].set_value(f"${demo_cash}")
+        panels["lives"].set_value(str(demo_lives))
+        panels["pops"].set_value(str(demo_pops))
+        # Auto refresh draws all four panels on the next frame.
+        await display.next_frame()
@@ -0,0 +1,61 @@
+"""
+Serve the radiator dashboard to stream viewers.
+
+Run from the repository root, then open examples/stream-viewer.html
+(served over HTTP) in one or more browsers::
+
+    python examples/stream_radiator.py --port 8765
+"""
+
+import argparse
+import os
+import sys
+import time
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_HERE, "..", "src"))
+
+import radiator  # noqa: E402
+import stream_display  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--interval", type=float, default=1.5,
+                        help="seconds between ticks (default: 1.5)")
+    args = parser.parse_args(argv)
+
+    display = stream_display.StreamDisplay(
+        800, 480, host=args.host, port=args.port, auto_refresh=False
+    )
+    root, panels, status_badge = radiator.build_display(display)
+    display.show(root)
+    status_badge.set_text("STREAMED")
+    display.refresh()
+    print("serving on ws://%s:%d" % display.address)
+
+    tick = 0
+    try:
+        while True:
+            time.sleep(args.interval)
+            tick += 1
+            panels["round"].set_value("%02d" % min(99, 1 + tick))
+            panels["cash"].set_value("$%d" % (650 + 125 * tick))
+            panels["lives"].set_value(str(max(1, 100 - tick)))
+            panels["pops"].set_value(str(350 * tick))
+            display.refresh()
+            stats = display.stats()
+            print("%d viewers, %.0f bytes/frame, %.1f ms latency" % (
+                stats["viewers"], stats["bytes_per_frame"],
+                stats["latency_ms"],
+            ))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        display.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+"""
+adafruit_bitmap_font - BDF and PCF font loading for beady-eye.
+
+A pure Python stand-in for the CircuitPython library of the same name::
+
+    from adafruit_bitmap_font import bitmap_font
+
+    font = bitmap_font.load_font("fonts/helvB12.bdf")
+
+Glyphs are decoded lazily, the first time each is asked for, into packed
+1-bit :class:`displayio.Bitmap` objects (see :mod:`fontio`).
+"""
@@ -0,0 +1,99 @@
+"""
+bdf - Glyph Bitmap Distribution Format (BDF) font loader.
+
+The file is read once and indexed by ``ENCODING``; each glyph's
+``BITMAP`` section is decoded only when the glyph is first requested.
+"""
+
+import displayio
+import fontio
+
+from .glyph_cache import GlyphCache
+
+
+class BDF(GlyphCache):
+    """A font loaded from BDF text.
+
+    Args:
+        source (str): The contents of a ``.bdf`` file.
+        bitmap_class: Bitmap type to decode glyphs into.
+    """
+
+    def __init__(self, source, bitmap_class=displayio.Bitmap):
+        super().__init__()
+        self._source = source
+        self._bitmap_class = bitmap_class
+        self._boundingbox = (0, 0, 0, 0)
+        self.ascent = None
+        self.descent = None
+        self.point_size = None
+        self._index = {}
+        header_end = source.find("\nSTARTCHAR")
+        if header_end == -1:
+            header_end = len(source)
+        self._parse_header(source[:header_end])
+        self._index_glyphs(header_end)
+
+    def _parse_header(self, header):
+        for line in header.splitlines():
+            key, _, value = line.strip().partition(" ")
+            if key == "FONTBOUNDINGBOX":
+                self._boundingbox = tuple(int(v) for v in value.split())
+            elif key == "FONT_ASCENT":
+                self.ascent = int(value)
+            elif key == "FONT_DESCENT":
+                self.descent = int(value)
+            elif key == "SIZE":
+                self.point_size = int(value.split()[0])
+        width, height, _, y_offset = self._boundingbox
+        if self.ascent is None:
+            self.ascent = height + y_offset
+        if self.descent is None:
+            self.descent = -y_offset
+
+    def _index_glyphs(self, start):
+        source = self._source
+        while True:
+            start = source.find("\nSTARTCHAR", start)
+            if start == -1:
+                return
+            encoding = source.find("\nENCODING ", start)
+            if encoding == -1:
+                return
+            end = source.find("\n", encoding + 1)
+            fields = source[encoding + 10:end].split()
+            code_point = int(fields[0])
+            if code_point == -1 and len(fields) > 1:
+                code_point = int(fields[1])
+            if code_point >= 0:
+                self._index[code_point] = start
+            start = end
+
+    def get_bounding_box(self):
+        """Return ``(width, height, x_offset, y_offset)`` of the font."""
+        return self._boundingbox
+
+    def _decode_glyph(self, code_point):
+        start = self._index.get(code_point)
+        if start is None:
+            return None
+        end = self._source.find("ENDCHAR", start)
+        lines = self._source[start:end].split("\n")
+        shift_x = shift_y = 0
+        width = height = dx = dy = 0
+        rows = None
+        for i, line in enumerate(lines):
+            key, _, value = line.strip().partition(" ")
+            if key == "DWIDTH":
+                shift_x, shift_y = (int(v) for v in value.split())
+            elif key == "BBX":
+                width, height, dx, dy = (int(v) for v in value.split())
+            elif key == "BITMAP":
+                rows = lines[i + 1:i + 1 + height]
+                break
+        bitmap = self._bitmap_class(width, height, 2)
+        if width:
+            for y, row in enumerate(rows or ()):
+                values = displayio._unpack(bytes.fromhex(row.strip()), 1)
+                bitmap._set_row(y, 0, values[:width])
+        return fontio.Glyph(bitmap, 0, width, height, dx, dy, shift_x, shift_y)
@@ -0,0 +1,32 @@
+"""
+bitmap_font - Load a BDF or PCF font file.
+"""
+
+import displayio
+
+
+def load_font(filename, bitmap=None):
+    """Load the font in *filename* (a path or binary file object).
+
+    The format is detected from the file contents.  Glyphs are decoded
+    into *bitmap* objects (default :class:`displayio.Bitmap`) on first
+    use; see :meth:`GlyphCache.load_glyphs` to decode some eagerly.
+    """
+    if bitmap is None:
+        bitmap = displayio.Bitmap
+    if hasattr(filename, "read"):
+        data = filename.read()
+    else:
+        with open(filename, "rb") as f:
+            data = f.read()
+    if isinstance(data, str):
+        data = data.encode("latin-1")
+    if data[:4] == b"\x01fcp":
+        from .pcf import PCF
+
+        return PCF(data, bitmap)
+    if data[:9] == b"STARTFONT":
+        from .bdf import BDF
+
+        return BDF(data.decode("latin-1"), bitmap)
+    raise ValueError("Unknown font file format")
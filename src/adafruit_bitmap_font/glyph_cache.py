@@ -0,0 +1,40 @@
+"""
+glyph_cache - Glyph storage shared by the BDF and PCF loaders.
+"""
+
+import abc
+
+
+class GlyphCache(abc.ABC):
+    """Caches decoded :class:`fontio.Glyph` objects by code point.
+
+    Subclasses index the font file when loaded and implement
+    :meth:`_decode_glyph`, which decodes one glyph on first use.
+    """
+
+    def __init__(self):
+        self._glyphs = {}
+
+    def load_glyphs(self, code_points):
+        """Decode the glyphs for *code_points* (a string or iterable of
+        ints) now rather than on first use."""
+        if isinstance(code_points, int):
+            code_points = (code_points,)
+        elif isinstance(code_points, str):
+            code_points = [ord(ch) for ch in code_points]
+        for code_point in code_points:
+            self.get_glyph(code_point)
+
+    def get_glyph(self, code_point):
+        """Return the :class:`fontio.Glyph` for *code_point*, or ``None``
+        if the font has no such glyph."""
+        try:
+            return self._glyphs[code_point]
+        except KeyError:
+            glyph = self._glyphs[code_point] = self._decode_glyph(code_point)
+            return glyph
+
+    @abc.abstractmethod
+    def _decode_glyph(self, code_point):
+        """Return the :class:`fontio.Glyph` for *code_point* read from
+        the font file, or ``None`` if the font has no such glyph."""
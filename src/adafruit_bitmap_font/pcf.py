@@ -0,0 +1,163 @@
+"""
+pcf - Portable Compiled Format (PCF) font loader.
+
+The table of contents, metrics and encodings are read when the font is
+loaded; each glyph's bitmap is converted only when the glyph is first
+requested.
+"""
+
+import struct
+
+import displayio
+import fontio
+
+from .glyph_cache import GlyphCache
+
+_PCF_ACCELERATORS = 1 << 1
+_PCF_METRICS = 1 << 2
+_PCF_BITMAPS = 1 << 3
+_PCF_BDF_ENCODINGS = 1 << 5
+_PCF_BDF_ACCELERATORS = 1 << 8
+
+# Format word flags.
+_PCF_GLYPH_PAD_MASK = 3
+_PCF_BYTE_MASK = 1 << 2  # most significant byte first
+_PCF_BIT_MASK = 1 << 3  # most significant bit first
+_PCF_SCAN_UNIT_MASK = 3 << 4
+_PCF_COMPRESSED_METRICS = 0x100
+
+# Reverses the bit order of a byte.
+_REVERSE_BITS = bytes(int("{:08b}".format(b)[::-1], 2) for b in range(256))
+
+
+class PCF(GlyphCache):
+    """A font loaded from PCF data.
+
+    Args:
+        data (bytes): The contents of a ``.pcf`` file.
+        bitmap_class: Bitmap type to decode glyphs into.
+    """
+
+    def __init__(self, data, bitmap_class=displayio.Bitmap):
+        super().__init__()
+        if data[:4] != b"\x01fcp":
+            raise ValueError("not a PCF font")
+        self._data = data
+        self._bitmap_class = bitmap_class
+        (count,) = struct.unpack_from("<i", data, 4)
+        self._tables = {}
+        for i in range(count):
+            kind, fmt, _, offset = struct.unpack_from("<iiii", data, 8 + i * 16)
+            self._tables[kind] = (fmt, offset)
+        self._read_metrics()
+        self._read_encodings()
+        self._read_accelerators()
+        self._read_bitmap_offsets()
+
+    def _table(self, kind):
+        """Return ``(format, byte order prefix, offset after the format
+        word)`` for table *kind*."""
+        if kind not in self._tables:
+            raise ValueError("PCF font has no table %d" % kind)
+        _, offset = self._tables[kind]
+        (fmt,) = struct.unpack_from("<i", self._data, offset)
+        order = ">" if fmt & _PCF_BYTE_MASK else "<"
+        return fmt, order, offset + 4
+
+    def _read_metrics(self):
+        fmt, order, pos = self._table(_PCF_METRICS)
+        data = self._data
+        if fmt & _PCF_COMPRESSED_METRICS:
+            (count,) = struct.unpack_from(order + "h", data, pos)
+            raw = data[pos + 2:pos + 2 + count * 5]
+            self._metrics = [
+                tuple(b - 0x80 for b in raw[i * 5:i * 5 + 5])
+                for i in range(count)
+            ]
+        else:
+            (count,) = struct.unpack_from(order + "i", data, pos)
+            self._metrics = [
+                struct.unpack_from(order + "hhhhh", data, pos + 4 + i * 12)
+                for i in range(count)
+            ]
+
+    def _read_encodings(self):
+        _, order, pos = self._table(_PCF_BDF_ENCODINGS)
+        # The fifth field, the default character, is not used.
+        min2, max2, min1, max1 = struct.unpack_from(
+            order + "hhhh", self._data, pos
+        )
+        self._encoding = (min2, max2, min1, max1, pos + 10, order)
+
+    def _glyph_index(self, code_point):
+        min2, max2, min1, max1, pos, order = self._encoding
+        byte1, byte2 = code_point >> 8, code_point & 0xFF
+        if not (min1 <= byte1 <= max1 and min2 <= byte2 <= max2):
+            return None
+        slot = (byte1 - min1) * (max2 - min2 + 1) + byte2 - min2
+        (index,) = struct.unpack_from(order + "H", self._data, pos + slot * 2)
+        return None if index == 0xFFFF else index
+
+    def _read_accelerators(self):
+        kind = _PCF_BDF_ACCELERATORS
+        if kind not in self._tables:
+            kind = _PCF_ACCELERATORS
+        _, order, pos = self._table(kind)
+        # Eight flag bytes, then ascent, descent and max overlap, then the
+        # min and max bounds as uncompressed metrics.
+        self.ascent, self.descent = struct.unpack_from(
+            order + "ii", self._data, pos + 8
+        )
+        min_bounds = struct.unpack_from(order + "hhhhh", self._data, pos + 20)
+        max_bounds = struct.unpack_from(order + "hhhhh", self._data, pos + 32)
+        self._boundingbox = (
+            max_bounds[1] - min_bounds[0],
+            max_bounds[3] + max_bounds[4],
+            min_bounds[0],
+            -max_bounds[4],
+        )
+
+    def _read_bitmap_offsets(self):
+        fmt, order, pos = self._table(_PCF_BITMAPS)
+        (count,) = struct.unpack_from(order + "i", self._data, pos)
+        self._bitmap_format = fmt
+        self._bitmap_offsets = struct.unpack_from(
+            order + "%di" % count, self._data, pos + 4
+        )
+        # Skip the four possible bitmap sizes to reach the glyph data.
+        self._bitmap_data = pos + 4 + count * 4 + 16
+
+    def get_bounding_box(self):
+        """Return ``(width, height, x_offset, y_offset)`` of the font."""
+        return self._boundingbox
+
+    def _decode_glyph(self, code_point):
+        index = self._glyph_index(code_point)
+        if index is None or index >= len(self._metrics):
+            return None
+        left, right, shift_x, ascent, descent = self._metrics[index][:5]
+        width = right - left
+        height = ascent + descent
+        bitmap = self._bitmap_class(max(width, 0), max(height, 0), 2)
+        if width > 0 and height > 0:
+            fmt = self._bitmap_format
+            pad = 1 << (fmt & _PCF_GLYPH_PAD_MASK)
+            unit = 1 << ((fmt & _PCF_SCAN_UNIT_MASK) >> 4)
+            stride = ((width + 7) // 8 + pad - 1) // pad * pad
+            start = self._bitmap_data + self._bitmap_offsets[index]
+            raw = self._data[start:start + stride * height]
+            if not fmt & _PCF_BIT_MASK:
+                raw = raw.translate(_REVERSE_BITS)
+            if unit > 1 and bool(fmt & _PCF_BIT_MASK) != bool(
+                    fmt & _PCF_BYTE_MASK):
+                swapped = bytearray(len(raw))
+                for k in range(unit):
+                    swapped[k::unit] = raw[unit - 1 - k::unit]
+                raw = swapped
+            for y in range(height):
+                row = displayio._unpack(raw[y * stride:(y + 1) * stride], 1)
+                bitmap._set_row(y, 0, row[:width])
+        return fontio.Glyph(
+            bitmap, 0, max(width, 0), max(height, 0), left, -descent,
+            shift_x, 0,
+        )
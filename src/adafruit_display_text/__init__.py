@@ -0,0 +1,9 @@
+"""
+adafruit_display_text - Text labels for beady-eye.
+
+A pure Python stand-in for the CircuitPython library of the same name::
+
+    from adafruit_display_text import bitmap_label
+
+    label = bitmap_label.Label(font, text="HELLO", color=0xFFFFFF)
+"""
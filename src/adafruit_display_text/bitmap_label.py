@@ -0,0 +1,358 @@
+"""
+bitmap_label - Text rendered into a single bitmap.
+
+A :class:`Label` lays out its text by copying rows of pre-rasterized
+glyphs into one packed 1-bit :class:`displayio.Bitmap`, shown through a
+two-colour palette.  Glyph rows are extracted from the font once and
+cached.  When new text keeps the label's size, only the glyph cells that
+changed are rewritten, so a counter ticking one digit redraws (and
+damages) one cell.
+"""
+
+import weakref
+
+import bitmaptools
+import displayio
+
+# Glyph bitmap -> (bitmap version, {(tile index, width, height): rows}),
+# where rows is a tuple of row bytes (one byte per pixel, 1 = ink).  Weak,
+# so the rows go away with the font that owns the bitmap.
+_GLYPH_ROWS = weakref.WeakKeyDictionary()
+
+
+def _glyph_rows(glyph):
+    """Return the pixel rows of *glyph*, extracted from its bitmap once."""
+    bitmap = glyph.bitmap
+    cached = _GLYPH_ROWS.get(bitmap)
+    if cached is None or cached[0] != bitmap._version:
+        cached = _GLYPH_ROWS[bitmap] = (bitmap._version, {})
+    key = (glyph.tile_index, glyph.width, glyph.height)
+    rows = cached[1].get(key)
+    if rows is None:
+        width = glyph.width
+        per_row = bitmap.width // width
+        sx = (glyph.tile_index % per_row) * width
+        sy = (glyph.tile_index // per_row) * glyph.height
+        rows = tuple(
+            bytes(bitmap._get_row(sy + row, sx, sx + width))
+            for row in range(glyph.height)
+        )
+        cached[1][key] = rows
+    return rows
+
+
+def _font_metrics(font):
+    """Return ``(ascent, descent)`` for *font*."""
+    box = font.get_bounding_box()
+    y_offset = box[3] if len(box) > 3 else 0
+    ascent = getattr(font, "ascent", None)
+    descent = getattr(font, "descent", None)
+    if ascent is None:
+        ascent = box[1] + y_offset
+    if descent is None:
+        descent = -y_offset
+    return ascent, descent
+
+
+class Label(displayio.Group):
+    """A text label drawn into a single bitmap.
+
+    Compatible with the core subset of ``adafruit_display_text``'s
+    ``bitmap_label.Label``.  The label's origin is at the left edge of the
+    text, vertically in the middle of the first line's ascent; use
+    *anchor_point* and *anchored_position* to place it by its bounding box
+    instead.
+
+    Args:
+        font: A font with ``get_bounding_box()`` and ``get_glyph()``, such
+            as :class:`fontio.BuiltinFont` or one loaded by
+            ``adafruit_bitmap_font``.
+        text (str): Text to show; ``"\\n"`` starts a new line.
+        color (int): Text colour as ``0xRRGGBB``.
+        background_color (int | None): Colour behind the text's bounding
+            box, or ``None`` for transparent.
+        line_spacing (float): Line pitch as a multiple of the font height.
+        scale (int): Integer magnification.
+        x (int): Horizontal position of the origin.
+        y (int): Vertical position of the origin.
+        anchor_point (tuple | None): ``(x, y)`` fraction of the bounding
+            box placed at *anchored_position*.
+        anchored_position (tuple | None): ``(x, y)`` position in the
+            parent for *anchor_point*.
+    """
+
+    def __init__(self, font, *, text="", color=0xFFFFFF,
+                 background_color=None, line_spacing=1.25, scale=1, x=0,
+                 y=0, anchor_point=None, anchored_position=None):
+        super().__init__(scale=scale, x=x, y=y)
+        self._font = font
+        self._palette = displayio.Palette(2)
+        self._palette[1] = color
+        self._background_color = None
+        self.background_color = background_color
+        self._line_spacing = line_spacing
+        self._anchor_point = anchor_point
+        self._anchored_position = anchored_position
+        self._bitmap = None
+        self._tilegrid = None
+        self._bounding_box = (0, 0, 0, 0)
+        # Label-local box, glyph placements and canvas (one byte per
+        # pixel) of the text in the bitmap, kept for incremental updates.
+        self._box = None
+        self._placements = []
+        self._canvas = None
+        self._text = None
+        self._set_text(text)
+
+    @property
+    def text(self):
+        """The text shown."""
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        self._set_text(value)
+
+    @property
+    def font(self):
+        """The font the text is drawn in."""
+        return self._font
+
+    @font.setter
+    def font(self, value):
+        self._font = value
+        self._relayout()
+
+    @property
+    def color(self):
+        """Text colour as ``0xRRGGBB``."""
+        return self._palette[1]
+
+    @color.setter
+    def color(self, value):
+        self._palette[1] = value
+
+    @property
+    def background_color(self):
+        """Background colour, or ``None`` for transparent."""
+        return self._background_color
+
+    @background_color.setter
+    def background_color(self, value):
+        self._background_color = value
+        if value is None:
+            self._palette.make_transparent(0)
+        else:
+            self._palette[0] = value
+            self._palette.make_opaque(0)
+
+    @property
+    def line_spacing(self):
+        """Line pitch as a multiple of the font height."""
+        return self._line_spacing
+
+    @line_spacing.setter
+    def line_spacing(self, value):
+        self._line_spacing = value
+        self._relayout()
+
+    @property
+    def scale(self):
+        """Integer magnification."""
+        return displayio.Group.scale.fget(self)
+
+    @scale.setter
+    def scale(self, value):
+        displayio.Group.scale.fset(self, value)
+        self._update_anchor()
+
+    @property
+    def anchor_point(self):
+        """``(x, y)`` fraction of the bounding box placed at
+        :attr:`anchored_position`."""
+        return self._anchor_point
+
+    @anchor_point.setter
+    def anchor_point(self, value):
+        self._anchor_point = value
+        self._update_anchor()
+
+    @property
+    def anchored_position(self):
+        """``(x, y)`` position of :attr:`anchor_point` in the parent."""
+        return self._anchored_position
+
+    @anchored_position.setter
+    def anchored_position(self, value):
+        self._anchored_position = value
+        self._update_anchor()
+
+    @property
+    def bounding_box(self):
+        """``(x, y, width, height)`` of the text relative to the origin,
+        before scaling."""
+        return self._bounding_box
+
+    @property
+    def bitmap(self):
+        """The :class:`displayio.Bitmap` holding the rendered text."""
+        return self._bitmap
+
+    def _relayout(self):
+        text = self._text
+        self._text = None
+        self._set_text(text)
+
+    def _layout(self, text):
+        """Return ``(box, placements)`` for *text*: the bounding box as
+        ``(x1, y1, x2, y2)`` and a ``(glyph, left, top, overlaps)`` tuple
+        for each glyph with ink."""
+        font = self._font
+        ascent, descent = _font_metrics(font)
+        line_height = round((ascent + descent) * self._line_spacing)
+        # Every line's box spans its advance and the font's ascent and
+        # descent; glyphs reaching beyond that widen the box.
+        x1 = x2 = 0
+        y1 = -ascent + ascent // 2
+        y2 = y1
+        placements = []
+        for number, line in enumerate(text.split("\n")):
+            baseline = ascent // 2 + number * line_height
+            pen = 0
+            ink_right = None
+            for ch in line:
+                glyph = font.get_glyph(ord(ch))
+                if glyph is None:
+                    continue
+                left = pen + glyph.dx
+                top = baseline - glyph.height - glyph.dy
+                if glyph.width > 0 and glyph.height > 0:
+                    right = left + glyph.width
+                    overlaps = ink_right is not None and left < ink_right
+                    placements.append((glyph, left, top, overlaps))
+                    ink_right = right if ink_right is None else max(
+                        ink_right, right
+                    )
+                    x1 = min(x1, left)
+                    x2 = max(x2, right)
+                    y1 = min(y1, top)
+                    y2 = max(y2, top + glyph.height)
+                pen += glyph.shift_x
+            x2 = max(x2, pen)
+            y2 = max(y2, baseline + descent)
+        return (x1, y1, x2, y2), placements
+
+    def _set_text(self, text):
+        text = "" if text is None else str(text)
+        if text == self._text:
+            return
+        self._text = text
+        box, placements = self._layout(text)
+        x1, y1, x2, y2 = box
+        width = x2 - x1
+        height = y2 - y1
+        self._bounding_box = (x1, y1, width, height)
+        if width <= 0 or height <= 0:
+            if self._tilegrid is not None:
+                self.remove(self._tilegrid)
+            self._bitmap = self._tilegrid = None
+            self._canvas = None
+            self._placements = []
+            self._update_anchor()
+            return
+
+        if self._bitmap is not None and box == self._box:
+            self._update_cells(placements)
+        else:
+            canvas = bytearray(width * height)
+            self._paint(canvas, box, placements, box)
+            bitmap = displayio.Bitmap(width, height, 2)
+            bitmaptools.arrayblit(bitmap, canvas)
+            tilegrid = displayio.TileGrid(
+                bitmap, pixel_shader=self._palette, x=x1, y=y1
+            )
+            if self._tilegrid is not None:
+                self.remove(self._tilegrid)
+            self.append(tilegrid)
+            self._bitmap = bitmap
+            self._tilegrid = tilegrid
+            self._canvas = canvas
+        self._box = box
+        self._placements = placements
+        self._update_anchor()
+
+    @staticmethod
+    def _paint(canvas, box, placements, area):
+        """Copy the rows of each glyph in *placements* into *canvas*, which
+        covers *box*, clipped to *area* (both in label coordinates)."""
+        bx1, by1, bx2, _ = box
+        x1, y1, x2, y2 = area
+        width = bx2 - bx1
+        for glyph, left, top, overlaps in placements:
+            gx1 = max(left, x1)
+            gx2 = min(left + glyph.width, x2)
+            gy1 = max(top, y1)
+            gy2 = min(top + glyph.height, y2)
+            if gx1 >= gx2 or gy1 >= gy2:
+                continue
+            offset = (gy1 - by1) * width + gx1 - bx1
+            end = offset + gx2 - gx1
+            for row in _glyph_rows(glyph)[gy1 - top:gy2 - top]:
+                row = row[gx1 - left:gx2 - left]
+                if overlaps:
+                    row = bytes(map(max, canvas[offset:end], row))
+                canvas[offset:end] = row
+                offset += width
+                end += width
+
+    def _update_cells(self, placements):
+        """Rewrite only the glyph cells that differ from the text already
+        in the bitmap, which keeps the bitmap's dirty area to those cells.
+
+        Cells are compared in order, so a changed character also rewrites
+        every later character it shifts.
+        """
+        old = self._placements
+        x1, y1, x2, y2 = self._box
+        width = x2 - x1
+        cells = []
+        for index in range(max(len(old), len(placements))):
+            before = old[index] if index < len(old) else None
+            after = placements[index] if index < len(placements) else None
+            if before == after:
+                continue
+            for placed in (before, after):
+                if placed is not None:
+                    glyph, left, top, _ = placed
+                    cells.append((left - x1, top - y1, left - x1 + glyph.width,
+                                  top - y1 + glyph.height))
+        if not cells:
+            return
+        canvas = self._canvas
+        bitmap = self._bitmap
+        for cx1, cy1, cx2, cy2 in displayio._merge_areas(
+                cells, width, y2 - y1):
+            blank = bytes(cx2 - cx1)
+            for row in range(cy1, cy2):
+                canvas[row * width + cx1:row * width + cx2] = blank
+            # Neighbouring glyphs may reach into the cleared cells.
+            self._paint(canvas, self._box, placements,
+                        (cx1 + x1, cy1 + y1, cx2 + x1, cy2 + y1))
+            for row in range(cy1, cy2):
+                bitmap._set_row(
+                    row, cx1, canvas[row * width + cx1:row * width + cx2]
+                )
+
+    def _update_anchor(self):
+        if self._anchor_point is None or self._anchored_position is None:
+            return
+        box_x, box_y, width, height = self._bounding_box
+        scale = self.scale
+        x = (self._anchored_position[0] - box_x * scale
+             - round(self._anchor_point[0] * width * scale))
+        y = (self._anchored_position[1] - box_y * scale
+             - round(self._anchor_point[1] * height * scale))
+        if self.x != x:
+            self.x = x
+        if self.y != y:
+            self.y = y
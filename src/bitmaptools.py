@@ -0,0 +1,372 @@
+"""
+bitmaptools - Pure Python shim for CircuitPython's bitmaptools module.
+
+Bulk drawing operations on :class:`displayio.Bitmap`.  Every function
+works a row at a time through the bitmap's row accessors, so a rectangle,
+a glyph or a scanline is written with a few slice operations instead of
+one ``bitmap[x, y] = value`` call per pixel, and the bitmap's dirty area
+grows once per row.
+
+Supported functions (subset of CircuitPython bitmaptools):
+    fill_region    – fill a rectangle with one value
+    blit           – copy a region of one bitmap into another
+    draw_line      – draw a straight line
+    draw_circle    – draw a circle outline
+    rotozoom       – rotate and scale a region of one bitmap into another
+    arrayblit      – copy values from a buffer into a rectangle
+    boundary_fill  – flood fill a connected area of one value
+
+Usage::
+
+    import bitmaptools, displayio
+
+    bitmap = displayio.Bitmap(64, 32, 4)
+    bitmaptools.fill_region(bitmap, 0, 0, 64, 8, 1)
+    bitmaptools.draw_line(bitmap, 0, 31, 63, 8, 2)
+    bitmaptools.draw_circle(bitmap, 32, 20, 10, 3)
+    bitmaptools.boundary_fill(bitmap, 32, 20, 3, 0)
+
+All coordinates are clipped to the destination bitmap; rectangles use
+exclusive right/bottom edges as on CircuitPython.
+"""
+
+import math
+
+
+def _holds(row, value):
+    """Return whether *row* holds *value*; a byte row holds no value
+    outside 0..255 (where ``in`` would raise)."""
+    if isinstance(row, (bytes, bytearray)) and not 0 <= value < 256:
+        return False
+    return value in row
+
+
+def _merge_skip(dest_row, source_row, skip_source, skip_dest):
+    """Return *source_row* with the skipped positions taken from
+    *dest_row*, or ``None`` when nothing is skipped."""
+    if skip_source is not None and not _holds(source_row, skip_source):
+        skip_source = None
+    if skip_dest is not None and not _holds(dest_row, skip_dest):
+        skip_dest = None
+    if skip_source is None and skip_dest is None:
+        return None
+    return [
+        d if s == skip_source or d == skip_dest else s
+        for s, d in zip(source_row, dest_row)
+    ]
+
+
+def fill_region(dest_bitmap, x1, y1, x2, y2, value):
+    """Fill the rectangle from (*x1*, *y1*) to (*x2*, *y2*), exclusive,
+    with *value*."""
+    if x1 > x2:
+        x1, x2 = x2, x1
+    if y1 > y2:
+        y1, y2 = y2, y1
+    x1 = max(x1, 0)
+    y1 = max(y1, 0)
+    x2 = min(x2, dest_bitmap.width)
+    y2 = min(y2, dest_bitmap.height)
+    if x1 >= x2 or y1 >= y2:
+        return
+    if (x1, y1, x2, y2) == (0, 0, dest_bitmap.width, dest_bitmap.height):
+        dest_bitmap.fill(value)
+        return
+    for y in range(y1, y2):
+        dest_bitmap._fill_row(y, x1, x2, value)
+
+
+def blit(dest_bitmap, source_bitmap, x, y, *, x1=0, y1=0, x2=None, y2=None,
+         skip_source_index=None, skip_dest_index=None):
+    """Copy the region (*x1*, *y1*)–(*x2*, *y2*) of *source_bitmap* to
+    (*x*, *y*) in *dest_bitmap*.
+
+    Source pixels equal to *skip_source_index* and destination pixels
+    equal to *skip_dest_index* are left unchanged.  The region is clipped
+    to both bitmaps.
+    """
+    if x2 is None:
+        x2 = source_bitmap.width
+    if y2 is None:
+        y2 = source_bitmap.height
+    x1 = max(x1, 0)
+    y1 = max(y1, 0)
+    x2 = min(x2, source_bitmap.width)
+    y2 = min(y2, source_bitmap.height)
+    # Clip against the destination, shifting the source region to match.
+    if x < 0:
+        x1 -= x
+        x = 0
+    if y < 0:
+        y1 -= y
+        y = 0
+    x2 = min(x2, x1 + dest_bitmap.width - x)
+    y2 = min(y2, y1 + dest_bitmap.height - y)
+    if x1 >= x2 or y1 >= y2:
+        return
+    for row in range(y1, y2):
+        values = source_bitmap._get_row(row, x1, x2)
+        if skip_source_index is not None or skip_dest_index is not None:
+            current = dest_bitmap._get_row(y + row - y1, x, x + x2 - x1)
+            merged = _merge_skip(
+                current, values, skip_source_index, skip_dest_index
+            )
+            if merged is not None:
+                values = merged
+        dest_bitmap._set_row(y + row - y1, x, values)
+
+
+def draw_line(dest_bitmap, x1, y1, x2, y2, value):
+    """Draw a line from (*x1*, *y1*) to (*x2*, *y2*), both inclusive.
+
+    The line is traced with Bresenham's algorithm and each horizontal run
+    of pixels is stored with a single row fill.
+    """
+    if y1 > y2 or (y1 == y2 and x1 > x2):
+        x1, y1, x2, y2 = x2, y2, x1, y1
+    dx = abs(x2 - x1)
+    dy = y2 - y1
+    step = 1 if x2 >= x1 else -1
+    width = dest_bitmap.width
+    height = dest_bitmap.height
+
+    def span(row, a, b):
+        if 0 <= row < height:
+            a, b = max(min(a, b), 0), min(max(a, b) + 1, width)
+            if a < b:
+                dest_bitmap._fill_row(row, a, b, value)
+
+    err = dx - dy
+    x, y = x1, y1
+    run_start = x1
+    while x != x2 or y != y2:
+        e2 = 2 * err
+        next_x = x
+        if e2 > -dy:
+            err -= dy
+            next_x += step
+        if e2 < dx:
+            err += dx
+            # Moving down a row ends the current horizontal run.
+            span(y, run_start, x)
+            run_start = next_x
+            y += 1
+        x = next_x
+    span(y, run_start, x)
+
+
+def _disc_half_widths(radius):
+    """Return the half-width of each row of a filled disc, top to bottom:
+    the pixels with ``dx * dx + dy * dy <= radius * radius``."""
+    r2 = radius * radius
+    return [math.isqrt(r2 - dy * dy) for dy in range(-radius, radius + 1)]
+
+
+def draw_circle(dest_bitmap, x, y, radius, value):
+    """Draw the outline of a circle of *radius* centred on (*x*, *y*).
+
+    The outline is the edge of the disc of pixels within *radius* of the
+    centre, so filling its inside with :func:`boundary_fill` produces the
+    same disc as testing every pixel.  Each row is stored as at most two
+    spans.
+    """
+    if radius < 0:
+        raise ValueError("radius must be non-negative")
+    widths = _disc_half_widths(radius)
+    width = dest_bitmap.width
+    for i, half in enumerate(widths):
+        row = y - radius + i
+        if not 0 <= row < dest_bitmap.height:
+            continue
+        above = widths[i - 1] if i > 0 else -1
+        below = widths[i + 1] if i + 1 < len(widths) else -1
+        inner = min(half, min(above, below) + 1)
+        # Left and right spans cover |dx| in [inner, half]; they join into
+        # one at the top and bottom of the circle.
+        if inner == 0:
+            spans = ((x - half, x + half + 1),)
+        else:
+            spans = ((x - half, x - inner + 1), (x + inner, x + half + 1))
+        for a, b in spans:
+            a = max(a, 0)
+            b = min(b, width)
+            if a < b:
+                dest_bitmap._fill_row(row, a, b, value)
+
+
+def rotozoom(dest_bitmap, source_bitmap, *, ox=None, oy=None,
+             dest_clip0=None, dest_clip1=None, px=None, py=None,
+             source_clip0=None, source_clip1=None, angle=0.0, scale=1.0,
+             skip_index=None):
+    """Draw *source_bitmap* into *dest_bitmap* rotated by *angle* radians
+    and magnified by *scale*.
+
+    Source point (*px*, *py*) lands on destination point (*ox*, *oy*); both
+    default to the bitmap centres.  Only destination pixels inside
+    *dest_clip0*..*dest_clip1* are written, sampling source pixels inside
+    *source_clip0*..*source_clip1*; source pixels equal to *skip_index*
+    are not copied.
+
+    For each destination row the range of columns that maps inside the
+    source clip is solved for directly, so only those pixels are sampled.
+    """
+    if ox is None:
+        ox = dest_bitmap.width // 2
+    if oy is None:
+        oy = dest_bitmap.height // 2
+    if px is None:
+        px = source_bitmap.width // 2
+    if py is None:
+        py = source_bitmap.height // 2
+    dx1, dy1 = dest_clip0 or (0, 0)
+    dx2, dy2 = dest_clip1 or (dest_bitmap.width, dest_bitmap.height)
+    sx1, sy1 = source_clip0 or (0, 0)
+    sx2, sy2 = source_clip1 or (source_bitmap.width, source_bitmap.height)
+    dx1, dy1 = max(dx1, 0), max(dy1, 0)
+    dx2 = min(dx2, dest_bitmap.width)
+    dy2 = min(dy2, dest_bitmap.height)
+    sx1, sy1 = max(sx1, 0), max(sy1, 0)
+    sx2 = min(sx2, source_bitmap.width)
+    sy2 = min(sy2, source_bitmap.height)
+    if dx1 >= dx2 or dy1 >= dy2 or sx1 >= sx2 or sy1 >= sy2 or scale == 0:
+        return
+
+    # Inverse mapping: one destination step moves (du, dv) in the source.
+    cos_a = math.cos(angle) / scale
+    sin_a = math.sin(angle) / scale
+    values, base, pitch = source_bitmap._get_rows(0, source_bitmap.height)
+
+    def limits(start, step, low, high):
+        # Columns k >= 0 with low <= start + k * step < high.
+        if step == 0:
+            return (0, dx2 - dx1) if low <= start < high else (0, 0)
+        a = (low - start) / step
+        b = (high - start) / step
+        if step < 0:
+            a, b = b, a
+        return max(0, math.floor(a) - 1), min(dx2 - dx1, math.ceil(b) + 1)
+
+    for row in range(dy1, dy2):
+        ry = row - oy + 0.5
+        rx = dx1 - ox + 0.5
+        u = px + rx * cos_a + ry * sin_a
+        v = py - rx * sin_a + ry * cos_a
+        ka, kb = limits(u, cos_a, sx1, sx2)
+        va, vb = limits(v, -sin_a, sy1, sy2)
+        ka = max(ka, va)
+        kb = min(kb, vb)
+        if ka >= kb:
+            continue
+        sampled = []
+        for k in range(ka, kb):
+            su = math.floor(u + k * cos_a)
+            sv = math.floor(v - k * sin_a)
+            if sx1 <= su < sx2 and sy1 <= sv < sy2:
+                sampled.append(values[base + sv * pitch + su])
+            else:
+                sampled.append(None)
+        # Trim columns whose rounded sample fell just outside the clip.
+        while sampled and sampled[0] is None:
+            sampled.pop(0)
+            ka += 1
+        while sampled and sampled[-1] is None:
+            sampled.pop()
+        if not sampled:
+            continue
+        if None in sampled or (skip_index is not None
+                               and skip_index in sampled):
+            current = dest_bitmap._get_row(
+                row, dx1 + ka, dx1 + ka + len(sampled)
+            )
+            sampled = [
+                d if s is None or s == skip_index else s
+                for s, d in zip(sampled, current)
+            ]
+        dest_bitmap._set_row(row, dx1 + ka, sampled)
+
+
+def arrayblit(bitmap, data, x1=0, y1=0, x2=None, y2=None, skip_index=None):
+    """Copy the values in *data* into the rectangle (*x1*, *y1*)–(*x2*,
+    *y2*) of *bitmap*, row by row.
+
+    *data* holds one value per pixel of the rectangle (``bytes``,
+    ``bytearray``, ``array`` or a list).  Values equal to *skip_index*
+    leave the bitmap unchanged.  Raises ``ValueError`` if *data* is too
+    short for the rectangle.
+    """
+    if x2 is None:
+        x2 = bitmap.width
+    if y2 is None:
+        y2 = bitmap.height
+    if not (0 <= x1 <= x2 <= bitmap.width and 0 <= y1 <= y2 <= bitmap.height):
+        raise ValueError("rectangle out of bounds")
+    width = x2 - x1
+    if len(data) < width * (y2 - y1):
+        raise ValueError("data is too short for the rectangle")
+    for row in range(y1, y2):
+        offset = (row - y1) * width
+        values = data[offset:offset + width]
+        if skip_index is not None:
+            merged = _merge_skip(
+                bitmap._get_row(row, x1, x2), values, skip_index, None
+            )
+            if merged is not None:
+                values = merged
+        bitmap._set_row(row, x1, values)
+
+
+def boundary_fill(dest_bitmap, x, y, fill_color_value,
+                  replaced_color_value=None):
+    """Flood fill the 4-connected area around (*x*, *y*) whose pixels hold
+    *replaced_color_value* (by default, the value at (*x*, *y*)) with
+    *fill_color_value*.
+
+    A scanline fill: each row span is found with ``find``/``rfind`` on a
+    per-row match mask and written with one row fill.
+    """
+    width = dest_bitmap.width
+    height = dest_bitmap.height
+    if not (0 <= x < width and 0 <= y < height):
+        return
+    if replaced_color_value is None:
+        replaced_color_value = dest_bitmap[x, y]
+    if replaced_color_value == fill_color_value:
+        return
+    # masks[row] has 1 for each pixel still holding the replaced value.
+    masks = {}
+    match = bytes(v == replaced_color_value for v in range(256))
+
+    def mask(row):
+        found = masks.get(row)
+        if found is None:
+            values = dest_bitmap._get_row(row, 0, width)
+            if dest_bitmap._bits == 16:
+                found = bytearray(v == replaced_color_value for v in values)
+            else:
+                found = values.translate(match)
+            masks[row] = found
+        return found
+
+    seeds = [(x, y)]
+    while seeds:
+        sx, sy = seeds.pop()
+        row_mask = mask(sy)
+        if not row_mask[sx]:
+            continue
+        left = row_mask.rfind(0, 0, sx) + 1
+        right = row_mask.find(0, sx)
+        if right == -1:
+            right = width
+        row_mask[left:right] = bytes(right - left)
+        dest_bitmap._fill_row(sy, left, right, fill_color_value)
+        for ny in (sy - 1, sy + 1):
+            if not 0 <= ny < height:
+                continue
+            next_mask = mask(ny)
+            start = next_mask.find(1, left, right)
+            while start != -1:
+                seeds.append((start, ny))
+                stop = next_mask.find(0, start, right)
+                if stop == -1:
+                    break
+                start = next_mask.find(1, stop, right)
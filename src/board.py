@@ -8,7 +8,10 @@ Usage::
 
 ``DISPLAY`` is a lazy property: the first time it is accessed it looks for
 a ``<canvas>`` element whose ``id`` is ``"display"`` and wraps it in a
-:class:`displayio.Display`.  Subsequent accesses return the same instance.
+:class:`displayio.Display`.  Subsequent accesses return the same
+instance.  Tools running sketches without a browser install a
+:class:`displayio.HeadlessDisplay` instead with
+``board._set_display(display)``.
 """
 
 _display = None
@@ -28,6 +31,12 @@ class _Board:
     def DISPLAY(self):
         return _get_display()
 
+    def _set_display(self, display):
+        """Use *display* as ``DISPLAY``; ``None`` restores the lazy
+        canvas-backed display."""
+        global _display
+        _display = display
+
 
 import sys as _sys
 _sys.modules[__name__] = _Board()
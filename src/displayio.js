@@ -22,12 +22,20 @@
         return response.text();
     }
 
-    async function loadPyodideAndDisplayio({ statusElement, displayioPath }) {
+    async function loadPyodideAndDisplayio({ statusElement, displayioPath, packages = [] }) {
         if (statusElement) {
             statusElement.textContent = "Loading Pyodide\u2026";
         }
         const pyodide = await loadPyodide();
 
+        if (packages.length) {
+            // e.g. ["numpy"], which displayio uses to render when present.
+            if (statusElement) {
+                statusElement.textContent = `Loading ${packages.join(", ")}\u2026`;
+            }
+            await pyodide.loadPackage(packages);
+        }
+
         if (statusElement) {
             statusElement.textContent = "Loading displayio module\u2026";
         }
@@ -39,13 +47,103 @@
 
     async function loadPythonFile(pyodide, { sourcePath, targetPath, label }) {
         const code = await fetchTextOrThrow(sourcePath, label || sourcePath);
+        const directory = targetPath.substring(0, targetPath.lastIndexOf("/"));
+        if (directory) {
+            pyodide.FS.mkdirTree(directory);
+        }
         pyodide.FS.writeFile(targetPath, code);
     }
 
+    function drawFrameMessage(ctx, message) {
+        // Paint a {type: "frame"} message from worker_display.TransferDisplay.
+        for (const [x, y, width, height, pixels] of message.rects) {
+            ctx.putImageData(new ImageData(pixels, width, height), x, y);
+        }
+    }
+
+    function startDisplayWorker({
+        canvas,
+        workerPath,
+        pyodideURL,
+        modules = [],
+        packages = [],
+        onStatus,
+    }) {
+        // Run Pyodide and displayio in a Web Worker (displayio_worker.js).
+        // The canvas is handed to the worker as an OffscreenCanvas where the
+        // browser allows it; otherwise frames from a TransferDisplay are
+        // painted here.  Returns {ready, offscreen, run(code), terminate()};
+        // ready and run() return Promises.  Paths are relative to the page.
+        const absolute = (path) => new URL(path, global.location.href).href;
+        const worker = new Worker(absolute(workerPath));
+        const offscreen = typeof canvas.transferControlToOffscreen === "function";
+        const ctx = offscreen ? null : canvas.getContext("2d");
+        const pending = new Map();
+        let nextId = 0;
+        let readyCallbacks;
+        const ready = new Promise((resolve, reject) => {
+            readyCallbacks = { resolve, reject };
+        });
+
+        worker.onmessage = (event) => {
+            const message = event.data;
+            if (message.type === "frame") {
+                if (ctx) {
+                    drawFrameMessage(ctx, message);
+                }
+            } else if (message.type === "status") {
+                if (onStatus) {
+                    onStatus(message.text);
+                }
+            } else if (message.type === "ready") {
+                readyCallbacks.resolve();
+            } else if (message.id === undefined) {
+                readyCallbacks.reject(new Error(message.message));
+            } else {
+                const callbacks = pending.get(message.id);
+                pending.delete(message.id);
+                if (message.type === "done") {
+                    callbacks.resolve();
+                } else {
+                    callbacks.reject(new Error(message.message));
+                }
+            }
+        };
+
+        const target = offscreen ? canvas.transferControlToOffscreen() : null;
+        worker.postMessage({
+            type: "init",
+            pyodideURL,
+            packages,
+            canvas: target,
+            modules: modules.map(({ sourcePath, targetPath }) => ({
+                sourcePath: absolute(sourcePath),
+                targetPath,
+            })),
+        }, target ? [target] : []);
+
+        function run(code) {
+            const id = nextId++;
+            return new Promise((resolve, reject) => {
+                pending.set(id, { resolve, reject });
+                worker.postMessage({ type: "run", id, code });
+            });
+        }
+
+        return {
+            ready,
+            offscreen,
+            run,
+            terminate: () => worker.terminate(),
+        };
+    }
+
     global.beadyeyePyodide = {
+        drawFrameMessage,
         ensureHttp,
         fetchTextOrThrow,
         loadPyodideAndDisplayio,
         loadPythonFile,
+        startDisplayWorker,
     };
 })(window);
@@ -2,8 +2,8 @@
 displayio - Pure Python shim for CircuitPython's displayio module.
 
 Runnable under Pyodide; rendering is delegated to the HTML Canvas
-(beady-eye JavaScript canvas layer) via a single ``putImageData`` call
-inside :meth:`Display.refresh`.
+(beady-eye JavaScript canvas layer) via ``putImageData`` calls inside
+:meth:`Display.refresh`, one per damaged rectangle.
 
 All other code is pure Python with no JS dependencies and can be
 exercised with standard CPython.
@@ -16,6 +16,7 @@ Supported classes (core subset of CircuitPython displayio):
     TileGrid   – renders a Bitmap via a Palette into a pixel buffer
     Group      – ordered container of TileGrid / Group objects
     Display    – wraps an HTML <canvas>; drives show / refresh
+    HeadlessDisplay – in-memory Display for CPython; exports PPM / PNG
 
 Usage (inside Pyodide)::
 
@@ -36,8 +37,364 @@ Usage (inside Pyodide)::
     group = displayio.Group()
     group.append(tg)
     display.show(group)
+
+:class:`HeadlessDisplay` provides the same API without a canvas, rendering
+into memory under plain CPython and exporting frames as PPM or PNG.
+
+Large layers are converted with NumPy when it can be imported; see
+:func:`set_render_backend`.  The pure Python renderer produces identical
+framebuffers.
 """
 
+import array
+import asyncio
+import struct
+import threading
+import time
+import weakref
+import zlib
+
+try:
+    import numpy as _numpy
+except ImportError:
+    _numpy = None
+
+# The NumPy module while the NumPy render backend is active, else None.
+_np = _numpy
+
+# The NumPy backend handles RGBA pixels as native uint32 words; this is
+# the alpha byte of such a word, whatever the byte order.
+_ALPHA_MASK = (
+    None if _numpy is None
+    else int(_numpy.frombuffer(b"\0\0\0\xff", _numpy.uint32)[0])
+)
+
+
+def get_render_backend():
+    """Return the active render backend, ``"numpy"`` or ``"python"``.
+
+    beady-eye extension.  NumPy is used automatically when it can be
+    imported (under CPython, or in Pyodide after
+    ``pyodide.loadPackage("numpy")``); both backends produce identical
+    framebuffers.
+    """
+    return "python" if _np is None else "numpy"
+
+
+def set_render_backend(name):
+    """Select the render backend, ``"numpy"`` or ``"python"``.
+
+    beady-eye extension.  Raises ``ValueError`` for an unknown name or when
+    ``"numpy"`` is requested but NumPy is not installed.
+    """
+    global _np
+    if name == "python":
+        _np = None
+    elif name == "numpy":
+        if _numpy is None:
+            raise ValueError("NumPy is not available")
+        _np = _numpy
+    else:
+        raise ValueError("unknown render backend: %r" % (name,))
+
+
+# ---------------------------------------------------------------------------
+# Area helpers
+#
+# An *area* is a tuple ``(x1, y1, x2, y2)`` with exclusive right/bottom
+# edges, the same convention CircuitPython uses for ``displayio_area_t``.
+# ---------------------------------------------------------------------------
+
+# Above this many separate dirty rectangles a refresh collapses them into
+# their bounding box rather than issuing many small uploads.
+_MAX_REFRESH_AREAS = 8
+
+# Occlusion culling limits: only layers covering at least this many pixels
+# are worth subtracting from the layers beneath them, at most this many
+# occluders are tracked per clip area, and a layer cut into more fragments
+# than this is simply painted whole.
+_MIN_OCCLUDER_SIZE = 1024
+_MAX_OCCLUDERS = 16
+_MAX_FRAGMENTS = 16
+
+# Packed bitmaps are unpacked for drawing in bands of about this many
+# pixels, bounding the temporary memory a large 1-bit bitmap needs.
+_UNPACK_BAND = 16384
+
+# The NumPy backend converts layers in bands of about this many pixels,
+# bounding its temporary arrays, and leaves draws smaller than
+# _ARRAY_MIN_PIXELS to the pure Python path, which has less per-call
+# overhead.
+_ARRAY_BAND = 65536
+_ARRAY_MIN_PIXELS = 256
+
+# A HeadlessDisplay with worker processes renders refreshes damaging at
+# least this many pixels in parallel; smaller ones are not worth the cost
+# of shipping the scene to the workers.
+_PARALLEL_MIN_PIXELS = 65536
+
+# Animation frame period of HeadlessDisplay's refresh timer.
+_FRAME_SECONDS = 1 / 60
+
+# Display.refresh_async renders in bands of about this many pixels,
+# yielding to the event loop whenever a slice of bands has used up its
+# time budget (by default _SLICE_MS milliseconds).
+_ASYNC_CHUNK_PIXELS = 4096
+_SLICE_MS = 8
+
+
+def _area_intersection(a, b):
+    """Return the overlap of areas *a* and *b*, or ``None`` if empty."""
+    x1 = a[0] if a[0] > b[0] else b[0]
+    y1 = a[1] if a[1] > b[1] else b[1]
+    x2 = a[2] if a[2] < b[2] else b[2]
+    y2 = a[3] if a[3] < b[3] else b[3]
+    if x1 >= x2 or y1 >= y2:
+        return None
+    return (x1, y1, x2, y2)
+
+
+def _area_union(a, b):
+    """Return the bounding box of areas *a* and *b*."""
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _area_size(a):
+    return (a[2] - a[0]) * (a[3] - a[1])
+
+
+def _subtract_areas(area, holes):
+    """Return rectangles covering *area* minus every area in *holes*."""
+    pieces = [area]
+    for hole in holes:
+        remaining = []
+        for piece in pieces:
+            cut = _area_intersection(piece, hole)
+            if cut is None:
+                remaining.append(piece)
+                continue
+            px1, py1, px2, py2 = piece
+            cx1, cy1, cx2, cy2 = cut
+            if py1 < cy1:
+                remaining.append((px1, py1, px2, cy1))
+            if cy2 < py2:
+                remaining.append((px1, cy2, px2, py2))
+            if px1 < cx1:
+                remaining.append((px1, cy1, cx1, cy2))
+            if cx2 < px2:
+                remaining.append((cx2, cy1, px2, cy2))
+        pieces = remaining
+        if not pieces:
+            break
+    return pieces
+
+
+def _render_layers(pixels, buf_width, layers, clip, clear=False):
+    """Paint *layers* into the buffer area *clip* with occlusion culling.
+
+    *layers* is a painting-order list of ``(layer, x, y, scale, area)``.  A
+    front-to-back pass subtracts the area of every large fully opaque layer
+    from the layers (and, with *clear*, the background) beneath it, so
+    each pixel is written roughly once; the surviving fragments are then
+    painted back-to-front.
+    """
+    visible = []
+    occluders = []
+    for layer, x, y, scale, area in reversed(layers):
+        area = _area_intersection(area, clip)
+        if area is None:
+            continue
+        pieces = _subtract_areas(area, occluders) if occluders else [area]
+        if not pieces:
+            continue
+        if len(pieces) > _MAX_FRAGMENTS:
+            pieces = [area]
+        visible.append((layer, x, y, scale, pieces))
+        if (len(occluders) < _MAX_OCCLUDERS
+                and _area_size(area) >= _MIN_OCCLUDER_SIZE):
+            opaque = layer._opaque_area(x, y, scale)
+            if opaque is not None:
+                opaque = _area_intersection(opaque, clip)
+                if opaque is not None:
+                    occluders.append(opaque)
+    if clear and _np is not None:
+        frame = _frame_array(pixels, buf_width)
+        for x1, y1, x2, y2 in _subtract_areas(clip, occluders):
+            frame[y1:y2, x1:x2] = 0
+    elif clear:
+        for x1, y1, x2, y2 in _subtract_areas(clip, occluders):
+            blank = bytes((x2 - x1) * 4)
+            for y in range(y1, y2):
+                off = (y * buf_width + x1) * 4
+                pixels[off:off + len(blank)] = blank
+    for layer, x, y, scale, pieces in reversed(visible):
+        for piece in pieces:
+            layer._draw(pixels, buf_width, x, y, piece, scale)
+
+
+def _frame_array(pixels, buf_width):
+    """Return a ``(rows, buf_width)`` NumPy uint32 view of the RGBA buffer
+    *pixels*, one word per pixel, sharing its memory."""
+    return _np.frombuffer(pixels, _np.uint32).reshape(-1, buf_width)
+
+
+def _blit_array(frame, x1, y1, rgba, opaque):
+    """Store the ``(h, w)`` uint32 RGBA array *rgba* into *frame* at
+    (*x1*, *y1*), skipping pixels whose alpha is 0 unless *opaque*."""
+    h, w = rgba.shape
+    dst = frame[y1:y1 + h, x1:x1 + w]
+    if opaque:
+        dst[...] = rgba
+    else:
+        _np.copyto(dst, rgba, where=(rgba & _ALPHA_MASK) != 0)
+
+
+def _opaque_runs(mask):
+    """Return ``(start, stop)`` byte offsets into an RGBA row of each run
+    of opaque pixels in the alpha *mask* (255 = opaque, 0 = transparent)."""
+    runs = []
+    start = mask.find(255)
+    while start != -1:
+        stop = mask.find(0, start)
+        if stop == -1:
+            stop = len(mask)
+        runs.append((start * 4, stop * 4))
+        start = mask.find(255, stop)
+    return runs
+
+
+# Bumped whenever any layer is added, removed, moved, resized or shown /
+# hidden, so a Display can tell its compiled draw list is still current
+# with one comparison.
+_layout_serial = 0
+
+
+def _layout_changed():
+    global _layout_serial
+    _layout_serial += 1
+    if _idle_displays:
+        _scene_changed()
+
+
+# Weak references to auto-refreshing displays with no refresh scheduled;
+# the first change to any layer schedules one on each.  Hot mutation paths
+# test this list before calling :func:`_scene_changed`.
+_idle_displays = []
+
+
+def _scene_changed():
+    """Schedule a refresh on every auto-refreshing display waiting for a
+    change to the scene."""
+    displays = _idle_displays[:]
+    del _idle_displays[:]
+    for ref in displays:
+        display = ref()
+        if display is not None:
+            display._idle = False
+            if display._auto_refresh:
+                display._schedule_refresh()
+
+
+def _invalidate_parents(layer):
+    """Tell every Group containing *layer* that its area may have changed."""
+    _layout_changed()
+    for parent in layer._parents:
+        parent._invalidate_bounds()
+
+
+def _content_damage(damage, layer, x, y, scale, key):
+    """Append to *damage* the display area of *layer*, drawn at (*x*, *y*)
+    magnified *scale* times, changed since content token *key*."""
+    changed = layer._changed_area(key)
+    if changed is not None:
+        damage.append((
+            x + changed[0] * scale, y + changed[1] * scale,
+            x + changed[2] * scale, y + changed[3] * scale,
+        ))
+
+
+def _merge_areas(areas, width, height):
+    """Clip *areas* to the screen and merge overlapping rectangles.
+
+    Returns a short list of disjoint-ish areas covering every input area.
+    When merging would not save work (many fragments, or most of the
+    screen is dirty) the whole screen is returned as a single area.
+    """
+    screen = (0, 0, width, height)
+    pending = []
+    for area in areas:
+        area = _area_intersection(area, screen)
+        if area is not None:
+            pending.append(area)
+    merged = []
+    while pending:
+        area = pending.pop()
+        i = 0
+        while i < len(merged):
+            other = merged[i]
+            if _area_intersection(
+                (area[0], area[1], area[2] + 1, area[3] + 1), other
+            ) is not None:
+                # Overlapping or touching: absorb and re-check the rest.
+                area = _area_union(area, merged.pop(i))
+                i = 0
+            else:
+                i += 1
+        merged.append(area)
+    if len(merged) > _MAX_REFRESH_AREAS:
+        box = merged[0]
+        for area in merged[1:]:
+            box = _area_union(box, area)
+        merged = [box]
+    if sum(_area_size(a) for a in merged) * 2 > width * height:
+        return [screen]
+    return merged
+
+
+def _split_areas(areas, pixels):
+    """Yield *areas* cut into horizontal bands of about *pixels* pixels."""
+    for x1, y1, x2, y2 in areas:
+        step = max(1, pixels // (x2 - x1))
+        for y in range(y1, y2, step):
+            yield (x1, y, x2, min(y + step, y2))
+
+
+# Translate tables for packed bitmaps: _UNPACK_TABLES[bits][k] maps a
+# storage byte to the value of its k-th pixel, _PACK_TABLES[bits][k] maps
+# a value to its bits in position k of a byte (most significant first).
+_UNPACK_TABLES = {}
+_PACK_TABLES = {}
+for _bits in (1, 2, 4):
+    _mask = (1 << _bits) - 1
+    _shifts = [8 - _bits * (_k + 1) for _k in range(8 // _bits)]
+    _UNPACK_TABLES[_bits] = [
+        bytes((_byte >> _shift) & _mask for _byte in range(256))
+        for _shift in _shifts
+    ]
+    _PACK_TABLES[_bits] = [
+        bytes(((_value & _mask) << _shift) for _value in range(256))
+        for _shift in _shifts
+    ]
+del _bits, _mask, _shifts
+
+
+def _unpack(packed, bits):
+    """Expand packed bytes into one byte per pixel value."""
+    per_byte = 8 // bits
+    row = bytearray(len(packed) * per_byte)
+    for k, table in enumerate(_UNPACK_TABLES[bits]):
+        row[k::per_byte] = packed.translate(table)
+    return row
+
+
+def _pack(values, bits):
+    """Pack one-byte-per-pixel *values* (a multiple of 8 // *bits* long)."""
+    per_byte = 8 // bits
+    packed = 0
+    for k, table in enumerate(_PACK_TABLES[bits]):
+        packed |= int.from_bytes(values[k::per_byte].translate(table), "big")
+    return packed.to_bytes(len(values) // per_byte, "big")
+
 
 class Palette:
     """A mutable, indexed sequence of RGB colours.
@@ -51,6 +408,14 @@ class Palette:
     def __init__(self, num_colors):
         self._colors = [0x000000] * num_colors
         self._transparent = [False] * num_colors
+        # Bumped on every change so displays can tell when to repaint.
+        self._version = 0
+        # (version, tables) cache for :meth:`_rgba_tables`.
+        self._tables = None
+        # (version, per-index RGBA list) cache for :meth:`_rgba_row`.
+        self._lut = None
+        # (version, NumPy array) cache for :meth:`_rgba_array`.
+        self._lut_array = None
 
     def __len__(self):
         return len(self._colors)
@@ -67,6 +432,9 @@ class Palette:
                     )
             color = (r << 16) | (g << 8) | b
         self._colors[index] = int(color)
+        self._version += 1
+        if _idle_displays:
+            _scene_changed()
 
     def __getitem__(self, index):
         return self._colors[index]
@@ -74,53 +442,338 @@ class Palette:
     def make_transparent(self, palette_index):
         """Mark palette entry *palette_index* as fully transparent."""
         self._transparent[palette_index] = True
+        self._version += 1
+        if _idle_displays:
+            _scene_changed()
 
     def make_opaque(self, palette_index):
         """Mark palette entry *palette_index* as fully opaque."""
         self._transparent[palette_index] = False
+        self._version += 1
+        if _idle_displays:
+            _scene_changed()
 
     def is_transparent(self, palette_index):
         """Return ``True`` if palette entry *palette_index* is transparent."""
         return self._transparent[palette_index]
 
+    def _rgba_tables(self):
+        """Return ``(red, green, blue, alpha, opaque)`` lookup tables.
+
+        Each table is 256 bytes mapping a palette index to one RGBA
+        channel, so a whole row of bitmap indices converts to a channel
+        with a single ``bytes.translate`` call.  ``alpha`` is 255 for opaque
+        entries and 0 for transparent or out-of-range ones; ``opaque`` is
+        ``True`` when no entry is transparent.  The tables are rebuilt
+        lazily after any change to the palette.
+        """
+        cached = self._tables
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+        red = bytearray(256)
+        green = bytearray(256)
+        blue = bytearray(256)
+        alpha = bytearray(256)
+        for i, color in enumerate(self._colors[:256]):
+            red[i] = (color >> 16) & 0xFF
+            green[i] = (color >> 8) & 0xFF
+            blue[i] = color & 0xFF
+            alpha[i] = 0 if self._transparent[i] else 255
+        tables = (
+            bytes(red), bytes(green), bytes(blue), bytes(alpha),
+            not any(self._transparent),
+        )
+        self._tables = (self._version, tables)
+        return tables
+
+    def _rgba_row(self, indices):
+        """Return the RGBA bytes for a row of 16-bit *indices*.
+
+        Used for bitmaps whose values do not fit the 256-entry tables of
+        :meth:`_rgba_tables`; indices past the end of the palette are
+        transparent black.
+        """
+        cached = self._lut
+        if cached is None or cached[0] != self._version:
+            lut = [
+                bytes((color >> 16 & 0xFF, color >> 8 & 0xFF, color & 0xFF,
+                       0 if transparent else 255))
+                for color, transparent in zip(self._colors, self._transparent)
+            ]
+            cached = self._lut = (self._version, lut)
+        lut = cached[1]
+        if indices and max(indices) >= len(lut):
+            blank = bytes(4)
+            return b"".join([
+                lut[i] if i < len(lut) else blank for i in indices
+            ])
+        return b"".join(map(lut.__getitem__, indices))
+
+    def _rgba_array(self):
+        """Return the palette as a NumPy array of ``len + 1`` RGBA words.
+
+        The extra last entry is transparent black, so indices past the end
+        of the palette convert correctly with ``take(..., mode="clip")``.
+        """
+        cached = self._lut_array
+        if cached is None or cached[0] != self._version:
+            lut = _np.zeros((len(self._colors) + 1, 4), _np.uint8)
+            colors = _np.array(self._colors, _np.uint32)
+            lut[:-1, 0] = colors >> 16 & 0xFF
+            lut[:-1, 1] = colors >> 8 & 0xFF
+            lut[:-1, 2] = colors & 0xFF
+            lut[:-1, 3] = _np.where(_np.array(self._transparent, bool), 0, 255)
+            lut = lut.view(_np.uint32)[:, 0]
+            cached = self._lut_array = (self._version, lut)
+        return cached[1]
+
 
 class Bitmap:
     """A mutable 2-D grid of palette colour indices.
 
     Compatible with CircuitPython's ``displayio.Bitmap``.
-    Pixels are accessed with ``bitmap[x, y]`` notation.
+    Pixels are accessed with ``bitmap[x, y]`` notation or by linear index.
+
+    Storage width follows *value_count*, as on CircuitPython: values are
+    packed 1, 2 or 4 bits per pixel (most significant bits first, each
+    row padded to a whole byte) for small palettes, one byte per pixel up
+    to 256 values and 16 bits per pixel up to 65536.
 
     Args:
         width (int): Bitmap width in pixels.
         height (int): Bitmap height in pixels.
-        value_count (int): Number of distinct palette indices (kept for
-            API compatibility; not enforced at runtime).
+        value_count (int): Number of distinct palette indices, 1–65536.
     """
 
     def __init__(self, width, height, value_count):
+        if not 1 <= value_count <= 65536:
+            raise ValueError("value_count must be in the range 1-65536")
         self.width = width
         self.height = height
         self.value_count = value_count
-        self._data = bytearray(width * height)
+        for bits in (1, 2, 4, 8, 16):
+            if value_count <= 1 << bits:
+                break
+        self._bits = bits
+        if bits == 16:
+            self._stride = width
+            self._data = array.array("H", bytes(2 * width * height))
+        else:
+            self._stride = (width * bits + 7) // 8
+            self._data = bytearray(self._stride * height)
+        # Change tracking: ``_version`` is bumped on every write and
+        # ``_dirty_area`` accumulates the bitmap-local area written since
+        # version ``_dirty_base`` (see :meth:`_changed_area`).
+        self._version = 0
+        self._dirty_area = None
+        self._dirty_base = 0
 
-    def __getitem__(self, index):
+    @property
+    def bits_per_value(self):
+        """Bits of storage used per pixel."""
+        return self._bits
+
+    def _position(self, index):
         if isinstance(index, tuple):
             x, y = index
-            return self._data[y * self.width + x]
-        return self._data[index]
+        else:
+            if index < 0:
+                index += self.width * self.height
+            y, x = divmod(index, self.width)
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError("pixel index out of range")
+        return x, y
+
+    def __getitem__(self, index):
+        x, y = self._position(index)
+        bits = self._bits
+        if bits >= 8:
+            return self._data[y * self._stride + x]
+        pos = x * bits
+        byte = self._data[y * self._stride + (pos >> 3)]
+        return (byte >> (8 - bits - (pos & 7))) & ((1 << bits) - 1)
 
     def __setitem__(self, index, value):
-        if isinstance(index, tuple):
-            x, y = index
-            self._data[y * self.width + x] = int(value)
+        x, y = self._position(index)
+        value = int(value)
+        bits = self._bits
+        if value < 0 or value >> bits:
+            raise ValueError("value out of range for this bitmap")
+        if bits >= 8:
+            self._data[y * self._stride + x] = value
         else:
-            self._data[index] = int(value)
+            pos = x * bits
+            i = y * self._stride + (pos >> 3)
+            shift = 8 - bits - (pos & 7)
+            mask = ((1 << bits) - 1) << shift
+            self._data[i] = (self._data[i] & ~mask) | (value << shift)
+        self._version += 1
+        if _idle_displays:
+            _scene_changed()
+        area = self._dirty_area
+        if area is None:
+            self._dirty_area = (x, y, x + 1, y + 1)
+        elif not (area[0] <= x < area[2] and area[1] <= y < area[3]):
+            self._dirty_area = (
+                min(area[0], x), min(area[1], y),
+                max(area[2], x + 1), max(area[3], y + 1),
+            )
 
     def fill(self, value):
         """Set every pixel to palette index *value*."""
-        v = int(value)
-        for i in range(len(self._data)):
-            self._data[i] = v
+        value = int(value)
+        bits = self._bits
+        if value < 0 or value >> bits:
+            raise ValueError("value out of range for this bitmap")
+        if bits == 16:
+            self._data[:] = array.array("H", [value]) * len(self._data)
+        else:
+            pattern = 0
+            for k in range(8 // bits):
+                pattern |= value << (k * bits)
+            self._data[:] = bytes((pattern,)) * len(self._data)
+        self._mark_dirty((0, 0, self.width, self.height))
+
+    # -- bulk row access ---------------------------------------------------
+
+    def _get_row(self, y, x1, x2):
+        """Return the values of pixels *x1*..*x2*-1 of row *y*.
+
+        The result has one element per pixel: a :class:`bytearray` for
+        bitmaps of up to 8 bits per value, an ``array('H')`` for 16-bit
+        ones.  Packed rows are unpacked with one ``translate`` per pixel
+        position within a byte rather than per pixel.
+        """
+        bits = self._bits
+        start = y * self._stride
+        if bits >= 8:
+            return self._data[start + x1:start + x2]
+        per_byte = 8 // bits
+        b1 = x1 // per_byte
+        b2 = (x2 + per_byte - 1) // per_byte
+        row = _unpack(self._data[start + b1:start + b2], bits)
+        skip = x1 - b1 * per_byte
+        return row[skip:skip + x2 - x1]
+
+    def _get_rows(self, y1, y2):
+        """Return ``(values, start, pitch)`` covering rows *y1*..*y2*-1.
+
+        ``values`` holds one element per pixel and pixel (x, y) is
+        ``values[start + y * pitch + x]``.  Byte and 16-bit storage is
+        returned as is; packed rows are unpacked together in one pass,
+        which is much cheaper than unpacking them one at a time.
+        """
+        if self._bits >= 8:
+            return self._data, 0, self._stride
+        pitch = self._stride * (8 // self._bits)
+        values = _unpack(
+            self._data[y1 * self._stride:y2 * self._stride], self._bits
+        )
+        return values, -y1 * pitch, pitch
+
+    def _index_array(self, y1, y2):
+        """Return rows *y1*..*y2*-1 as a NumPy ``(rows, width)`` array of
+        values (a view of the storage unless it is packed)."""
+        stride = self._stride
+        if self._bits == 16:
+            return _np.frombuffer(
+                self._data, _np.uint16, (y2 - y1) * stride, y1 * stride * 2
+            ).reshape(-1, stride)
+        raw = _np.frombuffer(
+            self._data, _np.uint8, (y2 - y1) * stride, y1 * stride
+        ).reshape(-1, stride)
+        bits = self._bits
+        if bits == 8:
+            return raw
+        if bits == 1:
+            values = _np.unpackbits(raw, axis=1)
+        else:
+            shifts = _np.arange(8 - bits, -1, -bits, dtype=_np.uint8)
+            values = (raw[:, :, None] >> shifts) & ((1 << bits) - 1)
+            values = values.reshape(len(raw), -1)
+        return values[:, :self.width]
+
+    def _set_row(self, y, x1, values):
+        """Store *values* (one per pixel) into row *y* starting at *x1*."""
+        n = len(values)
+        if n == 0:
+            return
+        bits = self._bits
+        if min(values) < 0 or max(values) >> bits:
+            raise ValueError("value out of range for this bitmap")
+        start = y * self._stride
+        if bits == 16:
+            if not isinstance(values, array.array):
+                # A bytes-like initialiser would be read as raw storage.
+                values = array.array("H", list(values))
+            self._data[start + x1:start + x1 + n] = values
+        elif bits == 8:
+            self._data[start + x1:start + x1 + n] = bytes(values)
+        else:
+            per_byte = 8 // bits
+            b1 = x1 // per_byte
+            b2 = (x1 + n + per_byte - 1) // per_byte
+            skip = x1 - b1 * per_byte
+            tail = (b2 - b1) * per_byte - skip - n
+            if skip == 0 and (tail == 0 or x1 + n == self.width):
+                # Whole bytes (or the end of the row, whose padding bits
+                # are free): no existing pixels to preserve.
+                row = bytearray(values)
+                row.extend(bytes(tail))
+            else:
+                row = _unpack(self._data[start + b1:start + b2], bits)
+                row[skip:skip + n] = bytes(values)
+            self._data[start + b1:start + b2] = _pack(row, bits)
+        self._mark_dirty((x1, y, x1 + n, y + 1))
+
+    def _fill_row(self, y, x1, x2, value):
+        """Set pixels *x1*..*x2*-1 of row *y* to *value*."""
+        if x2 > x1:
+            if self._bits == 16:
+                self._set_row(y, x1, array.array("H", [value]) * (x2 - x1))
+            else:
+                self._set_row(y, x1, bytes((value,)) * (x2 - x1))
+
+    def _all_opaque(self, palette):
+        """Return ``True`` if every pixel maps to an opaque *palette* entry."""
+        alpha = palette._rgba_tables()[3]
+        if self._bits == 16:
+            return palette._rgba_row(self._data)[3::4].find(0) == -1
+        values, start, pitch = self._get_rows(0, self.height)
+        if pitch == self.width:
+            return values.translate(alpha).find(0) == -1
+        return all(
+            values[y * pitch:y * pitch + self.width].translate(alpha).find(0)
+            == -1
+            for y in range(self.height)
+        )
+
+    def _mark_dirty(self, area):
+        self._version += 1
+        if self._dirty_area is None:
+            self._dirty_area = area
+        else:
+            self._dirty_area = _area_union(self._dirty_area, area)
+        if _idle_displays:
+            _scene_changed()
+
+    def _changed_area(self, since):
+        """Return the bitmap-local area written after version *since*.
+
+        Returns ``None`` when nothing changed and the full bitmap area when
+        the precise area is no longer known (another consumer has already
+        reset the dirty area since *since*).
+        """
+        if since == self._version:
+            return None
+        if since != self._dirty_base or self._dirty_area is None:
+            return (0, 0, self.width, self.height)
+        return self._dirty_area
+
+    def _finish_refresh(self):
+        """Forget the accumulated dirty area after a display refresh."""
+        self._dirty_area = None
+        self._dirty_base = self._version
 
 
 class TileGrid:
@@ -131,19 +784,212 @@ class TileGrid:
     ``displayio.TileGrid``.  No JS imports; rendering targets a plain
     Python :class:`bytearray`.
 
+    The bitmap may be a tile sheet: it is cut into tiles of
+    *tile_width* x *tile_height* pixels, numbered left to right, top to
+    bottom, and the grid shows *width* x *height* of them, chosen with
+    ``tilegrid[x, y] = tile_index``.  By default the whole bitmap is a
+    single tile shown once.
+
     Args:
         bitmap: A :class:`Bitmap` instance.
         pixel_shader: A :class:`Palette` instance.
+        width (int): Width of the grid in tiles.
+        height (int): Height of the grid in tiles.
+        tile_width (int | None): Tile width in pixels (default: bitmap
+            width).
+        tile_height (int | None): Tile height in pixels (default: bitmap
+            height).
+        default_tile (int): Tile index initially shown in every cell.
         x (int): Horizontal position on the display.
         y (int): Vertical position on the display.
     """
 
-    def __init__(self, bitmap, *, pixel_shader, x=0, y=0, **kwargs):
-        self.bitmap = bitmap
-        self.pixel_shader = pixel_shader
-        self.x = x
-        self.y = y
+    def __init__(self, bitmap, *, pixel_shader, width=1, height=1,
+                 tile_width=None, tile_height=None, default_tile=0,
+                 x=0, y=0):
+        if tile_width is None:
+            tile_width = bitmap.width
+        if tile_height is None:
+            tile_height = bitmap.height
+        if tile_width < 1 or bitmap.width % tile_width:
+            raise ValueError("Tile width must exactly divide bitmap width")
+        if tile_height < 1 or bitmap.height % tile_height:
+            raise ValueError("Tile height must exactly divide bitmap height")
+        if width < 1 or height < 1:
+            raise ValueError("width and height must be at least 1")
+        self._bitmap = bitmap
+        self._pixel_shader = pixel_shader
+        self._x = x
+        self._y = y
         self._hidden = False
+        self._width = width
+        self._height = height
+        self._tile_width = tile_width
+        self._tile_height = tile_height
+        self._pixel_width = width * tile_width
+        self._pixel_height = height * tile_height
+        self._tiles_per_row = bitmap.width // tile_width
+        self._tile_count = self._tiles_per_row * (bitmap.height // tile_height)
+        self._check_tile(default_tile)
+        # One tile index per cell, row-major, as compact as the tile
+        # count allows.
+        self._tiles = array.array(
+            "B" if self._tile_count <= 256 else "H",
+            [default_tile] * (width * height),
+        )
+        # A 1x1 grid showing the whole bitmap renders straight from it;
+        # anything else goes through the per-tile RGBA cache.
+        self._single_tile = (
+            width == height == 1
+            and tile_width == bitmap.width and tile_height == bitmap.height
+        )
+        # Tile index changes, tracked like Bitmap's dirty area.
+        self._version = 0
+        self._dirty_area = None
+        self._dirty_base = 0
+        # ((bitmap version, palette version), {(tile, scale): rows}).
+        self._tile_cache = None
+        # Groups containing this TileGrid; told when its area changes.
+        self._parents = []
+        # (content key, bool) memo for :meth:`_opaque_area`.
+        self._opaque_cache = None
+
+    @property
+    def width(self):
+        """Width of the grid in tiles."""
+        return self._width
+
+    @property
+    def height(self):
+        """Height of the grid in tiles."""
+        return self._height
+
+    @property
+    def tile_width(self):
+        """Width of a single tile in pixels."""
+        return self._tile_width
+
+    @property
+    def tile_height(self):
+        """Height of a single tile in pixels."""
+        return self._tile_height
+
+    @property
+    def bitmap(self):
+        """The :class:`Bitmap` the tiles are cut from.
+
+        A grid showing the whole bitmap as its only tile takes the size
+        of a new bitmap; otherwise the new bitmap must be divisible into
+        tiles of the same size.
+        """
+        return self._bitmap
+
+    @bitmap.setter
+    def bitmap(self, bitmap):
+        if self._single_tile:
+            tile_width, tile_height = bitmap.width, bitmap.height
+        else:
+            tile_width, tile_height = self._tile_width, self._tile_height
+            if bitmap.width % tile_width or bitmap.height % tile_height:
+                raise ValueError(
+                    "Tile size must exactly divide bitmap size"
+                )
+            tile_count = (
+                bitmap.width // tile_width * (bitmap.height // tile_height)
+            )
+            if max(self._tiles) >= tile_count:
+                raise ValueError("Tile index out of bounds")
+        self._bitmap = bitmap
+        self._tile_width = tile_width
+        self._tile_height = tile_height
+        self._tiles_per_row = bitmap.width // tile_width
+        self._tile_count = self._tiles_per_row * (bitmap.height // tile_height)
+        typecode = "B" if self._tile_count <= 256 else "H"
+        if self._tiles.typecode != typecode:
+            self._tiles = array.array(typecode, self._tiles)
+        pixel_size = (self._width * tile_width, self._height * tile_height)
+        resized = pixel_size != (self._pixel_width, self._pixel_height)
+        self._pixel_width, self._pixel_height = pixel_size
+        self._content_replaced()
+        if resized:
+            _invalidate_parents(self)
+
+    @property
+    def pixel_shader(self):
+        """The :class:`Palette` colouring the bitmap."""
+        return self._pixel_shader
+
+    @pixel_shader.setter
+    def pixel_shader(self, pixel_shader):
+        self._pixel_shader = pixel_shader
+        self._content_replaced()
+
+    def _content_replaced(self):
+        """Mark the whole grid changed after a new bitmap or palette."""
+        self._tile_cache = None
+        self._version += 1
+        self._dirty_area = (0, 0, self._pixel_width, self._pixel_height)
+        if _idle_displays:
+            _scene_changed()
+
+    def _check_tile(self, tile_index):
+        if not 0 <= tile_index < self._tile_count:
+            raise ValueError("Tile index out of bounds")
+
+    def _cell(self, index):
+        if isinstance(index, tuple):
+            x, y = index
+            if not (0 <= x < self._width and 0 <= y < self._height):
+                raise IndexError("Tile position out of bounds")
+            return y * self._width + x
+        if not 0 <= index < len(self._tiles):
+            raise IndexError("Tile position out of bounds")
+        return index
+
+    def __getitem__(self, index):
+        """Return the tile index shown at ``[x, y]`` (or linear index)."""
+        return self._tiles[self._cell(index)]
+
+    def __setitem__(self, index, tile_index):
+        """Show tile *tile_index* at ``[x, y]`` (or linear index)."""
+        cell = self._cell(index)
+        tile_index = int(tile_index)
+        self._check_tile(tile_index)
+        if self._tiles[cell] == tile_index:
+            return
+        self._tiles[cell] = tile_index
+        self._version += 1
+        if _idle_displays:
+            _scene_changed()
+        cy, cx = divmod(cell, self._width)
+        area = (
+            cx * self._tile_width, cy * self._tile_height,
+            (cx + 1) * self._tile_width, (cy + 1) * self._tile_height,
+        )
+        if self._dirty_area is None:
+            self._dirty_area = area
+        else:
+            self._dirty_area = _area_union(self._dirty_area, area)
+
+    @property
+    def x(self):
+        """Horizontal position within the parent Group."""
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        self._x = value
+        _invalidate_parents(self)
+
+    @property
+    def y(self):
+        """Vertical position within the parent Group."""
+        return self._y
+
+    @y.setter
+    def y(self, value):
+        self._y = value
+        _invalidate_parents(self)
 
     @property
     def hidden(self):
@@ -153,6 +999,7 @@ class TileGrid:
     @hidden.setter
     def hidden(self, value):
         self._hidden = bool(value)
+        _invalidate_parents(self)
 
     def _render_to_buffer(self, pixels, buf_width, buf_height, offset_x, offset_y):
         """Pure Python: write RGBA pixel data into the flat bytearray *pixels*.
@@ -167,49 +1014,392 @@ class TileGrid:
         """
         if self._hidden:
             return
+        self._draw(
+            pixels, buf_width, self._x + offset_x, self._y + offset_y,
+            (0, 0, buf_width, buf_height),
+        )
+
+    # -- layer protocol used by Display -----------------------------------
+
+    def _area_in_parent(self):
+        """Return the area covered in the parent's coordinates, or
+        ``None`` when hidden."""
+        if self._hidden:
+            return None
+        return (
+            self._x, self._y,
+            self._x + self._pixel_width, self._y + self._pixel_height,
+        )
+
+    def _collect_layers(self, layers, offset_x, offset_y, clip=None, scale=1):
+        if self._hidden:
+            return
+        x = offset_x + self._x * scale
+        y = offset_y + self._y * scale
+        if clip is not None and (
+            x >= clip[2] or y >= clip[3]
+            or x + self._pixel_width * scale <= clip[0]
+            or y + self._pixel_height * scale <= clip[1]
+        ):
+            return
+        layers.append((self, x, y, scale))
+
+    def _screen_area(self, x, y, scale=1):
+        """Return the display area covered when drawn at (*x*, *y*)
+        magnified *scale* times."""
+        return (
+            x, y, x + self._pixel_width * scale, y + self._pixel_height * scale
+        )
+
+    def _content_key(self):
+        """Return a token that changes whenever the rendered pixels may."""
+        return (self.bitmap._version, self.pixel_shader._version, self._version)
+
+    def _changed_area(self, key):
+        """Return the local area changed since content token *key*."""
+        whole = (0, 0, self._pixel_width, self._pixel_height)
+        if key[1] != self.pixel_shader._version:
+            return whole
+        changed = self.bitmap._changed_area(key[0])
+        if changed is not None and not self._single_tile:
+            # A bitmap pixel may appear in any number of cells.
+            return whole
+        if key[2] != self._version:
+            if key[2] != self._dirty_base or self._dirty_area is None:
+                return whole
+            if changed is None:
+                changed = self._dirty_area
+            else:
+                changed = _area_union(changed, self._dirty_area)
+        return changed
+
+    def _opaque_area(self, x, y, scale=1):
+        """Return the display area this layer paints fully opaque when
+        drawn at (*x*, *y*) magnified *scale* times, or ``None``."""
+        tables = self.pixel_shader._rgba_tables()
+        if not tables[4]:
+            # Transparent entries exist; opaque only if none is in use.
+            key = self._content_key()
+            if self._opaque_cache is None or self._opaque_cache[0] != key:
+                opaque = self.bitmap._all_opaque(self.pixel_shader)
+                self._opaque_cache = (key, opaque)
+            if not self._opaque_cache[1]:
+                return None
+        return self._screen_area(x, y, scale)
+
+    def _finish_refresh(self):
+        self.bitmap._finish_refresh()
+        self._dirty_area = None
+        self._dirty_base = self._version
+
+    def _draw(self, pixels, buf_width, x, y, clip, scale=1):
+        """Draw with the bitmap origin at (*x*, *y*), magnified *scale*
+        times, touching only the pixels inside the buffer area *clip*.
+
+        Rows are clipped once, converted to RGBA channels through the
+        palette's lookup tables and stored with slice assignments.  When
+        scaled, each visible source row is widened once with slice
+        operations and reused for the *scale* display rows it covers.
+        """
+        area = _area_intersection(
+            clip,
+            (x, y, x + self._pixel_width * scale, y + self._pixel_height * scale),
+        )
+        if area is None:
+            return
+        if _np is not None and _area_size(area) >= _ARRAY_MIN_PIXELS:
+            self._draw_array(pixels, buf_width, x, y, area, scale)
+            return
+        if not self._single_tile:
+            self._draw_tiles(pixels, buf_width, x, y, area, scale)
+            return
         bm = self.bitmap
+        src_width = bm.width
+        x1, y1, x2, y2 = area
         palette = self.pixel_shader
-        ox = self.x + offset_x
-        oy = self.y + offset_y
-        for y in range(bm.height):
-            py = oy + y
-            if py < 0 or py >= buf_height:
-                continue
-            for x in range(bm.width):
-                px = ox + x
-                if px < 0 or px >= buf_width:
-                    continue
-                idx = bm[x, y]
-                if palette.is_transparent(idx):
-                    continue
-                color = palette[idx]
-                off = (py * buf_width + px) * 4
-                pixels[off] = (color >> 16) & 0xFF      # R
-                pixels[off + 1] = (color >> 8) & 0xFF   # G
-                pixels[off + 2] = color & 0xFF           # B
-                pixels[off + 3] = 255                    # A
+        red, green, blue, alpha, opaque = palette._rgba_tables()
+        wide_values = bm._bits == 16
+        n = x2 - x1
+        dst = (y1 * buf_width + x1) * 4
+
+        if (opaque and scale == 1 and n == src_width == buf_width
+                and bm._bits == 8):
+            # Source and destination rows are both contiguous: convert the
+            # whole visible block in one go.
+            src = (y1 - y) * src_width
+            indices = bm._data[src:src + n * (y2 - y1)]
+            end = dst + len(indices) * 4
+            pixels[dst:end:4] = indices.translate(red)
+            pixels[dst + 1:end:4] = indices.translate(green)
+            pixels[dst + 2:end:4] = indices.translate(blue)
+            pixels[dst + 3:end:4] = b"\xff" * len(indices)
+            return
+
+        # Visible source columns, and how far into the first widened source
+        # pixel the clip starts when scaled.
+        sx1 = (x1 - x) // scale
+        sx2 = (x2 - x - 1) // scale + 1
+        skip = x1 - x - sx1 * scale
+        wide = None
+        if scale != 1:
+            wide = bytearray((sx2 - sx1) * scale)
+            if wide_values:
+                wide = array.array("H", bytes(2 * len(wide)))
+        # Rows identical to the previous one (solid fills, bars, most UI
+        # chrome, and every repeat of a scaled row) reuse its converted
+        # RGBA and opaque runs.
+        rgba = bytearray(n * 4)
+        runs = [(0, n * 4)]
+        previous = None
+        last_row = (y2 - y - 1) // scale + 1
+        band = max(1, _UNPACK_BAND // src_width)
+        band_end = -1
+        for py in range(y1, y2):
+            sy = (py - y) // scale
+            if sy >= band_end:
+                band_end = min(sy + band, last_row)
+                values, base, pitch = bm._get_rows(sy, band_end)
+            src = base + sy * pitch
+            indices = values[src + sx1:src + sx2]
+            if indices != previous:
+                previous = indices
+                if scale != 1:
+                    for k in range(scale):
+                        wide[k::scale] = indices
+                    indices = wide[skip:skip + n]
+                if wide_values:
+                    rgba[:] = palette._rgba_row(indices)
+                    mask = rgba[3::4]
+                else:
+                    rgba[0::4] = indices.translate(red)
+                    rgba[1::4] = indices.translate(green)
+                    rgba[2::4] = indices.translate(blue)
+                    mask = None if opaque else indices.translate(alpha)
+                if opaque:
+                    rgba[3::4] = b"\xff" * n
+                else:
+                    rgba[3::4] = mask
+                    runs = _opaque_runs(mask)
+            # Copy each run of opaque pixels with one slice store.
+            for start, stop in runs:
+                pixels[dst + start:dst + stop] = rgba[start:stop]
+            dst += buf_width * 4
+
+    def _tile_rows(self, tile, scale):
+        """Return ``(rows, runs)`` for *tile* magnified *scale* times.
+
+        ``rows`` holds one RGBA ``bytes`` per display row of the tile;
+        ``runs`` is ``None`` for a fully opaque tile, otherwise the opaque
+        ``(start, stop)`` byte runs of each row.  Results are cached until
+        the bitmap or palette changes, so repeated tiles (text, maps) are
+        converted through the palette only once.
+        """
+        palette = self.pixel_shader
+        key = (self.bitmap._version, palette._version)
+        if self._tile_cache is None or self._tile_cache[0] != key:
+            self._tile_cache = (key, {})
+        cache = self._tile_cache[1]
+        entry = cache.get((tile, scale))
+        if entry is not None:
+            return entry
+        red, green, blue, alpha, opaque_palette = palette._rgba_tables()
+        bm = self.bitmap
+        wide_values = bm._bits == 16
+        tw = self._tile_width
+        sx = (tile % self._tiles_per_row) * tw
+        sy = (tile // self._tiles_per_row) * self._tile_height
+        n = tw * scale
+        wide = array.array("H", bytes(2 * n)) if wide_values else bytearray(n)
+        rows = []
+        runs = []
+        opaque = True
+        for row in range(sy, sy + self._tile_height):
+            indices = bm._get_row(row, sx, sx + tw)
+            if scale != 1:
+                for k in range(scale):
+                    wide[k::scale] = indices
+                indices = wide
+            if wide_values:
+                rgba = bytearray(palette._rgba_row(indices))
+                mask = rgba[3::4]
+            else:
+                mask = indices.translate(alpha)
+                rgba = bytearray(n * 4)
+                rgba[0::4] = indices.translate(red)
+                rgba[1::4] = indices.translate(green)
+                rgba[2::4] = indices.translate(blue)
+            if opaque_palette:
+                # As in the single-tile path, an opaque palette paints
+                # every pixel, even ones whose value is past its end.
+                mask = b"\xff" * n
+            rgba[3::4] = mask
+            row_runs = _opaque_runs(mask)
+            if row_runs != [(0, n * 4)]:
+                opaque = False
+            rgba = bytes(rgba)
+            rows.extend([rgba] * scale)
+            runs.extend([row_runs] * scale)
+        entry = (rows, None if opaque else runs)
+        cache[(tile, scale)] = entry
+        return entry
+
+    def _draw_tiles(self, pixels, buf_width, x, y, area, scale):
+        """Blit the cells of a multi-tile grid overlapping *area* from the
+        per-tile RGBA cache."""
+        x1, y1, x2, y2 = area
+        tw = self._tile_width * scale
+        th = self._tile_height * scale
+        stride = buf_width * 4
+        tiles = self._tiles
+        for cy in range((y1 - y) // th, (y2 - y - 1) // th + 1):
+            ty = y + cy * th
+            ay1 = max(y1, ty)
+            ay2 = min(y2, ty + th)
+            for cx in range((x1 - x) // tw, (x2 - x - 1) // tw + 1):
+                tx = x + cx * tw
+                ax1 = max(x1, tx)
+                cs = (ax1 - tx) * 4
+                ce = (min(x2, tx + tw) - tx) * 4
+                rows, runs = self._tile_rows(tiles[cy * self._width + cx], scale)
+                dst = ay1 * stride + ax1 * 4
+                for r in range(ay1 - ty, ay2 - ty):
+                    if runs is None:
+                        pixels[dst:dst + ce - cs] = rows[r][cs:ce]
+                    else:
+                        row = rows[r]
+                        for start, stop in runs[r]:
+                            if start < cs:
+                                start = cs
+                            if stop > ce:
+                                stop = ce
+                            if start < stop:
+                                pixels[dst + start - cs:dst + stop - cs] = (
+                                    row[start:stop]
+                                )
+                    dst += stride
+
+    def _draw_array(self, pixels, buf_width, x, y, area, scale):
+        """NumPy backend for :meth:`_draw`: gather the visible bitmap values
+        with fancy indexing, convert them through the palette in one
+        ``take`` and store them with a boolean mask."""
+        x1, y1, x2, y2 = area
+        band = max(1, _ARRAY_BAND // (x2 - x1))
+        if y2 - y1 > band:
+            for by in range(y1, y2, band):
+                self._draw_array(
+                    pixels, buf_width, x, y, (x1, by, x2, min(by + band, y2)),
+                    scale,
+                )
+            return
+        bm = self.bitmap
+        palette = self.pixel_shader
+        if self._single_tile:
+            # Visible source rectangle, magnified with ``repeat`` and then
+            # trimmed to the clip.
+            sx1 = (x1 - x) // scale
+            sy1 = (y1 - y) // scale
+            values = bm._index_array(sy1, (y2 - y - 1) // scale + 1)
+            values = values[:, sx1:(x2 - x - 1) // scale + 1]
+            if scale != 1:
+                ox = x1 - x - sx1 * scale
+                oy = y1 - y - sy1 * scale
+                values = values.repeat(scale, 0).repeat(scale, 1)
+                values = values[oy:oy + y2 - y1, ox:ox + x2 - x1]
+        else:
+            # Grid pixel coordinates of each visible display row and column.
+            rows = (_np.arange(y1, y2) - y) // scale
+            cols = (_np.arange(x1, x2) - x) // scale
+            tw = self._tile_width
+            th = self._tile_height
+            per_row = self._tiles_per_row
+            grid = _np.frombuffer(self._tiles, self._tiles.typecode).reshape(
+                self._height, self._width
+            )
+            tiles = grid[(rows // th)[:, None], cols // tw].astype(_np.intp)
+            sheet = bm._index_array(0, bm.height)
+            values = sheet[
+                tiles // per_row * th + (rows % th)[:, None],
+                tiles % per_row * tw + cols % tw,
+            ]
+        rgba = palette._rgba_array().take(values, mode="clip")
+        frame = _frame_array(pixels, buf_width)
+        if palette._rgba_tables()[4]:
+            # As in the pure Python path, an opaque palette paints every
+            # pixel, even ones whose value is past the end of the palette.
+            rgba |= _ALPHA_MASK
+            _blit_array(frame, x1, y1, rgba, True)
+        else:
+            _blit_array(frame, x1, y1, rgba, False)
 
 
 class Group:
-    """An ordered, mutable list of :class:`TileGrid` and nested
-    :class:`Group` objects.
+    """An ordered, mutable list of :class:`TileGrid`, ``vectorio`` shape
+    and nested :class:`Group` objects.
 
     Compatible with the core subset of CircuitPython's
     ``displayio.Group``.  No JS imports.
 
     Args:
-        scale (int): Scale factor (stored for API compatibility; currently
-            treated as 1 – scaling is deferred to a future version).
+        scale (int): Integer magnification applied to all children; nested
+            scales multiply.  The group's own *x* and *y* are in its
+            parent's (scaled) coordinates, as in CircuitPython.
         x (int): Horizontal translation applied to all children.
         y (int): Vertical translation applied to all children.
+        cache (bool): beady-eye extension.  When ``True`` the subtree is
+            rendered once into an RGBA cache that the display draws as a
+            single layer; see :attr:`cache`.
     """
 
-    def __init__(self, *, scale=1, x=0, y=0):
-        self.scale = scale
-        self.x = x
-        self.y = y
+    def __init__(self, *, scale=1, x=0, y=0, cache=False):
+        self._scale = self._check_scale(scale)
+        self._x = x
+        self._y = y
         self._contents = []
         self._hidden = False
+        # Groups containing this one; told when its area changes.
+        self._parents = []
+        # Cached union of the children's areas in this group's own
+        # coordinates (``None`` when empty); valid while _bounds_valid.
+        self._bounds = None
+        self._bounds_valid = False
+        # _GroupCache when the subtree is drawn from a cached sprite.
+        self._cache = _GroupCache(self) if cache else None
+
+    @staticmethod
+    def _check_scale(scale):
+        if int(scale) != scale or scale < 1:
+            raise ValueError("scale must be a positive integer")
+        return int(scale)
+
+    @property
+    def scale(self):
+        """Integer magnification applied to all children."""
+        return self._scale
+
+    @scale.setter
+    def scale(self, value):
+        self._scale = self._check_scale(value)
+        _invalidate_parents(self)
+
+    @property
+    def x(self):
+        """Horizontal translation applied to all children."""
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        self._x = value
+        _invalidate_parents(self)
+
+    @property
+    def y(self):
+        """Vertical translation applied to all children."""
+        return self._y
+
+    @y.setter
+    def y(self, value):
+        self._y = value
+        _invalidate_parents(self)
 
     @property
     def hidden(self):
@@ -219,22 +1409,47 @@ class Group:
     @hidden.setter
     def hidden(self, value):
         self._hidden = bool(value)
+        _invalidate_parents(self)
+
+    @property
+    def cache(self):
+        """Whether the subtree is drawn from a cached RGBA sprite.
+
+        beady-eye extension.  A cached group is composited once into its
+        own buffer and blitted as a single layer, so static panels cost one
+        copy per refresh however many children they have.  The cache is
+        repainted automatically: entirely when anything inside is added,
+        removed, moved, resized or shown/hidden, and only in the changed
+        area when a descendant's bitmap, palette, tiles or shape change.
+        """
+        return self._cache is not None
+
+    @cache.setter
+    def cache(self, value):
+        if bool(value) != (self._cache is not None):
+            self._cache = _GroupCache(self) if value else None
+            _layout_changed()
 
     def append(self, item):
         """Append *item* to the end of the group."""
         self._contents.append(item)
+        self._adopt(item)
 
     def remove(self, item):
         """Remove the first occurrence of *item* from the group."""
         self._contents.remove(item)
+        self._release(item)
 
     def insert(self, index, item):
         """Insert *item* before position *index*."""
         self._contents.insert(index, item)
+        self._adopt(item)
 
     def pop(self, index=-1):
         """Remove and return the item at *index* (default: last)."""
-        return self._contents.pop(index)
+        item = self._contents.pop(index)
+        self._release(item)
+        return item
 
     def __len__(self):
         return len(self._contents)
@@ -243,19 +1458,290 @@ class Group:
         return self._contents[index]
 
     def __setitem__(self, index, value):
+        old = self._contents[index]
         self._contents[index] = value
+        self._release(old)
+        self._adopt(value)
 
     def __iter__(self):
         return iter(self._contents)
 
     def _render_to_buffer(self, pixels, buf_width, buf_height, offset_x, offset_y):
-        """Pure Python: recursively render all children into *pixels*."""
+        """Pure Python: render all descendants into *pixels*, skipping
+        regions hidden behind later opaque layers."""
+        layers = []
+        self._collect_layers(
+            layers, offset_x, offset_y, (0, 0, buf_width, buf_height)
+        )
+        _render_layers(
+            pixels, buf_width,
+            [
+                (layer, x, y, scale, layer._screen_area(x, y, scale))
+                for layer, x, y, scale in layers
+            ],
+            (0, 0, buf_width, buf_height),
+        )
+
+    def _adopt(self, item):
+        parents = getattr(item, "_parents", None)
+        if parents is not None:
+            parents.append(self)
+        _layout_changed()
+        self._invalidate_bounds()
+
+    def _release(self, item):
+        parents = getattr(item, "_parents", None)
+        if parents is not None and self in parents:
+            parents.remove(self)
+        _layout_changed()
+        self._invalidate_bounds()
+
+    def _invalidate_bounds(self):
+        # An invalid cache implies every ancestor's cache is invalid too,
+        # so propagation can stop at the first one already invalidated.
+        if self._bounds_valid:
+            self._bounds_valid = False
+            if self._cache is not None:
+                self._cache._stale = True
+            _invalidate_parents(self)
+
+    def _content_bounds(self):
+        """Return the union of the visible children's areas in this
+        group's coordinates, or ``None`` if nothing is visible.
+
+        Cached until a child is added, removed, moved, shown/hidden or
+        changes its own bounds, so whole subtrees can be rejected in O(1).
+        """
+        if not self._bounds_valid:
+            bounds = None
+            for item in self._contents:
+                area = item._area_in_parent()
+                if area is not None:
+                    bounds = area if bounds is None else _area_union(bounds, area)
+            self._bounds = bounds
+            self._bounds_valid = True
+        return self._bounds
+
+    def _area_in_parent(self):
+        if self._hidden:
+            return None
+        bounds = self._content_bounds()
+        if bounds is None:
+            return None
+        s = self._scale
+        return (
+            self._x + bounds[0] * s, self._y + bounds[1] * s,
+            self._x + bounds[2] * s, self._y + bounds[3] * s,
+        )
+
+    def _collect_layers(self, layers, offset_x, offset_y, clip=None, scale=1):
+        """Append ``(layer, x, y, scale)`` for every visible descendant, in
+        painting order, to the list *layers*.
+
+        *scale* is the accumulated magnification of the parent Groups.
+        With a *clip* area, subtrees whose cached bounds fall entirely
+        outside it are skipped without being visited.
+        """
         if self._hidden:
             return
-        ox = offset_x + self.x
-        oy = offset_y + self.y
+        ox = offset_x + self._x * scale
+        oy = offset_y + self._y * scale
+        scale *= self._scale
+        if clip is not None:
+            bounds = self._content_bounds()
+            if bounds is None or (
+                ox + bounds[0] * scale >= clip[2]
+                or oy + bounds[1] * scale >= clip[3]
+                or ox + bounds[2] * scale <= clip[0]
+                or oy + bounds[3] * scale <= clip[1]
+            ):
+                return
+        if self._cache is not None:
+            cache = self._cache
+            cache._update(scale)
+            if cache._bounds is not None:
+                layers.append((
+                    cache, ox + cache._bounds[0] * scale,
+                    oy + cache._bounds[1] * scale, 1,
+                ))
+            return
         for item in self._contents:
-            item._render_to_buffer(pixels, buf_width, buf_height, ox, oy)
+            item._collect_layers(layers, ox, oy, clip, scale)
+
+
+class _GroupCache:
+    """The pre-rendered RGBA sprite of a cached :class:`Group`.
+
+    Drawn by the display as one layer in place of the group's
+    descendants.  Its pixels are at display resolution for the scale the
+    group was last drawn at, and its dirty area is tracked like
+    :class:`Bitmap`'s so refreshes only repaint what changed inside.
+    """
+
+    def __init__(self, group):
+        self._group = group
+        # Set by Group._invalidate_bounds when the subtree's layout changes.
+        self._stale = True
+        self._scale = None
+        # Content bounds in group coordinates when last rendered.
+        self._bounds = None
+        self._width = 0
+        self._height = 0
+        self._pixels = bytearray()
+        # Opaque (start, stop) byte runs of each cached row.
+        self._runs = []
+        self._opaque = False
+        # [layer, x, y, scale, area, content key] of every descendant layer,
+        # in painting order and cache coordinates.
+        self._layers = []
+        self._version = 0
+        self._dirty_area = None
+        self._dirty_base = 0
+
+    def _update(self, scale):
+        """Bring the cache up to date with the group drawn at *scale*."""
+        bounds = self._group._content_bounds()
+        if self._stale or scale != self._scale or bounds != self._bounds:
+            self._rebuild(scale, bounds)
+        else:
+            self._update_content()
+
+    def _update_content(self):
+        """Repaint the area of every descendant whose content changed."""
+        changed = None
+        for entry in self._layers:
+            layer, x, y, layer_scale, _, key = entry
+            content = layer._content_key()
+            if content == key:
+                continue
+            entry[5] = content
+            area = layer._changed_area(key)
+            if area is None:
+                continue
+            area = (
+                x + area[0] * layer_scale, y + area[1] * layer_scale,
+                x + area[2] * layer_scale, y + area[3] * layer_scale,
+            )
+            changed = area if changed is None else _area_union(changed, area)
+        if changed is not None:
+            changed = _area_intersection(
+                changed, (0, 0, self._width, self._height)
+            )
+        if changed is not None:
+            self._render(changed)
+
+    def _rebuild(self, scale, bounds):
+        self._stale = False
+        self._scale = scale
+        self._bounds = bounds
+        if bounds is None:
+            self._width = self._height = 0
+            self._pixels = bytearray()
+            self._layers = []
+            self._runs = []
+            self._mark_dirty(None)
+            return
+        self._width = (bounds[2] - bounds[0]) * scale
+        self._height = (bounds[3] - bounds[1]) * scale
+        layers = []
+        for item in self._group._contents:
+            item._collect_layers(
+                layers, -bounds[0] * scale, -bounds[1] * scale, None, scale
+            )
+        self._layers = [
+            [layer, x, y, s, layer._screen_area(x, y, s), layer._content_key()]
+            for layer, x, y, s in layers
+        ]
+        self._pixels = bytearray(self._width * self._height * 4)
+        self._runs = [[] for _ in range(self._height)]
+        self._render((0, 0, self._width, self._height))
+
+    def _render(self, area):
+        """Repaint *area* of the sprite from the descendant layers."""
+        _render_layers(
+            self._pixels, self._width,
+            [tuple(entry[:5]) for entry in self._layers], area, clear=True,
+        )
+        row_bytes = self._width * 4
+        pixels = self._pixels
+        for y in range(area[1], area[3]):
+            mask = pixels[y * row_bytes + 3:(y + 1) * row_bytes:4]
+            self._runs[y] = _opaque_runs(mask)
+        whole = [(0, row_bytes)]
+        self._opaque = all(runs == whole for runs in self._runs)
+        self._mark_dirty(area)
+
+    def _mark_dirty(self, area):
+        self._version += 1
+        if area is None:
+            area = (0, 0, self._width, self._height)
+        if self._dirty_area is None:
+            self._dirty_area = area
+        else:
+            self._dirty_area = _area_union(self._dirty_area, area)
+
+    # -- layer protocol used by Display -----------------------------------
+
+    def _screen_area(self, x, y, scale=1):
+        return (x, y, x + self._width, y + self._height)
+
+    def _content_key(self):
+        # A display reusing its draw list does not call _collect_layers,
+        # so descendant content changes are picked up here.
+        if self._scale is not None and not self._stale:
+            self._update_content()
+        return self._version
+
+    def _changed_area(self, key):
+        if key == self._version:
+            return None
+        if key != self._dirty_base or self._dirty_area is None:
+            return (0, 0, self._width, self._height)
+        return self._dirty_area
+
+    def _opaque_area(self, x, y, scale=1):
+        if not self._opaque:
+            return None
+        return self._screen_area(x, y)
+
+    def _finish_refresh(self):
+        self._dirty_area = None
+        self._dirty_base = self._version
+        for entry in self._layers:
+            entry[0]._finish_refresh()
+
+    def _draw(self, pixels, buf_width, x, y, clip, scale=1):
+        """Copy the opaque runs of the sprite, placed at (*x*, *y*), that
+        fall inside the buffer area *clip*."""
+        area = _area_intersection(clip, self._screen_area(x, y))
+        if area is None:
+            return
+        x1, y1, x2, y2 = area
+        if _np is not None:
+            sprite = _frame_array(self._pixels, self._width)
+            frame = _frame_array(pixels, buf_width)
+            band = max(1, _ARRAY_BAND // (x2 - x1))
+            for by in range(y1, y2, band):
+                by2 = min(by + band, y2)
+                _blit_array(
+                    frame, x1, by, sprite[by - y:by2 - y, x1 - x:x2 - x],
+                    self._opaque,
+                )
+            return
+        row_bytes = self._width * 4
+        left = (x1 - x) * 4
+        right = (x2 - x) * 4
+        cache = self._pixels
+        for py in range(y1, y2):
+            src = (py - y) * row_bytes
+            dst = (py * buf_width + x) * 4
+            for start, stop in self._runs[py - y]:
+                if start < left:
+                    start = left
+                if stop > right:
+                    stop = right
+                if start < stop:
+                    pixels[dst + start:dst + stop] = cache[src + start:src + stop]
 
 
 class Display:
@@ -264,20 +1750,40 @@ class Display:
     Compatible with the core subset of CircuitPython's
     ``displayio.Display``.
 
-    The **only** JS bridge in the entire module is a single
-    ``ctx.putImageData()`` call inside :meth:`refresh`.  Every other
+    The **only** JS bridge in the entire module is the
+    ``ctx.putImageData()`` upload inside :meth:`refresh`.  Every other
     method is pure Python.
 
+    The display keeps its framebuffer between refreshes and diffs the
+    scene graph against the previous frame, so :meth:`refresh` only
+    re-renders and uploads the rectangles that actually changed.
+
     Pass either an HTML canvas *element* (obtained via Pyodide's ``js``
-    bridge) or a canvas element *id* string.
+    bridge) or a canvas element *id* string.  In a Web Worker, pass the
+    ``OffscreenCanvas`` the page transferred to it (see
+    ``displayio_worker.js``); the display draws on it the same way.
 
     Args:
         canvas: An HTML canvas element or its ``id`` string.
         width (int | None): Override canvas width in pixels.
         height (int | None): Override canvas height in pixels.
-        auto_refresh (bool): When ``True`` (default), :meth:`refresh` is
-            called automatically after :meth:`show` or a
-            :attr:`root_group` assignment.
+        auto_refresh (bool): When ``True`` (default), the display
+            refreshes by itself: immediately after :meth:`show` or a
+            :attr:`root_group` assignment, and on the next animation frame
+            after any change to the scene, so several changes in a row
+            are drawn once.
+
+    Attributes:
+        refresh_budget (float | None): beady-eye extension.  When set,
+            refreshes the display starts by itself run as
+            :meth:`refresh_async` tasks in slices of about this many
+            milliseconds, so a large redraw (say in :meth:`show`) does not
+            freeze the page.  Needs a running event loop, as under
+            Pyodide; otherwise they render at once.  ``None`` (default)
+            always renders at once.
+        progressive_refresh (bool): beady-eye extension.  Upload each
+            slice of an asynchronous refresh as soon as it is rendered
+            instead of the complete frame at the end.
 
     Example::
 
@@ -302,10 +1808,56 @@ class Display:
         if height is not None:
             self._canvas.height = height
 
-        self.width = int(self._canvas.width)
-        self.height = int(self._canvas.height)
+        self._init_state(
+            int(self._canvas.width), int(self._canvas.height), auto_refresh
+        )
+
+    def _init_state(self, width, height, auto_refresh):
+        """Set up the framebuffer and refresh bookkeeping."""
+        self.width = width
+        self.height = height
         self._root_group = None
         self._auto_refresh = auto_refresh
+        # Persistent RGBA framebuffer; only damaged areas are re-rendered.
+        # It is never resized in place (only replaced on a canvas resize)
+        # because JS holds a live view of its memory.
+        self._buffer = bytearray(self.width * self.height * 4)
+        # (PyProxy, PyBuffer view, ImageData) sharing ``_buffer``; created
+        # on the first upload by :meth:`_image_data`.
+        self._image = None
+        self._ctx = None
+        # id(layer) -> (layer, x, y, scale, area, content key) as of the last
+        # refresh, in painting order.  ``None`` forces a full refresh.
+        self._drawn = None
+        # _layout_serial when ``_drawn`` was compiled from the scene graph;
+        # while it is unchanged the draw list is reused without a traversal.
+        self._layout_serial = None
+        # frame_recorder.FrameRecorder instances shown each refresh's
+        # damaged areas.
+        self._recorders = []
+        # Refresh scheduling: time of the last refresh, time a deferred
+        # refresh is due (None for the next frame), whether a frame
+        # callback is pending and whether this display is in
+        # _idle_displays.  The lock keeps scheduled and direct refreshes
+        # from overlapping where frames come from another thread.
+        self._last_refresh = None
+        self._refresh_due = None
+        self._frame_pending = False
+        self._idle = False
+        self._frame_proxy = None
+        self._lock = threading.RLock()
+        # (event loop, future) pairs of next_frame() calls waiting for the
+        # next frame, and whether refresh_async() is rendering.
+        self._frame_waiters = []
+        self._rendering = False
+        self._refresh_task = None
+        self.refresh_budget = None
+        self.progressive_refresh = False
+        # Totals behind refresh_stats.
+        self._stats = {
+            "frames": 0, "slices": 0, "last_slices": 0, "max_slices": 0,
+            "frame_ms": 0.0, "max_slice_ms": 0.0,
+        }
 
     @property
     def root_group(self):
@@ -315,33 +1867,651 @@ class Display:
     @root_group.setter
     def root_group(self, group):
         self._root_group = group
+        self._drawn = None
         if self._auto_refresh:
-            self.refresh()
+            self._auto_refresh_now()
 
     def show(self, group):
         """Set *group* as the root group and refresh the display."""
         self.root_group = group
 
-    def refresh(self):
-        """Render the scene graph into an RGBA buffer, then upload it to
-        the HTML canvas.
+    @property
+    def auto_refresh(self):
+        """``True`` when the display refreshes by itself, at most once per
+        animation frame, whenever the scene changes."""
+        return self._auto_refresh
+
+    @auto_refresh.setter
+    def auto_refresh(self, value):
+        self._auto_refresh = bool(value)
+        if self._auto_refresh and self._root_group is not None:
+            self._schedule_refresh()
+
+    def refresh(self, *, target_frames_per_second=None,
+                minimum_frames_per_second=0):
+        """Re-render the areas of the scene graph that changed since the
+        last refresh, then upload them to the HTML canvas.
+
+        Scene traversal is entirely pure Python.  The only JS bridge calls
+        are the ``ctx.putImageData()`` uploads at the end of this method,
+        one per damaged rectangle, reading straight from the persistent
+        framebuffer.  If the canvas was resized since the last refresh the
+        framebuffer is reallocated and fully redrawn.
+
+        With *target_frames_per_second* and :attr:`auto_refresh` off, a
+        call less than one frame after the last refresh does not render:
+        it schedules a refresh for when the frame is due and returns
+        ``False``, so code calling :meth:`refresh` after each of several
+        changes renders once per frame.  Unlike CircuitPython, which
+        sleeps until the frame is due, this never blocks the browser.
+
+        Args:
+            target_frames_per_second (int | None): Frame rate to hold
+                refreshes to; ``None`` refreshes immediately.
+            minimum_frames_per_second (int): With
+                *target_frames_per_second*, raise ``RuntimeError`` when
+                the last refresh is older than one frame at this rate.
+
+        Returns:
+            bool: ``True`` if the display was refreshed, ``False`` if the
+            refresh was deferred to the next frame.
+        """
+        if target_frames_per_second is not None and not self._auto_refresh:
+            last = self._last_refresh
+            if last is not None:
+                since = time.monotonic() - last
+                if (minimum_frames_per_second
+                        and since > 1 / minimum_frames_per_second):
+                    raise RuntimeError("Below minimum frame rate")
+                frame = 1 / target_frames_per_second
+                if since < frame:
+                    self._schedule_refresh(last + frame)
+                    return False
+        return self._refresh()
+
+    async def refresh_async(self, *, budget=None, progressive=None):
+        """Refresh like :meth:`refresh`, yielding to the event loop while
+        rendering.
+
+        beady-eye extension.  The damaged areas are rendered in small
+        bands, grouped into slices that each take about *budget*
+        milliseconds, with an ``await`` between slices so that the
+        browser (or other tasks) can run.  By default the bands are
+        uploaded together once all are drawn, so the canvas never shows a
+        half-rendered frame; with *progressive* each slice is uploaded as
+        soon as it is drawn.  Changes made while it renders are drawn by
+        the next refresh.  Refreshes that would overlap wait for this one
+        to finish.  See :attr:`refresh_stats` for the slice counts.
+
+        Args:
+            budget (float | None): Time budget of a slice in
+                milliseconds; ``None`` uses :attr:`refresh_budget`, or 8
+                if that is unset.  ``0`` yields after every band.
+            progressive (bool | None): Upload each slice as it is drawn;
+                ``None`` uses :attr:`progressive_refresh`.
+
+        Returns:
+            bool: ``True``.
+        """
+        if budget is None:
+            budget = (_SLICE_MS if self.refresh_budget is None
+                      else self.refresh_budget)
+        if progressive is None:
+            progressive = self.progressive_refresh
+        while True:
+            with self._lock:
+                if not self._rendering:
+                    self._rendering = True
+                    areas, layers = self._begin_refresh()
+                    break
+            await self.next_frame()
+        start = slice_start = time.perf_counter()
+        slices = 1
+        longest = 0.0
+        drawn = []
+        try:
+            for band in _split_areas(areas, _ASYNC_CHUNK_PIXELS):
+                now = time.perf_counter()
+                if drawn and (now - slice_start) * 1000 >= budget:
+                    longest = max(longest, now - slice_start)
+                    if progressive:
+                        with self._lock:
+                            self._present(drawn)
+                        drawn = []
+                    await asyncio.sleep(0)
+                    slices += 1
+                    slice_start = time.perf_counter()
+                self._render_areas([band], layers)
+                drawn.append(band)
+        except BaseException:
+            with self._lock:
+                # Cancelled with the framebuffer partly drawn.
+                self._rendering = False
+                self._drawn = None
+            raise
+        with self._lock:
+            self._rendering = False
+            self._end_refresh(
+                areas, layers, drawn if progressive else areas
+            )
+        if areas:
+            now = time.perf_counter()
+            self._count_frame(
+                slices, now - start, max(longest, now - slice_start)
+            )
+        return True
+
+    @property
+    def refresh_stats(self):
+        """Slice statistics of the refreshes that rendered something.
+
+        beady-eye extension.  A dict with ``frames`` (refreshes counted),
+        ``slices_per_frame`` (mean), ``last_slices`` and ``max_slices``
+        (slices of the last and the most sliced refresh), ``frame_ms``
+        (wall time of the last refresh, from its first slice to its last)
+        and ``max_slice_ms`` (longest slice seen).  A :meth:`refresh` is
+        a single slice.
+        """
+        stats = self._stats
+        return {
+            "frames": stats["frames"],
+            "slices_per_frame": stats["slices"] / max(1, stats["frames"]),
+            "last_slices": stats["last_slices"],
+            "max_slices": stats["max_slices"],
+            "frame_ms": stats["frame_ms"],
+            "max_slice_ms": stats["max_slice_ms"],
+        }
+
+    def _count_frame(self, slices, seconds, longest):
+        stats = self._stats
+        stats["frames"] += 1
+        stats["slices"] += slices
+        stats["last_slices"] = slices
+        stats["max_slices"] = max(stats["max_slices"], slices)
+        stats["frame_ms"] = seconds * 1000
+        stats["max_slice_ms"] = max(stats["max_slice_ms"], longest * 1000)
+
+    async def next_frame(self):
+        """Wait for the next animation frame.
+
+        beady-eye extension.  An animation loop can be written as a
+        coroutine that changes the scene and then awaits this; with
+        :attr:`auto_refresh` on, the display has been refreshed by the
+        time it returns.  Frames come from ``requestAnimationFrame``
+        through one long-lived proxy, so waiting creates no JS proxies.
+        :class:`HeadlessDisplay` frames come from its timer thread, so
+        this also works under :func:`asyncio.run`.
+
+        Returns:
+            float: The :func:`time.monotonic` time of the frame.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            self._frame_waiters.append((loop, future))
+            self._schedule_frame()
+        return await future
+
+    def _refresh(self):
+        with self._lock:
+            if self._rendering:
+                # refresh_async() has already collected the damage.
+                self._schedule_refresh(time.monotonic())
+                return False
+            areas, layers = self._begin_refresh()
+            if areas:
+                start = time.perf_counter()
+                self._render_areas(areas, layers)
+                self._end_refresh(areas, layers)
+                seconds = time.perf_counter() - start
+                self._count_frame(1, seconds, seconds)
+            else:
+                self._end_refresh(areas, layers)
+            return True
+
+    def _auto_refresh_now(self):
+        """Run a refresh the display starts by itself: as a
+        :meth:`refresh_async` task when :attr:`refresh_budget` is set and
+        an event loop is running, else at once."""
+        if self.refresh_budget is not None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                task = self._refresh_task
+                if task is not None and not task.done():
+                    self._schedule_refresh(time.monotonic())
+                else:
+                    self._refresh_task = loop.create_task(
+                        self.refresh_async()
+                    )
+                return
+        self._refresh()
 
-        Scene traversal is entirely pure Python.  The single JS bridge
-        call is ``ctx.putImageData()`` at the end of this method.
+    def _begin_refresh(self):
+        """Start a refresh: return the areas that need repainting and the
+        draw list to paint them from.
+
+        The draw list is a snapshot, so a :meth:`refresh_async` keeps
+        painting the scene it started with when the root group changes
+        between its slices.
         """
-        pixels = bytearray(self.width * self.height * 4)
+        self._refresh_due = None
+        self._last_refresh = time.monotonic()
+        # Wait for changes before rendering, so that one made while
+        # rendering (from another thread or task) schedules the next
+        # frame.
+        if (self._auto_refresh and self._root_group is not None
+                and not self._idle):
+            self._idle = True
+            _idle_displays.append(weakref.ref(self))
+        self._sync_size()
+        areas = self._collect_damage()
+        return areas, [entry[:5] for entry in self._drawn.values()]
+
+    def _end_refresh(self, areas, layers, upload=None):
+        """Finish a refresh once *areas* have been rendered from the draw
+        list *layers*, uploading *upload* (by default all of *areas*)."""
+        if upload is None:
+            upload = areas
+        if upload:
+            self._present(upload)
+        if areas:
+            for recorder in self._recorders:
+                recorder._capture(areas)
+        for layer, *_ in layers:
+            layer._finish_refresh()
+
+    def _schedule_refresh(self, due=None):
+        """Refresh on the next animation frame, or the first one at or
+        after monotonic time *due*."""
+        if due is not None and (self._refresh_due is None
+                                or due < self._refresh_due):
+            self._refresh_due = due
+        self._schedule_frame()
+
+    def _schedule_frame(self):
+        if not self._frame_pending:
+            self._frame_pending = True
+            self._request_frame()
+
+    def _request_frame(self):
+        """Call :meth:`_on_frame` on the next animation frame."""
+        import js
+        if self._frame_proxy is None:
+            from pyodide.ffi import create_proxy
+            self._frame_proxy = create_proxy(self._on_frame)
+        if hasattr(js, "requestAnimationFrame"):
+            js.requestAnimationFrame(self._frame_proxy)
+        else:
+            # A Web Worker in a browser without worker animation frames.
+            js.setTimeout(self._frame_proxy, _FRAME_SECONDS * 1000)
+
+    def _on_frame(self, *args):
+        with self._lock:
+            self._frame_pending = False
+            due = self._refresh_due
+            if due is not None and time.monotonic() < due:
+                self._schedule_frame()
+            elif due is not None or self._auto_refresh:
+                self._auto_refresh_now()
+            waiters = self._frame_waiters
+            self._frame_waiters = []
+        now = time.monotonic()
+        for loop, future in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_set_future, future, now)
+
+    def _collect_damage(self):
+        """Diff the scene graph against the last refresh.
+
+        Returns a merged list of display areas that need repainting:
+        areas of layers that appeared, disappeared, moved, changed stacking
+        order or whose bitmap/palette content changed.
+
+        The scene graph is only traversed when some layer was added,
+        removed, moved or shown/hidden since the last refresh; otherwise
+        the compiled draw list is reused and just its content keys are
+        checked.
+        """
+        if self._drawn is not None and self._layout_serial == _layout_serial:
+            damage = []
+            drawn = self._drawn
+            for key, (layer, x, y, scale, area, content) in drawn.items():
+                current = layer._content_key()
+                if current != content:
+                    drawn[key] = (layer, x, y, scale, area, current)
+                    _content_damage(damage, layer, x, y, scale, content)
+            return _merge_areas(damage, self.width, self.height)
+
+        layers = []
         if self._root_group is not None:
-            self._root_group._render_to_buffer(
-                pixels, self.width, self.height, 0, 0
+            self._root_group._collect_layers(
+                layers, 0, 0, (0, 0, self.width, self.height)
             )
-        # --- single JS bridge call ----------------------------------------
-        # Convert the Python bytearray to a JS Uint8ClampedArray and push
-        # it to the canvas in one putImageData call.
-        from pyodide.ffi import to_js
-        from js import Uint8ClampedArray, ImageData
-        js_buf = to_js(pixels)
-        img = ImageData.new(
-            Uint8ClampedArray.new(js_buf.buffer), self.width, self.height
-        )
-        self._canvas.getContext("2d").putImageData(img, 0, 0)
+        self._layout_serial = _layout_serial
+        drawn = {}
+        for layer, x, y, scale in layers:
+            drawn[id(layer)] = (
+                layer, x, y, scale, layer._screen_area(x, y, scale),
+                layer._content_key(),
+            )
+        previous = self._drawn
+        self._drawn = drawn
+        full = (0, 0, self.width, self.height)
+        if previous is None or len(drawn) != len(layers):
+            # First frame, new root group, or a layer shown twice (which
+            # the draw list cannot represent, so it is never reused).
+            if len(drawn) != len(layers):
+                self._layout_serial = None
+            return [full]
+
+        damage = []
+        for key, (layer, x, y, scale, area, content) in drawn.items():
+            old = previous.get(key)
+            if old is None:
+                damage.append(area)
+            elif old[4] != area:
+                damage.append(old[4])
+                damage.append(area)
+            elif old[5] != content:
+                _content_damage(damage, layer, x, y, scale, old[5])
+        for key, old in previous.items():
+            if key not in drawn:
+                damage.append(old[4])
+        # Stacking order changes among layers present in both frames.
+        before = [key for key in previous if key in drawn]
+        after = [key for key in drawn if key in previous]
+        if before != after:
+            for old_key, new_key in zip(before, after):
+                if old_key != new_key:
+                    damage.append(drawn[new_key][4])
+        return _merge_areas(damage, self.width, self.height)
+
+    def _render_areas(self, areas, layers):
+        """Repaint each of *areas* of the framebuffer from the draw list
+        *layers*."""
+        for clip in areas:
+            _render_layers(self._buffer, self.width, layers, clip, clear=True)
+
+    def _sync_size(self):
+        """Pick up a canvas resize: reallocate the framebuffer, drop the
+        ImageData bound to the old one and force a full refresh."""
+        width = int(self._canvas.width)
+        height = int(self._canvas.height)
+        if width == self.width and height == self.height:
+            return
+        self._release_image()
+        self.width = width
+        self.height = height
+        self._buffer = bytearray(width * height * 4)
+        self._drawn = None
+
+    def _image_data(self):
+        """Return the ``ImageData`` that views the framebuffer in place.
+
+        The framebuffer is exposed to JS as a ``Uint8ClampedArray`` over
+        the WASM heap (a PyProxy buffer view), so no pixels are copied
+        across the bridge.  The view is rebuilt only after a resize or when
+        a WASM memory growth has detached the old one.
+        """
+        image = self._image
+        if image is not None and image[1].data.byteLength:
+            return image[2]
+        self._release_image()
+        from pyodide.ffi import create_proxy
+        from js import ImageData
+        proxy = create_proxy(self._buffer)
+        view = proxy.getBuffer("u8clamped")
+        img = ImageData.new(view.data, self.width, self.height)
+        self._image = (proxy, view, img)
+        return img
+
+    def _release_image(self):
+        if self._image is not None:
+            proxy, view, _ = self._image
+            view.release()
+            proxy.destroy()
+            self._image = None
+
+    def _present(self, areas):
+        """Upload the damaged *areas* of the framebuffer to the canvas."""
+        # --- JS bridge ----------------------------------------------------
+        # The ImageData shares memory with the framebuffer, so each dirty
+        # rectangle is a single putImageData copy straight from the WASM
+        # heap into the canvas.
+        img = self._image_data()
+        if self._ctx is None:
+            self._ctx = self._canvas.getContext("2d")
+        for x1, y1, x2, y2 in areas:
+            self._ctx.putImageData(img, 0, 0, x1, y1, x2 - x1, y2 - y1)
         # ------------------------------------------------------------------
+
+
+class HeadlessDisplay(Display):
+    """A :class:`Display` that renders into an in-memory framebuffer.
+
+    Needs no canvas and no Pyodide, so scenes can be rendered server-side,
+    the full :meth:`refresh` path can run in CI under plain CPython, and
+    rendering can be profiled with native tools.  ``show``,
+    ``root_group``, ``refresh`` and ``auto_refresh`` behave exactly as on
+    :class:`Display`.
+
+    The framebuffer is RGBA, 8 bits per channel, row-major.  Pixels not
+    covered by any layer are transparent black.
+
+    With no browser to provide animation frames, scheduled refreshes (for
+    :attr:`auto_refresh` and deferred :meth:`refresh` calls) run on a
+    timer thread at up to 60 frames per second.  A frame may then render
+    while another thread is changing the scene; the next frame completes
+    any change it caught halfway.
+
+    With *workers*, large refreshes are split into horizontal bands that
+    a pool of worker processes renders concurrently into a shared-memory
+    frame, each clipping the scene to its band; the result is identical to
+    serial rendering.  The scene is pickled once per parallel refresh, so
+    this pays off for big frames on machines with spare cores.  Call
+    :meth:`close` (or use the display as a context manager) to stop the
+    workers; a display dropped without closing stops them when it is
+    garbage collected, or at exit.
+
+    Args:
+        width (int): Framebuffer width in pixels.
+        height (int): Framebuffer height in pixels.
+        auto_refresh (bool): As for :class:`Display`.
+        workers (int | None): beady-eye extension.  Number of worker
+            processes for parallel rendering; ``None`` or ``1`` renders in
+            the calling process.
+
+    Example::
+
+        import displayio
+        display = displayio.HeadlessDisplay(320, 240)
+        display.show(group)
+        display.save_png("frame.png")
+    """
+
+    def __init__(self, width=320, height=240, *, auto_refresh=True,
+                 workers=None):
+        self._canvas = None
+        self._workers = workers if workers and workers > 1 else None
+        # Process pool and SharedMemory frame, created on first use, and
+        # the finalizers that release them if the display is dropped
+        # without close().
+        self._pool = None
+        self._shared = None
+        self._pool_finalizer = None
+        self._shared_finalizer = None
+        self._timer = None
+        self._init_state(int(width), int(height), auto_refresh)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Stop refreshing by itself, cancel :meth:`next_frame` waits,
+        stop the worker processes and free the shared frame."""
+        self._auto_refresh = False
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._frame_pending = False
+            waiters = self._frame_waiters
+            self._frame_waiters = []
+        for loop, future in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(future.cancel)
+        if self._pool is not None:
+            self._pool_finalizer()
+            self._pool = None
+        if self._shared is not None:
+            self._shared_finalizer()
+            self._shared = None
+
+    @property
+    def framebuffer(self):
+        """The RGBA framebuffer as a read-only :class:`memoryview`."""
+        return memoryview(self._buffer).toreadonly()
+
+    def _sync_size(self):
+        pass
+
+    def _present(self, areas):
+        pass
+
+    def _request_frame(self):
+        timer = threading.Timer(_FRAME_SECONDS, self._on_frame)
+        timer.daemon = True
+        self._timer = timer
+        timer.start()
+
+    def _render_areas(self, areas, layers):
+        if (self._workers is None
+                or sum(map(_area_size, areas)) < _PARALLEL_MIN_PIXELS):
+            super()._render_areas(areas, layers)
+            return
+        import pickle
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import shared_memory
+
+        size = len(self._buffer)
+        if self._shared is None or self._shared.size < size:
+            if self._shared is not None:
+                self._shared_finalizer()
+            self._shared = shared_memory.SharedMemory(create=True, size=size)
+            self._shared_finalizer = weakref.finalize(
+                self, _free_shared, self._shared
+            )
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self._workers)
+            self._pool_finalizer = weakref.finalize(
+                self, self._pool.shutdown
+            )
+        scene = pickle.dumps(layers, pickle.HIGHEST_PROTOCOL)
+        bands = []
+        for x1, y1, x2, y2 in areas:
+            step = -(-(y2 - y1) // self._workers)
+            for by in range(y1, y2, step):
+                bands.append((x1, by, x2, min(by + step, y2)))
+        backend = get_render_backend()
+        for future in [
+            self._pool.submit(
+                _render_band, self._shared.name, self.width, scene, band,
+                backend,
+            )
+            for band in bands
+        ]:
+            future.result()
+        shared = self._shared.buf
+        stride = self.width * 4
+        for x1, y1, x2, y2 in bands:
+            for y in range(y1, y2):
+                start = y * stride + x1 * 4
+                end = start + (x2 - x1) * 4
+                self._buffer[start:end] = shared[start:end]
+        del shared
+
+    def save_ppm(self, file):
+        """Write the current frame as a binary PPM (P6, RGB) image.
+
+        Args:
+            file: A path or a binary file object.
+        """
+        rgb = bytearray(self.width * self.height * 3)
+        rgb[0::3] = self._buffer[0::4]
+        rgb[1::3] = self._buffer[1::4]
+        rgb[2::3] = self._buffer[2::4]
+        header = b"P6\n%d %d\n255\n" % (self.width, self.height)
+        _write_bytes(file, header + rgb)
+
+    def save_png(self, file):
+        """Write the current frame as an RGBA PNG image.
+
+        Args:
+            file: A path or a binary file object.
+        """
+        _write_bytes(file, _encode_png(self._buffer, self.width, self.height))
+
+
+def _set_future(future, value):
+    if not future.done():
+        future.set_result(value)
+
+
+def _render_band(name, width, scene, band, backend):
+    """Worker process side of parallel rendering: paint area *band* of the
+    pickled draw list *scene* into the SharedMemory frame *name*."""
+    import pickle
+    from multiprocessing import shared_memory
+
+    set_render_backend(backend)
+    layers = pickle.loads(scene)
+    shared = shared_memory.SharedMemory(name=name)
+    try:
+        pixels = shared.buf
+        _render_layers(pixels, width, layers, band, clear=True)
+        del pixels
+    finally:
+        shared.close()
+
+
+def _free_shared(shared):
+    """Close and unlink the SharedMemory frame *shared*."""
+    shared.close()
+    shared.unlink()
+
+
+def _png_chunk(kind, data):
+    return (
+        struct.pack(">I", len(data)) + kind + data
+        + struct.pack(">I", zlib.crc32(kind + data))
+    )
+
+
+def _encode_png(rgba, width, height):
+    """Encode an RGBA buffer as PNG bytes using only the standard library."""
+    stride = width * 4
+    raw = bytearray()
+    for y in range(height):
+        raw.append(0)  # filter type: None
+        raw += rgba[y * stride:(y + 1) * stride]
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", header)
+        + _png_chunk(b"IDAT", zlib.compress(bytes(raw), 6))
+        + _png_chunk(b"IEND", b"")
+    )
+
+
+def _write_bytes(file, data):
+    if hasattr(file, "write"):
+        file.write(data)
+    else:
+        with open(file, "wb") as f:
+            f.write(data)
@@ -0,0 +1,71 @@
+/* global importScripts, loadPyodide */
+"use strict";
+
+// Web Worker that runs Pyodide and displayio off the page's main thread.
+// Started by beadyeyePyodide.startDisplayWorker (displayio.js), which
+// sends:
+//
+//   {type: "init", pyodideURL, modules: [{sourcePath, targetPath}],
+//    packages, canvas}
+//       Load Pyodide and the modules.  canvas is the OffscreenCanvas the
+//       page transferred, or null; Python code sees it as the global
+//       `canvas`.  Replies {type: "ready"} or {type: "error", message}.
+//   {type: "run", id, code}
+//       Run Python code.  Replies {type: "done", id} or
+//       {type: "error", id, message}.
+//
+// Progress is reported as {type: "status", text}.  Frames posted by
+// worker_display.TransferDisplay arrive on the page as {type: "frame"}.
+
+let pyodide = null;
+let canvas = null;
+
+async function init({ pyodideURL, modules, packages = [], canvas: offscreen }) {
+    importScripts(pyodideURL);
+    self.postMessage({ type: "status", text: "Loading Pyodide\u2026" });
+    pyodide = await loadPyodide();
+    if (packages.length) {
+        self.postMessage({ type: "status", text: `Loading ${packages.join(", ")}\u2026` });
+        await pyodide.loadPackage(packages);
+    }
+    self.postMessage({ type: "status", text: "Loading displayio module\u2026" });
+    for (const { sourcePath, targetPath } of modules) {
+        const response = await fetch(sourcePath);
+        if (!response.ok) {
+            throw new Error(`Failed to fetch ${sourcePath} (${response.status})`);
+        }
+        const directory = targetPath.substring(0, targetPath.lastIndexOf("/"));
+        if (directory) {
+            pyodide.FS.mkdirTree(directory);
+        }
+        pyodide.FS.writeFile(targetPath, await response.text());
+    }
+    await pyodide.runPythonAsync(`
+import sys
+sys.path.insert(0, '/home/pyodide')
+`);
+    canvas = offscreen || null;
+}
+
+async function run(code) {
+    if (canvas) {
+        canvas.getContext("2d").clearRect(0, 0, canvas.width, canvas.height);
+    }
+    pyodide.globals.set("canvas", canvas);
+    await pyodide.runPythonAsync(code);
+}
+
+self.onmessage = async (event) => {
+    const message = event.data;
+    try {
+        if (message.type === "init") {
+            await init(message);
+            self.postMessage({ type: "ready" });
+        } else if (message.type === "run") {
+            await run(message.code);
+            self.postMessage({ type: "done", id: message.id });
+        }
+    } catch (err) {
+        self.postMessage({ type: "error", id: message.id, message: String(err) });
+    }
+};
@@ -0,0 +1,97 @@
+"""
+fontio - Pure Python shim for CircuitPython's fontio module.
+
+Glyphs are pre-rasterized into packed 1-bit :class:`displayio.Bitmap`
+objects, so text is laid out by copying glyph rows rather than by
+decoding font data per character.
+
+Supported names (core subset of CircuitPython fontio):
+    Glyph        – a glyph's bitmap and metrics
+    BuiltinFont  – fixed-cell font whose glyphs are tiles of one bitmap
+
+Usage::
+
+    import fontio
+
+    font = fontio.BuiltinFont.from_rows({
+        "A": ["010", "101", "111", "101", "101"],
+        "B": ["110", "101", "110", "101", "110"],
+    }, 4, 5)
+    glyph = font.get_glyph(ord("A"))
+
+Fonts loaded from BDF/PCF files by ``adafruit_bitmap_font`` provide the
+same ``get_bounding_box`` / ``get_glyph`` interface.
+"""
+
+from collections import namedtuple
+
+import displayio
+
+Glyph = namedtuple(
+    "Glyph",
+    ["bitmap", "tile_index", "width", "height", "dx", "dy", "shift_x",
+     "shift_y"],
+)
+Glyph.__doc__ = """A glyph of a font.
+
+    ``bitmap`` holds the glyph's pixels (value 1 = ink), as tile
+    *tile_index* of size *width* x *height*.  *dx* and *dy* offset the
+    glyph's bottom-left corner from the pen position on the baseline
+    (positive *dy* is up); *shift_x* and *shift_y* advance the pen.
+"""
+
+
+class BuiltinFont:
+    """A fixed-cell font whose glyphs are tiles of a single bitmap.
+
+    Compatible with the core subset of CircuitPython's
+    ``fontio.BuiltinFont`` (``terminalio.FONT`` is one).
+
+    Args:
+        bitmap: A :class:`displayio.Bitmap` tile sheet holding the glyph
+            cells left to right, top to bottom.
+        width (int): Cell width in pixels, including any spacing.
+        height (int): Cell height in pixels.
+        charset (str): The character shown by each tile, in tile order.
+    """
+
+    def __init__(self, bitmap, width, height, charset):
+        self.bitmap = bitmap
+        self._width = width
+        self._height = height
+        self._tiles = {ord(ch): index for index, ch in enumerate(charset)}
+        self._glyphs = {}
+
+    @classmethod
+    def from_rows(cls, glyphs, width, height):
+        """Build a font from ``{char: rows}`` patterns of ``"0"``/``"1"``
+        strings, one string per pixel row.
+
+        Rows shorter than *width* are padded with blank pixels on the
+        right, which is how inter-character spacing is usually given.
+        """
+        charset = "".join(glyphs)
+        bitmap = displayio.Bitmap(width * len(charset), height, 2)
+        digits = bytes.maketrans(b"01", b"\x00\x01")
+        for y in range(height):
+            row = "".join(glyphs[ch][y].ljust(width, "0") for ch in charset)
+            bitmap._set_row(y, 0, row.encode("ascii").translate(digits))
+        return cls(bitmap, width, height, charset)
+
+    def get_bounding_box(self):
+        """Return the ``(width, height)`` of a glyph cell."""
+        return (self._width, self._height)
+
+    def get_glyph(self, codepoint):
+        """Return the :class:`Glyph` for *codepoint*, or ``None``."""
+        glyph = self._glyphs.get(codepoint)
+        if glyph is None:
+            tile = self._tiles.get(codepoint)
+            if tile is None:
+                return None
+            glyph = Glyph(
+                self.bitmap, tile, self._width, self._height, 0, 0,
+                self._width, 0,
+            )
+            self._glyphs[codepoint] = glyph
+        return glyph
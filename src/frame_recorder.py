@@ -0,0 +1,458 @@
+"""
+frame_recorder - Record a display's refreshes as an animation.
+
+beady-eye extension.  A :class:`FrameRecorder` attached to a
+:class:`displayio.Display` (or :class:`displayio.HeadlessDisplay`) keeps
+the first frame plus, for every refresh, only the rectangles whose pixels
+changed, trimmed to the pixels that actually differ and compressed.
+Memory grows with what changes rather than with frames x screen size, so
+a mostly static dashboard can be recorded for hours.
+
+Recordings export as animated PNG or GIF.  Both formats store each frame
+as the rectangle covering that refresh's changes, drawn over the previous
+frame, so the files stay small too.
+
+Usage::
+
+    import frame_recorder
+
+    recorder = frame_recorder.FrameRecorder(display)
+    recorder.start()
+    ...                                 # refresh the display as usual
+    recorder.stop()
+    recorder.save_apng("capture.png")
+    recorder.save_gif("capture.gif")
+"""
+
+import contextlib
+import struct
+import time
+import zlib
+
+import displayio
+
+# Compression level for stored rectangles: fast, since capture runs on
+# every refresh.
+_STORE_LEVEL = 1
+
+
+class FrameRecorder:
+    """Records the frames a display shows, as deltas.
+
+    Each refresh that changes pixels becomes one frame, timestamped by
+    *clock*; refreshes that change nothing are not recorded, so a frame
+    lasts until the next change.  Recording stops by itself if the display
+    is resized.
+
+    Args:
+        display: The :class:`displayio.Display` to record.
+        clock: Callable returning the current time in seconds; pass a
+            virtual clock for reproducible timing.
+    """
+
+    def __init__(self, display, *, clock=time.monotonic):
+        self._display = display
+        self._clock = clock
+        self._width = display.width
+        self._height = display.height
+        # zlib-compressed first frame, and the (time, rects) of each later
+        # frame, where rects are (x1, y1, x2, y2, compressed RGBA rows).
+        self._keyframe = None
+        self._deltas = []
+        # Copy of the last recorded frame while recording, used to trim
+        # damaged areas down to the pixels that changed.
+        self._frame = None
+        self._start = None
+        self._end = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def recording(self):
+        """``True`` between :meth:`start` and :meth:`stop`."""
+        return self._frame is not None
+
+    @property
+    def frame_count(self):
+        """Number of frames recorded, including the first."""
+        return 0 if self._keyframe is None else 1 + len(self._deltas)
+
+    @property
+    def duration(self):
+        """Seconds covered by the recording."""
+        if self._start is None:
+            return 0.0
+        end = self._clock() if self._end is None else self._end
+        return end - self._start
+
+    @property
+    def nbytes(self):
+        """Bytes of compressed pixel data held by the recording."""
+        if self._keyframe is None:
+            return 0
+        return len(self._keyframe) + sum(
+            len(rect[4]) for _, rects in self._deltas for rect in rects
+        )
+
+    def start(self):
+        """Start a new recording from the display's current frame,
+        discarding any previous one."""
+        if self.recording:
+            self.stop()
+        display = self._display
+        self._width = display.width
+        self._height = display.height
+        self._frame = bytearray(display._buffer)
+        self._keyframe = zlib.compress(self._frame, _STORE_LEVEL)
+        self._deltas = []
+        self._start = self._clock()
+        self._end = None
+        display._recorders.append(self)
+
+    def stop(self):
+        """Stop recording; the recording stays available for export."""
+        if not self.recording:
+            return
+        self._display._recorders.remove(self)
+        self._end = self._clock()
+        self._frame = None
+
+    def _capture(self, areas):
+        """Record the pixels of *areas* that changed in the refresh that
+        just finished."""
+        display = self._display
+        if display.width != self._width or display.height != self._height:
+            self.stop()
+            return
+        buffer = display._buffer
+        frame = self._frame
+        stride = self._width * 4
+        rects = []
+        for area in areas:
+            bounds = _changed_bounds(frame, buffer, stride, area)
+            if bounds is None:
+                continue
+            x1, y1, x2, y2 = bounds
+            data = bytearray()
+            for y in range(y1, y2):
+                start = y * stride + x1 * 4
+                row = buffer[start:start + (x2 - x1) * 4]
+                frame[start:start + len(row)] = row
+                data += row
+            rects.append((x1, y1, x2, y2, zlib.compress(data, _STORE_LEVEL)))
+        if rects:
+            self._deltas.append((self._clock(), tuple(rects)))
+
+    def _replay(self):
+        """Yield ``(area, pixels, before, milliseconds)`` for each frame:
+        the area it changed, that area's RGBA rows after and before the
+        change (``None`` for the first frame) and how long it shows."""
+        if self._keyframe is None:
+            raise ValueError("nothing has been recorded")
+        width = self._width
+        canvas = bytearray(zlib.decompress(self._keyframe))
+        end = self._clock() if self._end is None else self._end
+        times = [self._start] + [t for t, _ in self._deltas] + [end]
+        area = (0, 0, width, self._height)
+        yield area, bytes(canvas), None, (times[1] - times[0]) * 1000
+        for index, (_, rects) in enumerate(self._deltas, 1):
+            area = (
+                min(rect[0] for rect in rects),
+                min(rect[1] for rect in rects),
+                max(rect[2] for rect in rects),
+                max(rect[3] for rect in rects),
+            )
+            before = _crop(canvas, width, area)
+            for x1, y1, x2, y2, data in rects:
+                data = zlib.decompress(data)
+                size = (x2 - x1) * 4
+                for row, y in enumerate(range(y1, y2)):
+                    start = (y * width + x1) * 4
+                    canvas[start:start + size] = data[row * size:
+                                                      (row + 1) * size]
+            yield (area, _crop(canvas, width, area), before,
+                   (times[index + 1] - times[index]) * 1000)
+
+    def frames(self):
+        """Yield ``(rgba, seconds)`` for each recorded frame: the whole
+        frame as RGBA bytes and how long it was shown.
+
+        Frames are rebuilt one at a time from the deltas.
+        """
+        width = self._width
+        canvas = bytearray(width * self._height * 4)
+        for area, pixels, _, ms in self._replay():
+            x1, y1, x2, y2 = area
+            size = (x2 - x1) * 4
+            for row, y in enumerate(range(y1, y2)):
+                start = (y * width + x1) * 4
+                canvas[start:start + size] = pixels[row * size:
+                                                    (row + 1) * size]
+            yield bytes(canvas), ms / 1000
+
+    def save_apng(self, file, *, loop=0):
+        """Write the recording as an animated PNG.
+
+        Args:
+            file: A path or a binary file object.
+            loop (int): Number of times to play; ``0`` loops forever.
+        """
+        chunk = displayio._png_chunk
+        with _output(file) as out:
+            out.write(b"\x89PNG\r\n\x1a\n")
+            out.write(chunk(b"IHDR", struct.pack(
+                ">IIBBBBB", self._width, self._height, 8, 6, 0, 0, 0
+            )))
+            out.write(chunk(b"acTL", struct.pack(
+                ">II", self.frame_count, loop
+            )))
+            sequence = 0
+            for area, pixels, before, ms in self._replay():
+                x1, y1, x2, y2 = area
+                num, den = _apng_delay(ms)
+                # Regions replace what they cover (blend op SOURCE) and
+                # stay on screen (dispose op NONE).
+                out.write(chunk(b"fcTL", struct.pack(
+                    ">IIIIIHHBB", sequence, x2 - x1, y2 - y1, x1, y1,
+                    num, den, 0, 0,
+                )))
+                sequence += 1
+                data = zlib.compress(_scanlines(pixels, (x2 - x1) * 4), 6)
+                if before is None:
+                    out.write(chunk(b"IDAT", data))
+                else:
+                    out.write(chunk(
+                        b"fdAT", struct.pack(">I", sequence) + data
+                    ))
+                    sequence += 1
+            out.write(chunk(b"IEND", b""))
+
+    def save_gif(self, file, *, loop=0, background=0x000000):
+        """Write the recording as an animated GIF.
+
+        GIF has no partial transparency and at most 256 colours per
+        frame: pixels less than half opaque show *background*, and a frame
+        with more colours than fit is reduced to a fixed 3-3-2 bit
+        palette.  Frame times are in hundredths of a second, at least two.
+
+        Args:
+            file: A path or a binary file object.
+            loop (int): Number of times to play; ``0`` loops forever.
+            background (int): Colour as ``0xRRGGBB`` behind transparent
+                pixels.
+        """
+        with _output(file) as out:
+            out.write(b"GIF89a" + struct.pack(
+                "<HHBBB", self._width, self._height, 0, 0, 0
+            ))
+            out.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01"
+                      + struct.pack("<H", loop) + b"\x00")
+            for area, pixels, before, ms in self._replay():
+                delay = max(2, round(ms / 10))
+                out.write(_gif_frame(
+                    area, pixels, before, background, min(delay, 0xFFFF)
+                ))
+                # A longer pause than one frame can hold is padded with
+                # frames that change nothing.
+                delay -= 0xFFFF
+                while delay > 0:
+                    out.write(_gif_frame(
+                        (0, 0, 1, 1), None, None, 0, min(delay, 0xFFFF)
+                    ))
+                    delay -= 0xFFFF
+            out.write(b"\x3b")
+
+
+@contextlib.contextmanager
+def _output(file):
+    if hasattr(file, "write"):
+        yield file
+    else:
+        with open(file, "wb") as f:
+            yield f
+
+
+def _changed_bounds(old, new, stride, area):
+    """Return the bounds within *area* of the pixels that differ between
+    framebuffers *old* and *new*, or ``None``."""
+    x1, y1, x2, y2 = area
+    start = x1 * 4
+    size = (x2 - x1) * 4
+    top = bottom = left = right = None
+    for y in range(y1, y2):
+        at = y * stride + start
+        a = old[at:at + size]
+        b = new[at:at + size]
+        if a == b:
+            continue
+        # The first and last differing bytes, found with one big-integer
+        # XOR instead of a Python loop over the row.
+        diff = int.from_bytes(a, "big") ^ int.from_bytes(b, "big")
+        first = (size - (diff.bit_length() + 7) // 8) // 4
+        last = (size - 1 - ((diff & -diff).bit_length() - 1) // 8) // 4
+        if top is None:
+            top, left, right = y, first, last
+        else:
+            left = min(left, first)
+            right = max(right, last)
+        bottom = y
+    if top is None:
+        return None
+    return (x1 + left, top, x1 + right + 1, bottom + 1)
+
+
+def _crop(canvas, width, area):
+    x1, y1, x2, y2 = area
+    return b"".join(
+        canvas[(y * width + x1) * 4:(y * width + x2) * 4]
+        for y in range(y1, y2)
+    )
+
+
+def _scanlines(pixels, stride):
+    """Prefix each row of *pixels* with PNG filter type None."""
+    raw = bytearray()
+    for start in range(0, len(pixels), stride):
+        raw.append(0)
+        raw += pixels[start:start + stride]
+    return bytes(raw)
+
+
+def _apng_delay(ms):
+    """Return an APNG ``(delay_num, delay_den)`` for *ms* milliseconds."""
+    ms = max(0, round(ms))
+    if ms <= 0xFFFF:
+        return ms, 1000
+    return min(round(ms / 1000), 0xFFFF), 1
+
+
+def _rgb(pixels, background):
+    """Return the ``0xRRGGBB`` of each RGBA pixel in *pixels*, with
+    pixels less than half opaque replaced by *background*."""
+    return [
+        (r << 16 | g << 8 | b) if a >= 128 else background
+        for r, g, b, a in zip(pixels[0::4], pixels[1::4], pixels[2::4],
+                              pixels[3::4])
+    ]
+
+
+def _gif_frame(area, pixels, before, background, delay):
+    """Encode one GIF frame: graphic control extension, image descriptor,
+    local colour table and LZW data.
+
+    Pixels equal to those in *before* are written as transparent, which
+    keeps the previous frame's pixel.  With *pixels* ``None`` the frame
+    is entirely transparent.
+    """
+    x1, y1, x2, y2 = area
+    count = (x2 - x1) * (y2 - y1)
+    if pixels is None:
+        colours, transparent, indices = [0], 1, [1] * count
+    else:
+        now = _rgb(pixels, background)
+        old = None if before is None else _rgb(before, background)
+        if old is None:
+            colours = sorted(set(now))
+        else:
+            colours = sorted({n for n, o in zip(now, old) if n != o})
+        if len(colours) + (old is not None) <= 256:
+            lookup = {colour: index for index, colour in enumerate(colours)}
+            if old is None:
+                transparent = None
+                indices = [lookup[n] for n in now]
+            else:
+                transparent = len(colours)
+                indices = [
+                    transparent if n == o else lookup[n]
+                    for n, o in zip(now, old)
+                ]
+        else:
+            # 3-3-2 bit palette, with the top bits of each channel
+            # repeated into the low bits.
+            colours = [
+                (r << 5 | r << 2 | r >> 1) << 16
+                | (g << 5 | g << 2 | g >> 1) << 8
+                | (b << 6 | b << 4 | b << 2 | b)
+                for r in range(8) for g in range(8) for b in range(4)
+            ]
+            transparent = None
+            indices = [
+                (c >> 21) << 5 | (c >> 13 & 7) << 2 | (c >> 6 & 3)
+                for c in now
+            ]
+    entries = len(colours) + (transparent is not None)
+    bits = max(1, (entries - 1).bit_length())
+    table = bytearray(3 << bits)
+    for index, colour in enumerate(colours):
+        table[index * 3:index * 3 + 3] = colour.to_bytes(3, "big")
+    # Disposal method 1: the frame stays under the next one.
+    flags = 1 << 2 | (transparent is not None)
+    data = bytearray(struct.pack(
+        "<BBBBHBB", 0x21, 0xF9, 4, flags, delay, transparent or 0, 0
+    ))
+    data += struct.pack(
+        "<BHHHHB", 0x2C, x1, y1, x2 - x1, y2 - y1, 0x80 | (bits - 1)
+    )
+    data += table
+    min_size = max(2, bits)
+    data.append(min_size)
+    encoded = _lzw_encode(indices, min_size)
+    for start in range(0, len(encoded), 255):
+        block = encoded[start:start + 255]
+        data.append(len(block))
+        data += block
+    data.append(0)
+    return bytes(data)
+
+
+def _lzw_encode(indices, min_size):
+    """GIF variable-length LZW compression of the colour *indices*."""
+    clear = 1 << min_size
+    out = bytearray()
+    acc = 0
+    acc_bits = 0
+    size = min_size + 1
+    table = {}
+    next_code = clear + 2
+
+    def emit(code):
+        nonlocal acc, acc_bits
+        acc |= code << acc_bits
+        acc_bits += size
+        while acc_bits >= 8:
+            out.append(acc & 0xFF)
+            acc >>= 8
+            acc_bits -= 8
+
+    emit(clear)
+    prefix = indices[0]
+    for index in indices[1:]:
+        key = prefix << 8 | index
+        code = table.get(key)
+        if code is not None:
+            prefix = code
+            continue
+        emit(prefix)
+        if next_code < 4096:
+            table[key] = next_code
+            next_code += 1
+            # The decoder adds its entry one code later, so it widens
+            # codes once the table has outgrown the current size.
+            if next_code > 1 << size and size < 12:
+                size += 1
+        else:
+            emit(clear)
+            table.clear()
+            next_code = clear + 2
+            size = min_size + 1
+        prefix = index
+    emit(prefix)
+    emit(clear + 1)
+    if acc_bits:
+        out.append(acc & 0xFF)
+    return bytes(out)
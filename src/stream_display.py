@@ -0,0 +1,582 @@
+"""
+stream_display - Serve a display's framebuffer to remote viewers.
+
+beady-eye extension.  A :class:`StreamDisplay` renders like
+:class:`displayio.HeadlessDisplay` and, after each refresh, sends the
+damaged rectangles to every connected viewer, so one Python process can
+drive many screens that only run a thin viewer (``stream_viewer.js`` in
+a browser, or :class:`StreamViewer`).
+
+Viewers connect over WebSocket (browsers) or plain TCP on the same port.
+Each rectangle is sent raw, run-length encoded or palette-indexed,
+whichever is smallest.  Viewers acknowledge every frame; a viewer with
+*max_in_flight* unacknowledged frames gets no more until it catches up,
+and the damage it missed is merged into one frame sent from the
+framebuffer as it is then, so a slow viewer skips frames instead of
+queueing them.
+
+Usage::
+
+    import stream_display
+
+    display = stream_display.StreamDisplay(800, 480, port=8765)
+    display.show(group)                 # viewers connect to ws://host:8765
+    ...
+    print(display.stats())
+
+Protocol
+--------
+
+Messages are binary, little-endian.  Over TCP each message is preceded
+by its ``uint32`` length, after the client has sent the 4 bytes
+``BEV1``; over WebSocket each message is one binary frame.
+
+``H`` (server): ``uint16`` width, ``uint16`` height.  Sent on connect.
+
+``F`` (server): ``uint32`` sequence number, ``uint16`` rectangle count,
+then per rectangle ``uint16`` x, y, width, height, ``uint8`` encoding,
+``uint32`` payload length and the payload.  Encodings:
+
+* ``0`` raw: RGBA pixels, row by row.
+* ``1`` RLE: runs of ``uint8`` length - 1 and one RGBA pixel; runs
+  continue across rows.
+* ``2`` palette: ``uint8`` colour count - 1, the RGBA colours, then one
+  ``uint8`` colour index per pixel.
+
+``A`` (viewer): ``uint32`` sequence number of a frame it has drawn.
+"""
+
+import array
+import base64
+import hashlib
+import itertools
+import queue
+import socket
+import struct
+import threading
+import time
+
+import displayio
+
+_RAW = 0
+_RLE = 1
+_PALETTE = 2
+
+_ENCODINGS = {"raw": _RAW, "rle": _RLE, "palette": _PALETTE}
+
+_TCP_HELLO = b"BEV1"
+_WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# Largest message accepted from a viewer; acks and control frames are a
+# few bytes, and a viewer asking for more is dropped.
+_MAX_VIEWER_MESSAGE = 1024
+
+
+class StreamDisplay(displayio.HeadlessDisplay):
+    """A :class:`displayio.HeadlessDisplay` that streams its damaged
+    areas to network viewers.
+
+    Args:
+        width (int): Framebuffer width in pixels.
+        height (int): Framebuffer height in pixels.
+        host (str): Interface to listen on.
+        port (int): Port to listen on; ``0`` picks a free one, see
+            :attr:`address`.
+        encoding (str): ``"auto"`` (smallest per rectangle), ``"raw"``,
+            ``"rle"`` or ``"palette"``.  Rectangles with more than 256
+            colours are sent raw instead of palette-indexed.
+        max_in_flight (int): Unacknowledged frames allowed per viewer
+            before its updates are coalesced.
+        auto_refresh (bool): As for :class:`displayio.Display`.
+    """
+
+    def __init__(self, width=320, height=240, *, host="127.0.0.1", port=0,
+                 encoding="auto", max_in_flight=2, auto_refresh=True):
+        if encoding != "auto" and encoding not in _ENCODINGS:
+            raise ValueError("unknown encoding %r" % (encoding,))
+        self._viewers = []
+        self._encoding = encoding
+        self._max_in_flight = max(1, max_in_flight)
+        self._totals = dict.fromkeys(
+            ("frames", "bytes", "coalesced", "acked"), 0
+        )
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        super().__init__(width, height, auto_refresh=auto_refresh)
+        self._server = socket.create_server((host, port))
+        self._server.settimeout(0.2)
+        self._closed = False
+        self._accepter = threading.Thread(target=self._accept, daemon=True)
+        self._accepter.start()
+
+    @property
+    def address(self):
+        """``(host, port)`` the display listens on."""
+        return self._server.getsockname()[:2]
+
+    @property
+    def viewer_count(self):
+        """Number of connected viewers."""
+        return len(self._viewers)
+
+    def _present(self, areas):
+        # Runs under the display's lock, which viewer threads also take
+        # before sending frames.  Viewers that are up to date send the
+        # same rectangles, which are encoded once for all of them.
+        encoded = {}
+        for viewer in self._viewers:
+            viewer.push(areas, encoded)
+
+    def stats(self):
+        """Return streaming totals over all viewers so far.
+
+        ``frames`` and ``bytes`` count frame messages sent,
+        ``coalesced`` the refreshes folded into a later frame because a
+        viewer was behind, and ``latency_ms`` / ``latency_max_ms`` the
+        mean and worst time from a refresh's damage to the viewer's
+        acknowledgement of the frame showing it.
+        """
+        with self._lock:
+            totals = dict(self._totals)
+            acked = totals.pop("acked")
+            frames = totals["frames"]
+            totals["bytes_per_frame"] = (
+                totals["bytes"] / frames if frames else 0.0
+            )
+            totals["latency_ms"] = (
+                self._latency_total / acked * 1e3 if acked else 0.0
+            )
+            totals["latency_max_ms"] = self._latency_max * 1e3
+            totals["viewers"] = len(self._viewers)
+            return totals
+
+    def close(self):
+        """Disconnect the viewers and stop listening."""
+        self._closed = True
+        self._accepter.join()
+        self._server.close()
+        for viewer in list(self._viewers):
+            viewer.close()
+        super().close()
+
+    def _accept(self):
+        while not self._closed:
+            try:
+                sock, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            sock.settimeout(None)
+            threading.Thread(
+                target=self._serve, args=(sock,), daemon=True
+            ).start()
+
+    def _serve(self, sock):
+        """Handle one viewer connection until it closes."""
+        try:
+            connection = _Connection.accept(sock)
+        except (OSError, ValueError):
+            sock.close()
+            return
+        viewer = _Viewer(self, connection)
+        with self._lock:
+            self._viewers.append(viewer)
+            viewer.send(b"H" + struct.pack("<HH", self.width, self.height))
+            viewer.push([(0, 0, self.width, self.height)])
+        try:
+            while True:
+                message = connection.receive()
+                if message is None:
+                    break
+                if message[:1] == b"A" and len(message) >= 5:
+                    viewer.acknowledge(struct.unpack_from("<I", message, 1)[0])
+        except (OSError, ValueError):
+            pass
+        finally:
+            with self._lock:
+                if viewer in self._viewers:
+                    self._viewers.remove(viewer)
+            viewer.close()
+
+    def _encode_frame(self, sequence, areas, encoded=None):
+        """Return an ``F`` message with the framebuffer's *areas*.
+
+        *encoded*, if given, maps the areas of frames already encoded
+        from the framebuffer as it is now to their rectangles, and is
+        updated with these.
+        """
+        key = tuple(areas)
+        rects = None if encoded is None else encoded.get(key)
+        if rects is None:
+            rects = self._encode_rects(areas)
+            if encoded is not None:
+                encoded[key] = rects
+        return b"F" + struct.pack("<I", sequence) + rects
+
+    def _encode_rects(self, areas):
+        """Return the rectangle count and rectangles of an ``F`` message
+        with the framebuffer's *areas*."""
+        message = bytearray(struct.pack("<H", len(areas)))
+        for area in areas:
+            x1, y1, x2, y2 = area
+            kind, payload = _encode_rect(
+                self._buffer, self.width, area, self._encoding
+            )
+            message += struct.pack(
+                "<HHHHBI", x1, y1, x2 - x1, y2 - y1, kind, len(payload)
+            )
+            message += payload
+        return bytes(message)
+
+
+class _Viewer:
+    """Server side of one viewer: pending damage, frames in flight and a
+    writer thread draining the send queue."""
+
+    def __init__(self, display, connection):
+        self._display = display
+        self._connection = connection
+        self._pending = []
+        # Time the oldest pending damage was reported.
+        self._pending_since = None
+        # sequence number -> time of the oldest damage the frame shows.
+        self._in_flight = {}
+        self._sequence = 0
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write, daemon=True)
+        self._writer.start()
+
+    def send(self, message):
+        self._queue.put(message)
+
+    def push(self, areas, encoded=None):
+        """Queue the damaged *areas*; called with the display lock held.
+        *encoded* is passed on to :meth:`StreamDisplay._encode_frame`."""
+        if self._pending_since is None:
+            self._pending_since = time.perf_counter()
+        self._pending.extend(areas)
+        if len(self._in_flight) < self._display._max_in_flight:
+            self._flush(encoded)
+        else:
+            self._display._totals["coalesced"] += 1
+
+    def _flush(self, encoded=None):
+        display = self._display
+        areas = displayio._merge_areas(
+            self._pending, display.width, display.height
+        )
+        message = display._encode_frame(self._sequence, areas, encoded)
+        self._in_flight[self._sequence] = self._pending_since
+        self._sequence = (self._sequence + 1) & 0xFFFFFFFF
+        self._pending = []
+        self._pending_since = None
+        display._totals["frames"] += 1
+        display._totals["bytes"] += len(message)
+        self.send(message)
+
+    def acknowledge(self, sequence):
+        display = self._display
+        with display._lock:
+            since = self._in_flight.pop(sequence, None)
+            if since is None:
+                return
+            latency = time.perf_counter() - since
+            display._totals["acked"] += 1
+            display._latency_total += latency
+            display._latency_max = max(display._latency_max, latency)
+            if self._pending:
+                self._flush()
+
+    def _write(self):
+        while True:
+            message = self._queue.get()
+            if message is None:
+                return
+            try:
+                self._connection.send(message)
+            except OSError:
+                return
+
+    def close(self):
+        self._queue.put(None)
+        self._connection.close()
+
+
+class _Connection:
+    """A message-framed socket: length-prefixed TCP or WebSocket."""
+
+    def __init__(self, sock, websocket, file=None, max_message=None):
+        self._sock = sock
+        self._websocket = websocket
+        # Messages longer than this raise ValueError; None for no limit.
+        self._max_message = max_message
+        self._file = sock.makefile("rb") if file is None else file
+        self._send_lock = threading.Lock()
+
+    @classmethod
+    def accept(cls, sock):
+        """Read the client's greeting and return a connection limited to
+        viewer-sized messages; raises ValueError for unknown protocols."""
+        file = sock.makefile("rb")
+        greeting = file.read(4)
+        if greeting == _TCP_HELLO:
+            return cls(sock, websocket=False, file=file,
+                       max_message=_MAX_VIEWER_MESSAGE)
+        if greeting != b"GET ":
+            file.close()
+            raise ValueError("unknown protocol")
+        key = None
+        while True:
+            line = file.readline(8192)
+            if not line:
+                file.close()
+                raise ValueError("connection closed during handshake")
+            if line in (b"\r\n", b"\n"):
+                break
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"sec-websocket-key":
+                key = value.strip()
+        if key is None:
+            file.close()
+            raise ValueError("not a WebSocket request")
+        accept = base64.b64encode(hashlib.sha1(key + _WS_GUID).digest())
+        sock.sendall(
+            b"HTTP/1.1 101 Switching Protocols\r\n"
+            b"Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+        )
+        return cls(sock, websocket=True, file=file,
+                   max_message=_MAX_VIEWER_MESSAGE)
+
+    def send(self, message, opcode=0x2):
+        if self._websocket:
+            size = len(message)
+            if size < 126:
+                header = struct.pack(">BB", 0x80 | opcode, size)
+            elif size < 1 << 16:
+                header = struct.pack(">BBH", 0x80 | opcode, 126, size)
+            else:
+                header = struct.pack(">BBQ", 0x80 | opcode, 127, size)
+        else:
+            header = struct.pack("<I", len(message))
+        with self._send_lock:
+            self._sock.sendall(header + message)
+
+    def _check_size(self, size):
+        if self._max_message is not None and size > self._max_message:
+            raise ValueError("message too large")
+
+    def _read(self, size):
+        data = self._file.read(size)
+        if len(data) < size:
+            raise EOFError
+        return data
+
+    def receive(self):
+        """Return the next message, or ``None`` once the peer closed.
+
+        Raises ValueError for a message over the connection's limit,
+        before reading it.
+        """
+        try:
+            if not self._websocket:
+                (size,) = struct.unpack("<I", self._read(4))
+                self._check_size(size)
+                return self._read(size)
+            while True:
+                first, second = self._read(2)
+                opcode = first & 0x0F
+                size = second & 0x7F
+                if size == 126:
+                    (size,) = struct.unpack(">H", self._read(2))
+                elif size == 127:
+                    (size,) = struct.unpack(">Q", self._read(8))
+                self._check_size(size)
+                mask = self._read(4) if second & 0x80 else None
+                payload = self._read(size)
+                if mask is not None:
+                    payload = bytes(
+                        b ^ mask[i & 3] for i, b in enumerate(payload)
+                    )
+                if opcode == 0x8:
+                    return None
+                if opcode == 0x9:
+                    self.send(payload, opcode=0xA)
+                elif opcode in (0x0, 0x1, 0x2):
+                    return payload
+        except EOFError:
+            return None
+
+    def close(self):
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._file.close()
+        self._sock.close()
+
+
+def _encode_rect(buffer, width, area, encoding):
+    """Return ``(encoding id, payload)`` for *area* of the framebuffer."""
+    x1, y1, x2, y2 = area
+    raw = b"".join(
+        buffer[(y * width + x1) * 4:(y * width + x2) * 4]
+        for y in range(y1, y2)
+    )
+    if encoding == "raw":
+        return _RAW, raw
+    # One int per pixel; packing them back natively restores RGBA bytes.
+    pixels = memoryview(raw).cast("I")
+    best = (_RAW, raw)
+    if encoding in ("auto", "rle"):
+        rle = bytearray()
+        for value, run in itertools.groupby(pixels):
+            count = sum(1 for _ in run)
+            pixel = struct.pack("=I", value)
+            while count:
+                step = min(count, 256)
+                rle.append(step - 1)
+                rle += pixel
+                count -= step
+        if encoding == "rle" or len(rle) < len(best[1]):
+            best = (_RLE, bytes(rle))
+    if encoding in ("auto", "palette"):
+        colours = dict.fromkeys(pixels)
+        if len(colours) <= 256:
+            for index, colour in enumerate(colours):
+                colours[colour] = index
+            palette = (
+                bytes((len(colours) - 1,))
+                + array.array("I", colours).tobytes()
+                + bytes(map(colours.__getitem__, pixels))
+            )
+            if encoding == "palette" or len(palette) < len(best[1]):
+                best = (_PALETTE, palette)
+    return best
+
+
+def _decode_rect(kind, payload, count):
+    """Return the RGBA bytes of *count* pixels encoded in *payload*."""
+    if kind == _RAW:
+        return payload
+    if kind == _RLE:
+        out = bytearray()
+        for at in range(0, len(payload), 5):
+            out += payload[at + 1:at + 5] * (payload[at] + 1)
+        return bytes(out)
+    if kind == _PALETTE:
+        colours = payload[0] + 1
+        table = [
+            payload[1 + i * 4:5 + i * 4] for i in range(colours)
+        ]
+        return b"".join(map(table.__getitem__,
+                            payload[1 + colours * 4:1 + colours * 4 + count]))
+    raise ValueError("unknown encoding %d" % kind)
+
+
+class StreamViewer:
+    """A viewer for a :class:`StreamDisplay` in Python, over TCP.
+
+    Keeps a copy of the display's framebuffer in :attr:`pixels` and
+    acknowledges each frame once applied.  While paused it keeps applying
+    frames but holds its acknowledgements, like a viewer that has fallen
+    behind.
+
+    Args:
+        host (str): Host of the display.
+        port (int): Port of the display.
+    """
+
+    def __init__(self, host, port):
+        sock = socket.create_connection((host, port))
+        sock.sendall(_TCP_HELLO)
+        self._connection = _Connection(sock, websocket=False)
+        self.width = self.height = 0
+        self.pixels = bytearray()
+        self.frames = 0
+        self.bytes_received = 0
+        self._held = None
+        self._changed = threading.Condition()
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def pause(self):
+        """Stop acknowledging frames."""
+        with self._changed:
+            if self._held is None:
+                self._held = []
+
+    def resume(self):
+        """Acknowledge the frames held while paused, and any later ones."""
+        with self._changed:
+            held, self._held = self._held or [], None
+        for sequence in held:
+            self._acknowledge(sequence)
+
+    def wait(self, frames, timeout=5.0):
+        """Wait until at least *frames* frames have been applied; return
+        whether they were."""
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: self.frames >= frames, timeout
+            )
+
+    def close(self):
+        self._connection.close()
+        self._reader.join()
+
+    def _acknowledge(self, sequence):
+        try:
+            self._connection.send(b"A" + struct.pack("<I", sequence))
+        except OSError:
+            pass
+
+    def _read(self):
+        while True:
+            try:
+                message = self._connection.receive()
+            except (OSError, ValueError):
+                return
+            if message is None:
+                return
+            kind = message[:1]
+            if kind == b"H":
+                width, height = struct.unpack_from("<HH", message, 1)
+                with self._changed:
+                    self.width, self.height = width, height
+                    self.pixels = bytearray(width * height * 4)
+            elif kind == b"F":
+                sequence = self._apply(message)
+                with self._changed:
+                    self.frames += 1
+                    self.bytes_received += len(message)
+                    self._changed.notify_all()
+                    held = self._held
+                    if held is not None:
+                        held.append(sequence)
+                if held is None:
+                    self._acknowledge(sequence)
+
+    def _apply(self, message):
+        sequence, count = struct.unpack_from("<IH", message, 1)
+        at = 7
+        pixels = self.pixels
+        stride = self.width * 4
+        for _ in range(count):
+            x, y, w, h, kind, size = struct.unpack_from("<HHHHBI", message, at)
+            at += 13
+            rgba = _decode_rect(kind, message[at:at + size], w * h)
+            at += size
+            with self._changed:
+                for row in range(h):
+                    start = (y + row) * stride + x * 4
+                    pixels[start:start + w * 4] = rgba[row * w * 4:
+                                                       (row + 1) * w * 4]
+        return sequence
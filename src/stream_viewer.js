@@ -0,0 +1,95 @@
+(function (global) {
+    "use strict";
+
+    // Thin viewer for stream_display.StreamDisplay: draws the damaged
+    // rectangles it is sent onto a canvas and acknowledges each frame.
+    // See stream_display.py for the protocol.
+
+    const RAW = 0;
+    const RLE = 1;
+    const PALETTE = 2;
+
+    function decodeRect(encoding, bytes, pixels) {
+        if (encoding === RAW) {
+            return new Uint8ClampedArray(bytes.buffer, bytes.byteOffset, pixels * 4);
+        }
+        const out = new Uint8ClampedArray(pixels * 4);
+        if (encoding === RLE) {
+            let at = 0;
+            for (let i = 0; i < bytes.length; i += 5) {
+                const count = bytes[i] + 1;
+                for (let k = 0; k < count; k++, at += 4) {
+                    out[at] = bytes[i + 1];
+                    out[at + 1] = bytes[i + 2];
+                    out[at + 2] = bytes[i + 3];
+                    out[at + 3] = bytes[i + 4];
+                }
+            }
+        } else if (encoding === PALETTE) {
+            const colours = bytes[0] + 1;
+            const table = bytes.subarray(1, 1 + colours * 4);
+            const indices = bytes.subarray(1 + colours * 4);
+            for (let i = 0, at = 0; i < pixels; i++, at += 4) {
+                const c = indices[i] * 4;
+                out[at] = table[c];
+                out[at + 1] = table[c + 1];
+                out[at + 2] = table[c + 2];
+                out[at + 3] = table[c + 3];
+            }
+        } else {
+            throw new Error(`unknown encoding ${encoding}`);
+        }
+        return out;
+    }
+
+    function connectStreamViewer(url, canvas, { onFrame } = {}) {
+        const ctx = canvas.getContext("2d");
+        const socket = new WebSocket(url);
+        socket.binaryType = "arraybuffer";
+        const stats = { frames: 0, bytes: 0 };
+
+        socket.onmessage = (event) => {
+            const view = new DataView(event.data);
+            const bytes = new Uint8Array(event.data);
+            const kind = String.fromCharCode(view.getUint8(0));
+            if (kind === "H") {
+                canvas.width = view.getUint16(1, true);
+                canvas.height = view.getUint16(3, true);
+                return;
+            }
+            if (kind !== "F") {
+                return;
+            }
+            const sequence = view.getUint32(1, true);
+            const count = view.getUint16(5, true);
+            let at = 7;
+            for (let i = 0; i < count; i++) {
+                const x = view.getUint16(at, true);
+                const y = view.getUint16(at + 2, true);
+                const w = view.getUint16(at + 4, true);
+                const h = view.getUint16(at + 6, true);
+                const encoding = view.getUint8(at + 8);
+                const size = view.getUint32(at + 9, true);
+                at += 13;
+                const rgba = decodeRect(encoding, bytes.subarray(at, at + size), w * h);
+                at += size;
+                ctx.putImageData(new ImageData(rgba, w, h), x, y);
+            }
+            const ack = new DataView(new ArrayBuffer(5));
+            ack.setUint8(0, "A".charCodeAt(0));
+            ack.setUint32(1, sequence, true);
+            socket.send(ack.buffer);
+            stats.frames += 1;
+            stats.bytes += bytes.length;
+            if (onFrame) {
+                onFrame(stats);
+            }
+        };
+        return socket;
+    }
+
+    global.beadyeyeStream = {
+        connectStreamViewer,
+        decodeRect,
+    };
+})(window);
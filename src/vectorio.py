@@ -0,0 +1,422 @@
+"""
+vectorio - Pure Python shim for CircuitPython's vectorio module.
+
+Filled shapes drawn in a single palette colour.  A shape has no backing
+:class:`displayio.Bitmap`: it is rasterized straight into the display's
+framebuffer as horizontal spans, computed per row from the geometry and
+cached, so a shape costs memory proportional to its height rather than
+its area, and moving one repaints only the rectangles it left and
+entered.
+
+Supported classes (subset of CircuitPython vectorio):
+    Rectangle  – axis-aligned rectangle with its top-left corner at x, y
+    Circle     – disc of pixels within radius of its centre at x, y
+    Polygon    – polygon through points relative to x, y (non-zero fill)
+
+Shapes are appended to a :class:`displayio.Group` like a TileGrid::
+
+    import displayio, vectorio
+
+    palette = displayio.Palette(1)
+    palette[0] = 0xFF6B3D
+
+    group = displayio.Group()
+    group.append(vectorio.Circle(pixel_shader=palette, radius=14, x=40, y=30))
+    group.append(vectorio.Rectangle(
+        pixel_shader=palette, width=80, height=6, x=0, y=60,
+    ))
+"""
+
+import math
+
+from displayio import (
+    _area_intersection, _idle_displays, _invalidate_parents, _scene_changed,
+)
+
+
+class _VectorShape:
+    """Position, colour and layer protocol shared by the vectorio shapes.
+
+    Subclasses provide :meth:`_compute_bounds` and :meth:`_compute_spans`
+    and call :meth:`_geometry_changed` when their shape changes.
+    """
+
+    def __init__(self, pixel_shader, x, y, color_index):
+        self._pixel_shader = pixel_shader
+        self._x = x
+        self._y = y
+        self._color_index = color_index
+        self._hidden = False
+        # Bumped on every change that alters the pixels drawn.
+        self._version = 0
+        # Groups containing this shape; told when its area changes.
+        self._parents = []
+        # Local bounding box, and one list of (start, stop) spans per row
+        # of it; both relative to (x, y) and computed lazily.
+        self._bounds = None
+        self._spans = None
+
+    @property
+    def x(self):
+        """Horizontal position within the parent Group."""
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        self._x = value
+        _invalidate_parents(self)
+
+    @property
+    def y(self):
+        """Vertical position within the parent Group."""
+        return self._y
+
+    @y.setter
+    def y(self, value):
+        self._y = value
+        _invalidate_parents(self)
+
+    @property
+    def location(self):
+        """``(x, y)`` position within the parent Group."""
+        return (self._x, self._y)
+
+    @location.setter
+    def location(self, value):
+        self._x, self._y = value
+        _invalidate_parents(self)
+
+    @property
+    def hidden(self):
+        """Whether this shape is hidden (not rendered)."""
+        return self._hidden
+
+    @hidden.setter
+    def hidden(self, value):
+        self._hidden = bool(value)
+        _invalidate_parents(self)
+
+    @property
+    def color_index(self):
+        """Palette index the shape is filled with."""
+        return self._color_index
+
+    @color_index.setter
+    def color_index(self, value):
+        self._color_index = value
+        self._version += 1
+        if _idle_displays:
+            _scene_changed()
+
+    @property
+    def pixel_shader(self):
+        """The :class:`displayio.Palette` colouring the shape."""
+        return self._pixel_shader
+
+    @pixel_shader.setter
+    def pixel_shader(self, value):
+        self._pixel_shader = value
+        self._version += 1
+        if _idle_displays:
+            _scene_changed()
+
+    def _geometry_changed(self):
+        self._bounds = None
+        self._spans = None
+        self._version += 1
+        _invalidate_parents(self)
+
+    def _local_bounds(self):
+        if self._bounds is None:
+            self._bounds = self._compute_bounds()
+        return self._bounds
+
+    def _row_spans(self):
+        if self._spans is None:
+            self._spans = self._compute_spans()
+        return self._spans
+
+    def _rgba(self):
+        """Return the fill colour as RGBA bytes, or ``None`` when the
+        colour index is transparent or outside the palette."""
+        palette = self._pixel_shader
+        index = self._color_index
+        if not 0 <= index < len(palette) or palette.is_transparent(index):
+            return None
+        color = palette[index]
+        return bytes(((color >> 16) & 0xFF, (color >> 8) & 0xFF,
+                      color & 0xFF, 0xFF))
+
+    def _render_to_buffer(self, pixels, buf_width, buf_height, offset_x, offset_y):
+        """Pure Python: write RGBA pixel data into the flat bytearray *pixels*.
+
+        Args:
+            pixels (bytearray): RGBA buffer of size
+                ``buf_width * buf_height * 4``.
+            buf_width (int): Width of the destination buffer.
+            buf_height (int): Height of the destination buffer.
+            offset_x (int): Accumulated horizontal offset from parent Groups.
+            offset_y (int): Accumulated vertical offset from parent Groups.
+        """
+        if self._hidden:
+            return
+        self._draw(
+            pixels, buf_width, self._x + offset_x, self._y + offset_y,
+            (0, 0, buf_width, buf_height),
+        )
+
+    # -- layer protocol used by displayio.Display --------------------------
+
+    def _area_in_parent(self):
+        """Return the area covered in the parent's coordinates, or
+        ``None`` when hidden."""
+        if self._hidden:
+            return None
+        x1, y1, x2, y2 = self._local_bounds()
+        if x1 >= x2 or y1 >= y2:
+            return None
+        return (self._x + x1, self._y + y1, self._x + x2, self._y + y2)
+
+    def _collect_layers(self, layers, offset_x, offset_y, clip=None, scale=1):
+        if self._hidden:
+            return
+        x = offset_x + self._x * scale
+        y = offset_y + self._y * scale
+        area = self._screen_area(x, y, scale)
+        if area[0] >= area[2] or area[1] >= area[3]:
+            return
+        if clip is not None and _area_intersection(area, clip) is None:
+            return
+        layers.append((self, x, y, scale))
+
+    def _screen_area(self, x, y, scale=1):
+        """Return the display area covered when drawn with the shape
+        origin at (*x*, *y*) magnified *scale* times."""
+        x1, y1, x2, y2 = self._local_bounds()
+        return (x + x1 * scale, y + y1 * scale, x + x2 * scale, y + y2 * scale)
+
+    def _content_key(self):
+        """Return a token that changes whenever the rendered pixels may."""
+        return (self._pixel_shader._version, self._version)
+
+    def _changed_area(self, key):
+        """Return the local area changed since content token *key*."""
+        return self._local_bounds()
+
+    def _opaque_area(self, x, y, scale=1):
+        """Return the display area painted fully opaque, or ``None``."""
+        return None
+
+    def _finish_refresh(self):
+        pass
+
+    def _draw(self, pixels, buf_width, x, y, clip, scale=1):
+        """Fill the shape's spans with the shape origin at (*x*, *y*),
+        magnified *scale* times, inside the buffer area *clip*.
+
+        Each span is one slice store of a pre-built colour run.
+        """
+        color = self._rgba()
+        if color is None:
+            return
+        area = _area_intersection(clip, self._screen_area(x, y, scale))
+        if area is None:
+            return
+        x1, y1, x2, y2 = area
+        run = color * (x2 - x1)
+        rows = self._row_spans()
+        top = self._local_bounds()[1]
+        stride = buf_width * 4
+        for py in range(y1, y2):
+            row = py * stride
+            for start, stop in rows[(py - y) // scale - top]:
+                start = max(x + start * scale, x1)
+                stop = min(x + stop * scale, x2)
+                if start < stop:
+                    pixels[row + start * 4:row + stop * 4] = (
+                        run[:(stop - start) * 4]
+                    )
+
+
+class Rectangle(_VectorShape):
+    """A filled rectangle with its top-left corner at (*x*, *y*).
+
+    Compatible with CircuitPython's ``vectorio.Rectangle``.
+
+    Args:
+        pixel_shader: A :class:`displayio.Palette` instance.
+        width (int): Width in pixels.
+        height (int): Height in pixels.
+        x (int): Horizontal position of the left edge.
+        y (int): Vertical position of the top edge.
+        color_index (int): Palette index to fill with.
+    """
+
+    def __init__(self, *, pixel_shader, width, height, x=0, y=0,
+                 color_index=0):
+        super().__init__(pixel_shader, x, y, color_index)
+        self._width = self._check_size(width, "width")
+        self._height = self._check_size(height, "height")
+
+    @staticmethod
+    def _check_size(value, name):
+        if value < 1:
+            raise ValueError("%s must be at least 1" % name)
+        return int(value)
+
+    @property
+    def width(self):
+        """Width in pixels."""
+        return self._width
+
+    @width.setter
+    def width(self, value):
+        self._width = self._check_size(value, "width")
+        self._geometry_changed()
+
+    @property
+    def height(self):
+        """Height in pixels."""
+        return self._height
+
+    @height.setter
+    def height(self, value):
+        self._height = self._check_size(value, "height")
+        self._geometry_changed()
+
+    def _compute_bounds(self):
+        return (0, 0, self._width, self._height)
+
+    def _compute_spans(self):
+        return [((0, self._width),)] * self._height
+
+    def _opaque_area(self, x, y, scale=1):
+        if self._rgba() is None:
+            return None
+        return self._screen_area(x, y, scale)
+
+
+class Circle(_VectorShape):
+    """A filled circle centred on (*x*, *y*).
+
+    Compatible with CircuitPython's ``vectorio.Circle``: the pixels at
+    distance *dx*, *dy* from the centre with ``dx*dx + dy*dy <= r*r``.
+
+    Args:
+        pixel_shader: A :class:`displayio.Palette` instance.
+        radius (int): Radius in pixels.
+        x (int): Horizontal position of the centre.
+        y (int): Vertical position of the centre.
+        color_index (int): Palette index to fill with.
+    """
+
+    def __init__(self, *, pixel_shader, radius, x=0, y=0, color_index=0):
+        super().__init__(pixel_shader, x, y, color_index)
+        self._radius = self._check_radius(radius)
+
+    @staticmethod
+    def _check_radius(radius):
+        if radius < 0:
+            raise ValueError("radius must be non-negative")
+        return int(radius)
+
+    @property
+    def radius(self):
+        """Radius in pixels."""
+        return self._radius
+
+    @radius.setter
+    def radius(self, value):
+        self._radius = self._check_radius(value)
+        self._geometry_changed()
+
+    def _compute_bounds(self):
+        r = self._radius
+        return (-r, -r, r + 1, r + 1)
+
+    def _compute_spans(self):
+        r = self._radius
+        spans = []
+        for dy in range(-r, r + 1):
+            half = math.isqrt(r * r - dy * dy)
+            spans.append(((-half, half + 1),))
+        return spans
+
+
+class Polygon(_VectorShape):
+    """A filled polygon through *points*, offset by (*x*, *y*).
+
+    Compatible with CircuitPython's ``vectorio.Polygon``.  A pixel is
+    filled when its centre lies inside the polygon by the non-zero winding
+    rule, so polygons sharing an edge do not overlap.
+
+    Args:
+        pixel_shader: A :class:`displayio.Palette` instance.
+        points (list): ``(x, y)`` vertices, relative to (*x*, *y*).
+        x (int): Horizontal offset of the points.
+        y (int): Vertical offset of the points.
+        color_index (int): Palette index to fill with.
+    """
+
+    def __init__(self, *, pixel_shader, points, x=0, y=0, color_index=0):
+        super().__init__(pixel_shader, x, y, color_index)
+        self._points = self._check_points(points)
+
+    @staticmethod
+    def _check_points(points):
+        points = [(int(px), int(py)) for px, py in points]
+        if len(points) < 3:
+            raise ValueError("a polygon needs at least 3 points")
+        return points
+
+    @property
+    def points(self):
+        """The ``(x, y)`` vertices of the polygon."""
+        return list(self._points)
+
+    @points.setter
+    def points(self, value):
+        self._points = self._check_points(value)
+        self._geometry_changed()
+
+    def _compute_bounds(self):
+        xs = [px for px, _ in self._points]
+        ys = [py for _, py in self._points]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    def _compute_spans(self):
+        """Scan-convert the polygon: for each row, intersect the edges with
+        the line through the pixel centres and fill between crossings
+        while the winding number is non-zero."""
+        x1, y1, _, y2 = self._local_bounds()
+        points = self._points
+        edges = [
+            (points[i], points[(i + 1) % len(points)])
+            for i in range(len(points))
+            if points[i][1] != points[(i + 1) % len(points)][1]
+        ]
+        spans = []
+        for row in range(y1, y2):
+            centre = row + 0.5
+            crossings = []
+            for (ax, ay), (bx, by) in edges:
+                if min(ay, by) <= centre < max(ay, by):
+                    cx = ax + (centre - ay) * (bx - ax) / (by - ay)
+                    crossings.append((cx, 1 if by > ay else -1))
+            crossings.sort()
+            row_spans = []
+            winding = 0
+            start = None
+            for cx, direction in crossings:
+                # First pixel whose centre lies at or right of the crossing.
+                edge = math.ceil(cx - 0.5)
+                if winding == 0:
+                    start = edge
+                winding += direction
+                if winding == 0 and start < edge:
+                    if row_spans and row_spans[-1][1] >= start:
+                        row_spans[-1] = (row_spans[-1][0], edge)
+                    else:
+                        row_spans.append((start, edge))
+            spans.append(tuple(row_spans))
+        return spans
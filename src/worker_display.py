@@ -0,0 +1,93 @@
+"""
+worker_display - Render in a Web Worker and hand finished frames to the
+page.
+
+beady-eye extension.  ``displayio_worker.js`` runs Pyodide in a Web
+Worker so that rendering never blocks the page.  Where the browser can
+transfer the page's canvas to the worker as an ``OffscreenCanvas``, a
+plain :class:`displayio.Display` draws on it directly.  Otherwise a
+:class:`TransferDisplay` renders into memory and posts the damaged
+rectangles of each refresh to the page as transferable ``ArrayBuffer``
+objects, which ``beadyeyePyodide.drawFrameMessage`` (in
+``displayio.js``) paints onto the real canvas.
+
+Usage (inside the worker)::
+
+    import worker_display
+
+    display = worker_display.TransferDisplay(320, 240)
+    display.show(group)
+
+Message
+-------
+
+Each refresh posts one message::
+
+    {type: "frame", rects: [[x, y, width, height, pixels], ...]}
+
+where *pixels* is a ``Uint8ClampedArray`` of the rectangle's RGBA
+pixels, row by row, whose buffer is in the transfer list (so it moves to
+the page without a copy and is detached in the worker).
+"""
+
+import displayio
+
+
+class TransferDisplay(displayio.HeadlessDisplay):
+    """A :class:`displayio.HeadlessDisplay` for a Web Worker that posts
+    its damaged areas to the page after each refresh.
+
+    Animation frames (for :attr:`~displayio.Display.auto_refresh` and
+    deferred refreshes) come from the worker's ``requestAnimationFrame``
+    like those of :class:`displayio.Display`; workers cannot start the
+    timer thread :class:`~displayio.HeadlessDisplay` uses.
+
+    Args:
+        width (int): Framebuffer width in pixels.
+        height (int): Framebuffer height in pixels.
+        auto_refresh (bool): As for :class:`displayio.Display`.
+        post (callable | None): Called as ``post(message, transfer)`` for
+            each frame; ``None`` uses the worker's ``postMessage``.
+
+    Example::
+
+        display = TransferDisplay(320, 240)
+        display.show(group)
+    """
+
+    def __init__(self, width=320, height=240, *, auto_refresh=True,
+                 post=None):
+        self._post = post
+        super().__init__(width, height, auto_refresh=auto_refresh)
+
+    def _request_frame(self):
+        displayio.Display._request_frame(self)
+
+    def _present(self, areas):
+        import js
+        from pyodide.ffi import to_js
+
+        stride = self.width * 4
+        buffer = memoryview(self._buffer)
+        rects = []
+        transfer = []
+        for x1, y1, x2, y2 in areas:
+            row = (x2 - x1) * 4
+            if row == stride:
+                data = buffer[y1 * stride:y2 * stride]
+            else:
+                data = b"".join(
+                    buffer[y * stride + x1 * 4:y * stride + x1 * 4 + row]
+                    for y in range(y1, y2)
+                )
+            pixels = js.Uint8ClampedArray.new(len(data))
+            pixels.assign(data)
+            rects.append([x1, y1, x2 - x1, y2 - y1, pixels])
+            transfer.append(pixels.buffer)
+        del buffer
+        message = to_js(
+            {"type": "frame", "rects": rects},
+            dict_converter=js.Object.fromEntries,
+        )
+        post = self._post if self._post is not None else js.postMessage
+        post(message, to_js(transfer))
@@ -0,0 +1,40 @@
+"""
+Smoke test for benchmarks/bench_render.py: one tiny scene end to end.
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+import bench_render
+
+
+class TestMain(unittest.TestCase):
+
+    def test_json_report(self):
+        with tempfile.TemporaryDirectory() as out:
+            report = os.path.join(out, "results.json")
+            with redirect_stdout(io.StringIO()) as stdout:
+                bench_render.main([
+                    "--scene", "nested", "--size", "32x24",
+                    "--min-time", "0", "--json", report,
+                ])
+            self.assertIn("nested/full/32x24", stdout.getvalue())
+            with open(report) as f:
+                results = json.load(f)["results"]
+        self.assertEqual(
+            [result["mode"] for result in results], ["full", "tick"]
+        )
+        for result in results:
+            self.assertGreater(result["fps"], 0)
+            self.assertGreaterEqual(result["peak_kib_per_refresh"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,216 @@
+"""
+Unit tests for fontio.py and the adafruit_bitmap_font BDF/PCF loaders.
+"""
+
+import io
+import os
+import struct
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import displayio
+import fontio
+from adafruit_bitmap_font import bitmap_font
+
+# Two glyphs: "A" (3x4 with a descender-free box) and "g" (3x4 reaching
+# one pixel below the baseline).
+_GLYPHS = {
+    ord("A"): {
+        "rows": ["010", "101", "111", "101"],
+        "bbx": (3, 4, 0, 0),
+        "dwidth": 4,
+    },
+    ord("g"): {
+        "rows": ["011", "101", "011", "110"],
+        "bbx": (3, 4, 0, -1),
+        "dwidth": 4,
+    },
+}
+
+_BDF = """STARTFONT 2.1
+FONT -test-tiny
+SIZE 5 75 75
+FONTBOUNDINGBOX 3 5 0 -1
+STARTPROPERTIES 2
+FONT_ASCENT 4
+FONT_DESCENT 1
+ENDPROPERTIES
+CHARS 2
+STARTCHAR A
+ENCODING 65
+SWIDTH 800 0
+DWIDTH 4 0
+BBX 3 4 0 0
+BITMAP
+40
+A0
+E0
+A0
+ENDCHAR
+STARTCHAR g
+ENCODING 103
+SWIDTH 800 0
+DWIDTH 4 0
+BBX 3 4 0 -1
+BITMAP
+60
+A0
+60
+C0
+ENDCHAR
+ENDFONT
+"""
+
+
+def _build_pcf(msb_bit_first=True):
+    """Encode _GLYPHS as a minimal PCF file (big-endian, byte-padded)."""
+    fmt = 0x4 | (0x8 if msb_bit_first else 0)
+    codes = sorted(_GLYPHS)
+    metrics = b""
+    bitmaps = b""
+    offsets = []
+    for code in codes:
+        glyph = _GLYPHS[code]
+        w, h, xoff, yoff = glyph["bbx"]
+        ascent, descent = h + yoff, -yoff
+        metrics += bytes(v + 0x80 for v in (xoff, xoff + w, glyph["dwidth"],
+                                             ascent, descent))
+        offsets.append(len(bitmaps))
+        for row in glyph["rows"]:
+            byte = int(row.ljust(8, "0"), 2)
+            if not msb_bit_first:
+                byte = int("{:08b}".format(byte)[::-1], 2)
+            bitmaps += bytes((byte,))
+    tables = {
+        1 << 2: struct.pack("<i", fmt | 0x100)
+        + struct.pack(">h", len(codes)) + metrics,
+        1 << 3: struct.pack("<i", fmt)
+        + struct.pack(">i", len(codes))
+        + struct.pack(">%di" % len(codes), *offsets)
+        + struct.pack(">4i", len(bitmaps), 0, 0, 0) + bitmaps,
+        1 << 5: struct.pack("<i", fmt)
+        + struct.pack(">5h", 0, 255, 0, 0, 0)
+        + b"".join(
+            struct.pack(">H", codes.index(c) if c in codes else 0xFFFF)
+            for c in range(256)
+        ),
+        1 << 1: struct.pack("<i", fmt) + bytes(8)
+        + struct.pack(">3i", 4, 1, 0)
+        + struct.pack(">6h", 0, 3, 4, 0, -1, 0)
+        + struct.pack(">6h", 0, 3, 4, 4, 1, 0),
+    }
+    header = b"\x01fcp" + struct.pack("<i", len(tables))
+    offset = len(header) + 16 * len(tables)
+    toc = b""
+    body = b""
+    for kind, data in tables.items():
+        toc += struct.pack("<4i", kind, struct.unpack("<i", data[:4])[0],
+                           len(data), offset + len(body))
+        body += data
+    return header + toc + body
+
+
+def _glyph_pattern(glyph):
+    bitmap = glyph.bitmap
+    return [
+        "".join(str(bitmap[x, y]) for x in range(glyph.width))
+        for y in range(glyph.height)
+    ]
+
+
+class TestBuiltinFont(unittest.TestCase):
+
+    def setUp(self):
+        self.font = fontio.BuiltinFont.from_rows(
+            {"A": ["010", "101", "111"], "B": ["110", "111", "110"]}, 4, 3
+        )
+
+    def test_glyphs_are_tiles_of_one_packed_bitmap(self):
+        self.assertEqual(self.font.bitmap.bits_per_value, 1)
+        glyph = self.font.get_glyph(ord("B"))
+        self.assertIs(glyph.bitmap, self.font.bitmap)
+        self.assertEqual(glyph.tile_index, 1)
+        self.assertEqual((glyph.width, glyph.height, glyph.shift_x), (4, 3, 4))
+        self.assertEqual(
+            [self.font.bitmap[4 + x, 0] for x in range(4)], [1, 1, 0, 0]
+        )
+
+    def test_missing_glyph(self):
+        self.assertIsNone(self.font.get_glyph(ord("Z")))
+
+    def test_bounding_box(self):
+        self.assertEqual(self.font.get_bounding_box(), (4, 3))
+
+
+class TestBDF(unittest.TestCase):
+
+    def setUp(self):
+        self.font = bitmap_font.load_font(io.BytesIO(_BDF.encode("ascii")))
+
+    def test_metrics(self):
+        self.assertEqual(self.font.get_bounding_box(), (3, 5, 0, -1))
+        self.assertEqual((self.font.ascent, self.font.descent), (4, 1))
+
+    def test_glyphs_decode_lazily(self):
+        self.assertEqual(self.font._glyphs, {})
+        self.font.get_glyph(ord("A"))
+        self.assertEqual(list(self.font._glyphs), [ord("A")])
+
+    def test_glyph_bitmap(self):
+        for code, expected in _GLYPHS.items():
+            glyph = self.font.get_glyph(code)
+            self.assertEqual(_glyph_pattern(glyph), expected["rows"])
+            self.assertEqual(
+                (glyph.width, glyph.height, glyph.dx, glyph.dy),
+                expected["bbx"],
+            )
+            self.assertEqual(glyph.shift_x, expected["dwidth"])
+            self.assertEqual(glyph.bitmap.bits_per_value, 1)
+
+    def test_load_glyphs_and_missing(self):
+        self.font.load_glyphs("Ag?")
+        self.assertIsNone(self.font.get_glyph(ord("?")))
+        self.assertEqual(len(self.font._glyphs), 3)
+
+    def test_custom_bitmap_class(self):
+        font = bitmap_font.load_font(
+            io.BytesIO(_BDF.encode("ascii")),
+            lambda w, h, n: displayio.Bitmap(w, h, 256),
+        )
+        self.assertEqual(font.get_glyph(ord("A")).bitmap.bits_per_value, 8)
+
+    def test_load_from_path(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tiny.bdf")
+            with open(path, "w") as f:
+                f.write(_BDF)
+            font = bitmap_font.load_font(path)
+        self.assertIsNotNone(font.get_glyph(ord("g")))
+
+
+class TestPCF(unittest.TestCase):
+
+    def test_matches_bdf(self):
+        for msb in (True, False):
+            font = bitmap_font.load_font(io.BytesIO(_build_pcf(msb)))
+            self.assertEqual((font.ascent, font.descent), (4, 1))
+            self.assertEqual(font.get_bounding_box(), (3, 5, 0, -1))
+            for code, expected in _GLYPHS.items():
+                glyph = font.get_glyph(code)
+                self.assertEqual(_glyph_pattern(glyph), expected["rows"])
+                self.assertEqual(
+                    (glyph.width, glyph.height, glyph.dx, glyph.dy),
+                    expected["bbx"],
+                )
+            self.assertIsNone(font.get_glyph(ord("?")))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            bitmap_font.load_font(io.BytesIO(b"not a font"))
+
+
+if __name__ == "__main__":
+    unittest.main()
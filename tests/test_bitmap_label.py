@@ -0,0 +1,186 @@
+"""
+Unit tests for adafruit_display_text.bitmap_label: glyph layout into a
+packed bitmap, bitmap reuse, anchoring and palette handling.
+"""
+
+import gc
+import io
+import os
+import sys
+import unittest
+import weakref
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import displayio
+import fontio
+from adafruit_bitmap_font import bitmap_font
+from adafruit_display_text import bitmap_label
+
+from test_bitmap_font import _BDF
+
+
+def _font():
+    return fontio.BuiltinFont.from_rows(
+        {"A": ["010", "101", "111"], "B": ["110", "111", "110"]}, 4, 3
+    )
+
+
+def _pattern(label):
+    bitmap = label.bitmap
+    return [
+        "".join("#" if bitmap[x, y] else "." for x in range(bitmap.width))
+        for y in range(bitmap.height)
+    ]
+
+
+class TestLayout(unittest.TestCase):
+
+    def setUp(self):
+        self.font = _font()
+
+    def test_glyphs_copied_into_one_packed_bitmap(self):
+        label = bitmap_label.Label(self.font, text="AB")
+        self.assertEqual(label.bitmap.bits_per_value, 1)
+        self.assertEqual(_pattern(label), [".#..##..", "#.#.###.", "###.##.."])
+        self.assertEqual(label.bounding_box, (0, -2, 8, 3))
+
+    def test_multiline(self):
+        label = bitmap_label.Label(self.font, text="A\nB", line_spacing=2)
+        self.assertEqual(
+            _pattern(label),
+            [".#..", "#.#.", "###.", "....", "....", "....",
+             "##..", "###.", "##.."],
+        )
+
+    def test_empty_text_has_no_bitmap(self):
+        label = bitmap_label.Label(self.font, text="A")
+        label.text = ""
+        self.assertIsNone(label.bitmap)
+        self.assertEqual(len(label), 0)
+        label.text = "B"
+        self.assertEqual(len(label), 1)
+
+    def test_same_size_text_reuses_bitmap(self):
+        label = bitmap_label.Label(self.font, text="AB")
+        bitmap = label.bitmap
+        label.text = "BA"
+        self.assertIs(label.bitmap, bitmap)
+        self.assertEqual(_pattern(label), ["##...#..", "###.#.#.", "##..###."])
+        label.text = "ABA"
+        self.assertIsNot(label.bitmap, bitmap)
+        self.assertEqual(label.bitmap.width, 12)
+
+    def test_glyph_rows_freed_with_font(self):
+        font = _font()
+        bitmap_label.Label(font, text="AB")
+        self.assertIn(font.bitmap, bitmap_label._GLYPH_ROWS)
+        sheet = weakref.ref(font.bitmap)
+        del font
+        gc.collect()
+        self.assertIsNone(sheet())
+
+    def test_glyph_sheet_change_refreshes_rows(self):
+        bitmap_label.Label(self.font, text="A")
+        self.font.bitmap[0, 0] = 1
+        label = bitmap_label.Label(self.font, text="A")
+        self.assertEqual(_pattern(label)[0], "##..")
+
+    def test_bdf_descender_extends_box(self):
+        font = bitmap_font.load_font(io.BytesIO(_BDF.encode("ascii")))
+        label = bitmap_label.Label(font, text="Ag")
+        x, y, width, height = label.bounding_box
+        self.assertEqual((width, height), (8, 5))
+        self.assertEqual(
+            _pattern(label),
+            [".#......", "#.#..##.", "###.#.#.", "#.#..##.", "....##.."],
+        )
+
+
+class TestIncrementalUpdate(unittest.TestCase):
+
+    def setUp(self):
+        self.font = _font()
+
+    def _changed(self, label, text):
+        bitmap = label.bitmap
+        bitmap._finish_refresh()
+        since = bitmap._version
+        label.text = text
+        self.assertIs(label.bitmap, bitmap)
+        return bitmap._changed_area(since)
+
+    def test_only_changed_cell_is_damaged(self):
+        label = bitmap_label.Label(self.font, text="AAAA")
+        self.assertEqual(self._changed(label, "AABA"), (8, 0, 12, 3))
+
+    def test_matches_fresh_layout(self):
+        label = bitmap_label.Label(self.font, text="ABBA")
+        for text in ("ABAA", "BBBB", "AAAB", "BABA"):
+            label.text = text
+            fresh = bitmap_label.Label(self.font, text=text)
+            self.assertEqual(_pattern(label), _pattern(fresh))
+
+    def test_overlapping_neighbour_is_repainted(self):
+        # Glyphs 4 pixels wide that advance by 3 overlap by a column.
+        font = fontio.BuiltinFont.from_rows(
+            {"A": ["1111", "1001"], "B": ["0110", "0110"]}, 4, 2
+        )
+        font.get_glyph = lambda code, get=font.get_glyph: get(code)._replace(
+            shift_x=3
+        )
+        label = bitmap_label.Label(font, text="AAA")
+        label.text = "ABA"
+        fresh = bitmap_label.Label(font, text="ABA")
+        self.assertEqual(_pattern(label), _pattern(fresh))
+
+
+class TestAppearance(unittest.TestCase):
+
+    def setUp(self):
+        self.font = _font()
+
+    def _render(self, label, w, h):
+        group = displayio.Group()
+        group.append(label)
+        pixels = bytearray(w * h * 4)
+        group._render_to_buffer(pixels, w, h, 0, 0)
+        return pixels
+
+    def test_transparent_background_by_default(self):
+        label = bitmap_label.Label(self.font, text="A", color=0x00FF00, y=2)
+        pixels = self._render(label, 4, 3)
+        self.assertEqual(bytes(pixels[0:4]), b"\x00\x00\x00\x00")
+        self.assertEqual(bytes(pixels[4:8]), b"\x00\xff\x00\xff")
+
+    def test_background_colour(self):
+        label = bitmap_label.Label(
+            self.font, text="A", background_color=0x0000FF, y=2
+        )
+        pixels = self._render(label, 4, 3)
+        self.assertEqual(bytes(pixels[0:4]), b"\x00\x00\xff\xff")
+        label.background_color = None
+        pixels = self._render(label, 4, 3)
+        self.assertEqual(pixels[3], 0)
+
+    def test_colour_change_keeps_bitmap(self):
+        label = bitmap_label.Label(self.font, text="A")
+        bitmap = label.bitmap
+        label.color = 0xFF0000
+        self.assertIs(label.bitmap, bitmap)
+        self.assertEqual(label.color, 0xFF0000)
+
+    def test_anchored_position(self):
+        label = bitmap_label.Label(
+            self.font, text="AB", anchor_point=(0.5, 1.0),
+            anchored_position=(20, 10),
+        )
+        self.assertEqual((label.x, label.y), (16, 9))
+        label.scale = 2
+        self.assertEqual((label.x, label.y), (12, 8))
+        label.anchor_point = (0, 0)
+        self.assertEqual((label.x, label.y), (20, 14))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,265 @@
+"""
+Unit tests for bitmaptools.py, run against displayio.Bitmap under CPython.
+"""
+
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import bitmaptools
+import displayio
+
+
+def _rows(bitmap):
+    """Return the bitmap as a list of strings, one digit per pixel."""
+    return [
+        "".join(str(bitmap[x, y]) for x in range(bitmap.width))
+        for y in range(bitmap.height)
+    ]
+
+
+def _disc(radius, value_count=2):
+    """Reference filled disc, drawn a pixel at a time."""
+    size = radius * 2 + 1
+    bitmap = displayio.Bitmap(size, size, value_count)
+    for py in range(size):
+        for px in range(size):
+            if (px - radius) ** 2 + (py - radius) ** 2 <= radius * radius:
+                bitmap[px, py] = 1
+    return bitmap
+
+
+class TestFillRegion(unittest.TestCase):
+
+    def test_fills_rectangle(self):
+        b = displayio.Bitmap(5, 4, 2)
+        bitmaptools.fill_region(b, 1, 1, 4, 3, 1)
+        self.assertEqual(_rows(b), ["00000", "01110", "01110", "00000"])
+
+    def test_clips_and_normalises(self):
+        b = displayio.Bitmap(4, 3, 4)
+        bitmaptools.fill_region(b, 6, -2, 2, 2, 3)
+        self.assertEqual(_rows(b), ["0033", "0033", "0000"])
+
+    def test_marks_only_the_region_dirty(self):
+        b = displayio.Bitmap(8, 8, 16)
+        bitmaptools.fill_region(b, 2, 3, 5, 6, 7)
+        self.assertEqual(b._changed_area(0), (2, 3, 5, 6))
+
+
+class TestBlit(unittest.TestCase):
+
+    def setUp(self):
+        self.src = displayio.Bitmap(3, 2, 4)
+        for x, y, v in ((0, 0, 1), (1, 0, 2), (2, 0, 0),
+                        (0, 1, 3), (1, 1, 0), (2, 1, 1)):
+            self.src[x, y] = v
+
+    def test_copies_region(self):
+        dest = displayio.Bitmap(5, 3, 4)
+        bitmaptools.blit(dest, self.src, 1, 1)
+        self.assertEqual(_rows(dest), ["00000", "01200", "03010"])
+
+    def test_source_region(self):
+        dest = displayio.Bitmap(3, 2, 4)
+        bitmaptools.blit(dest, self.src, 0, 0, x1=1, y1=0, x2=3, y2=1)
+        self.assertEqual(_rows(dest), ["200", "000"])
+
+    def test_clips_to_destination(self):
+        dest = displayio.Bitmap(2, 2, 4)
+        bitmaptools.blit(dest, self.src, -1, 1)
+        self.assertEqual(_rows(dest), ["00", "20"])
+
+    def test_skip_source_index(self):
+        dest = displayio.Bitmap(3, 2, 4)
+        dest.fill(2)
+        bitmaptools.blit(dest, self.src, 0, 0, skip_source_index=0)
+        self.assertEqual(_rows(dest), ["122", "321"])
+
+    def test_skip_dest_index(self):
+        dest = displayio.Bitmap(3, 2, 4)
+        dest[1, 0] = 3
+        bitmaptools.blit(dest, self.src, 0, 0, skip_dest_index=3)
+        self.assertEqual(_rows(dest), ["130", "301"])
+
+    def test_skip_index_out_of_byte_range(self):
+        # No pixel of a packed or 8-bit bitmap can hold these values.
+        for skip in (300, -1):
+            with self.subTest(skip=skip):
+                dest = displayio.Bitmap(3, 2, 4)
+                bitmaptools.blit(
+                    dest, self.src, 0, 0,
+                    skip_source_index=skip, skip_dest_index=skip,
+                )
+                self.assertEqual(_rows(dest), ["120", "301"])
+
+    def test_between_storage_widths(self):
+        dest = displayio.Bitmap(3, 2, 300)
+        bitmaptools.blit(dest, self.src, 0, 0)
+        self.assertEqual(_rows(dest), ["120", "301"])
+
+
+class TestDrawLine(unittest.TestCase):
+
+    def test_horizontal(self):
+        b = displayio.Bitmap(5, 1, 2)
+        bitmaptools.draw_line(b, 4, 0, 1, 0, 1)
+        self.assertEqual(_rows(b), ["01111"])
+
+    def test_vertical(self):
+        b = displayio.Bitmap(2, 3, 2)
+        bitmaptools.draw_line(b, 1, 2, 1, 0, 1)
+        self.assertEqual(_rows(b), ["01", "01", "01"])
+
+    def test_shallow_diagonal(self):
+        b = displayio.Bitmap(5, 3, 2)
+        bitmaptools.draw_line(b, 0, 0, 4, 2, 1)
+        self.assertEqual(_rows(b), ["11000", "00110", "00001"])
+
+    def test_matches_pixel_bresenham(self):
+        # Every octant gives the same pixels as a plain Bresenham walk.
+        for x2, y2 in ((7, 2), (2, 7), (-7, 2), (-2, 7),
+                       (7, -2), (-7, -3), (0, -6)):
+            b = displayio.Bitmap(17, 17, 2)
+            bitmaptools.draw_line(b, 8, 8, 8 + x2, 8 + y2, 1)
+            expected = displayio.Bitmap(17, 17, 2)
+            x, y, tx, ty = 8, 8, 8 + x2, 8 + y2
+            if ty < y or (ty == y and tx < x):
+                x, y, tx, ty = tx, ty, x, y
+            dx, dy = abs(tx - x), ty - y
+            step = 1 if tx >= x else -1
+            err = dx - dy
+            while True:
+                expected[x, y] = 1
+                if (x, y) == (tx, ty):
+                    break
+                e2 = 2 * err
+                if e2 > -dy:
+                    err -= dy
+                    x += step
+                if e2 < dx:
+                    err += dx
+                    y += 1
+            self.assertEqual(_rows(b), _rows(expected), (x2, y2))
+
+    def test_clipped(self):
+        b = displayio.Bitmap(3, 3, 2)
+        bitmaptools.draw_line(b, -5, 1, 10, 1, 1)
+        self.assertEqual(_rows(b), ["000", "111", "000"])
+
+
+class TestDrawCircle(unittest.TestCase):
+
+    def test_outline_is_disc_edge(self):
+        b = displayio.Bitmap(7, 7, 2)
+        bitmaptools.draw_circle(b, 3, 3, 3, 1)
+        self.assertEqual(_rows(b), [
+            "0001000",
+            "0110110",
+            "0100010",
+            "1000001",
+            "0100010",
+            "0110110",
+            "0001000",
+        ])
+
+    def test_outline_then_fill_matches_disc(self):
+        for radius in (1, 5, 14):
+            size = radius * 2 + 1
+            b = displayio.Bitmap(size, size, 2)
+            bitmaptools.draw_circle(b, radius, radius, radius, 1)
+            bitmaptools.boundary_fill(b, radius, radius, 1, 0)
+            self.assertEqual(_rows(b), _rows(_disc(radius)))
+
+    def test_clipped_at_edges(self):
+        b = displayio.Bitmap(4, 4, 2)
+        bitmaptools.draw_circle(b, 0, 0, 3, 1)
+        self.assertEqual(_rows(b), ["0001", "0010", "0110", "1000"])
+
+
+class TestRotozoom(unittest.TestCase):
+
+    def setUp(self):
+        self.src = displayio.Bitmap(4, 2, 4)
+        for x in range(4):
+            self.src[x, 0] = 1
+            self.src[x, 1] = 2
+
+    def test_identity_copies(self):
+        dest = displayio.Bitmap(4, 2, 4)
+        bitmaptools.rotozoom(dest, self.src)
+        self.assertEqual(_rows(dest), _rows(self.src))
+
+    def test_scale_two(self):
+        dest = displayio.Bitmap(8, 4, 4)
+        bitmaptools.rotozoom(dest, self.src, scale=2.0)
+        self.assertEqual(_rows(dest), ["11111111", "11111111",
+                                       "22222222", "22222222"])
+
+    def test_quarter_turn(self):
+        dest = displayio.Bitmap(4, 4, 4)
+        bitmaptools.rotozoom(dest, self.src, ox=2, oy=2, angle=math.pi / 2)
+        self.assertEqual(_rows(dest), ["0210", "0210", "0210", "0210"])
+
+    def test_skip_index_and_dest_clip(self):
+        dest = displayio.Bitmap(4, 2, 4)
+        dest.fill(3)
+        bitmaptools.rotozoom(
+            dest, self.src, dest_clip0=(0, 0), dest_clip1=(2, 2),
+            skip_index=1,
+        )
+        self.assertEqual(_rows(dest), ["3333", "2233"])
+
+
+class TestArrayBlit(unittest.TestCase):
+
+    def test_copies_buffer(self):
+        b = displayio.Bitmap(4, 3, 4)
+        bitmaptools.arrayblit(b, bytes([1, 2, 3, 3, 2, 1]), 1, 1, 4, 3)
+        self.assertEqual(_rows(b), ["0000", "0123", "0321"])
+
+    def test_skip_index(self):
+        b = displayio.Bitmap(3, 1, 4)
+        b.fill(2)
+        bitmaptools.arrayblit(b, [1, 0, 3], skip_index=0)
+        self.assertEqual(_rows(b), ["123"])
+
+    def test_short_data(self):
+        b = displayio.Bitmap(3, 2, 2)
+        with self.assertRaises(ValueError):
+            bitmaptools.arrayblit(b, bytes(5))
+
+
+class TestBoundaryFill(unittest.TestCase):
+
+    def test_fills_enclosed_area_only(self):
+        b = displayio.Bitmap(6, 5, 4)
+        bitmaptools.fill_region(b, 0, 2, 6, 3, 1)
+        bitmaptools.boundary_fill(b, 4, 0, 2)
+        self.assertEqual(_rows(b), [
+            "222222", "222222", "111111", "000000", "000000",
+        ])
+
+    def test_follows_concave_shapes(self):
+        b = displayio.Bitmap(5, 4, 4)
+        for x, y in ((1, 0), (1, 1), (1, 2), (3, 1), (3, 2), (3, 3)):
+            b[x, y] = 1
+        bitmaptools.boundary_fill(b, 0, 0, 2, 0)
+        self.assertEqual(_rows(b), ["21222", "21212", "21212", "22212"])
+
+    def test_sixteen_bit(self):
+        b = displayio.Bitmap(3, 2, 1000)
+        b[1, 0] = 999
+        b[1, 1] = 999
+        bitmaptools.boundary_fill(b, 0, 0, 500)
+        self.assertEqual(
+            [b[x, y] for y in range(2) for x in range(3)],
+            [500, 999, 0, 500, 999, 0],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
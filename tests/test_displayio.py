@@ -2,13 +2,22 @@
 Unit tests for the pure-Python parts of displayio.py.
 
 These tests exercise Palette, Bitmap, TileGrid, and Group entirely in
-standard CPython – no Pyodide or JS required.  Display.refresh() is not
-tested here because it relies on the Pyodide js bridge.
+standard CPython – no Pyodide or JS required.  Display.refresh() is
+exercised with the canvas upload (the only Pyodide js bridge call)
+replaced by a recorder.
 """
 
+import asyncio
+import gc
+import io
 import os
+import struct
 import sys
+import time
+import types
 import unittest
+import zlib
+from unittest import mock
 
 # Locate the module one directory above this file.
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
@@ -16,6 +25,12 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 import displayio
 
 
+def _use_backend(test, name):
+    """Select render backend *name* for the rest of *test*."""
+    test.addCleanup(displayio.set_render_backend, displayio.get_render_backend())
+    displayio.set_render_backend(name)
+
+
 # ---------------------------------------------------------------------------
 # Palette
 # ---------------------------------------------------------------------------
@@ -117,6 +132,90 @@ class TestBitmap(unittest.TestCase):
         self.assertEqual(b[0, 0], 1)
 
 
+class TestBitmapStorage(unittest.TestCase):
+
+    def test_bits_follow_value_count(self):
+        for value_count, bits in ((2, 1), (3, 2), (16, 4), (17, 8),
+                                  (256, 8), (257, 16), (65536, 16)):
+            b = displayio.Bitmap(8, 2, value_count)
+            self.assertEqual(b.bits_per_value, bits)
+
+    def test_packed_storage_is_smaller(self):
+        self.assertEqual(len(displayio.Bitmap(320, 240, 2)._data), 9600)
+        self.assertEqual(len(displayio.Bitmap(320, 240, 256)._data), 76800)
+
+    def test_value_count_out_of_range(self):
+        with self.assertRaises(ValueError):
+            displayio.Bitmap(4, 4, 65537)
+
+    def test_get_and_set_every_depth(self):
+        # Odd width exercises the padding at the end of packed rows.
+        for value_count in (2, 4, 16, 256, 65536):
+            b = displayio.Bitmap(7, 3, value_count)
+            for y in range(3):
+                for x in range(7):
+                    b[x, y] = (x * 5 + y * 3) % value_count
+            for y in range(3):
+                for x in range(7):
+                    self.assertEqual(b[x, y], (x * 5 + y * 3) % value_count)
+
+    def test_value_too_large_for_depth(self):
+        b = displayio.Bitmap(4, 4, 4)
+        with self.assertRaises(ValueError):
+            b[0, 0] = 4
+
+    def test_out_of_bounds(self):
+        b = displayio.Bitmap(4, 4, 2)
+        with self.assertRaises(IndexError):
+            b[4, 0] = 1
+        with self.assertRaises(IndexError):
+            b[16]
+
+    def test_negative_linear_index(self):
+        b = displayio.Bitmap(4, 4, 2)
+        b[-1] = 1
+        self.assertEqual(b[3, 3], 1)
+
+    def test_fill_packed(self):
+        b = displayio.Bitmap(5, 2, 4)
+        b.fill(2)
+        self.assertEqual(list(b._get_row(1, 0, 5)), [2] * 5)
+        self.assertEqual(b._changed_area(0), (0, 0, 5, 2))
+
+    def test_row_access(self):
+        b = displayio.Bitmap(9, 2, 16)
+        b._set_row(1, 2, bytes([1, 2, 3, 4, 5]))
+        self.assertEqual(list(b._get_row(1, 0, 9)), [0, 0, 1, 2, 3, 4, 5, 0, 0])
+        self.assertEqual(list(b._get_row(1, 3, 5)), [2, 3])
+        self.assertEqual(b[6, 1], 5)
+        self.assertEqual(b._changed_area(0), (2, 1, 7, 2))
+
+    def test_sixteen_bit_values_render(self):
+        palette = displayio.Palette(300)
+        palette[299] = 0x123456
+        b = displayio.Bitmap(2, 1, 300)
+        b[1, 0] = 299
+        pixels = bytearray(2 * 4)
+        displayio.TileGrid(b, pixel_shader=palette)._render_to_buffer(
+            pixels, 2, 1, 0, 0
+        )
+        self.assertEqual(bytes(pixels), b"\x00\x00\x00\xff\x12\x34\x56\xff")
+
+    def test_packed_scaled_render_matches_byte_storage(self):
+        palette = displayio.Palette(2)
+        palette[1] = 0xFFFFFF
+        palette.make_transparent(0)
+        renders = []
+        for value_count in (2, 256):
+            b = displayio.Bitmap(11, 3, value_count)
+            for x in range(0, 11, 3):
+                b[x, 1] = 1
+            group = displayio.Group(scale=2)
+            group.append(displayio.TileGrid(b, pixel_shader=palette))
+            renders.append(_full_render(group, 22, 6))
+        self.assertEqual(renders[0], renders[1])
+
+
 # ---------------------------------------------------------------------------
 # TileGrid._render_to_buffer  (pure Python)
 # ---------------------------------------------------------------------------
@@ -234,6 +333,119 @@ class TestTileGrid(unittest.TestCase):
         self.assertEqual(pixels[4], 0x00)  # R of pixel (1,0)
         self.assertEqual(pixels[6], 0xFF)  # B of pixel (1,0)
 
+    def test_transparent_runs_leave_background(self):
+        palette = displayio.Palette(2)
+        palette[1] = 0x00FF00
+        palette.make_transparent(0)
+        bitmap = displayio.Bitmap(5, 1, 2)
+        for x in (0, 2, 3):
+            bitmap[x, 0] = 1
+        tg = displayio.TileGrid(bitmap, pixel_shader=palette, x=1)
+        pixels = bytearray(b"\x07" * (10 * 10 * 4))
+        tg._render_to_buffer(pixels, 10, 10, 0, 0)
+        row = [tuple(pixels[x * 4:x * 4 + 4]) for x in range(7)]
+        green, bg = (0, 0xFF, 0, 0xFF), (7, 7, 7, 7)
+        self.assertEqual(row, [bg, green, bg, green, green, bg, bg])
+
+    def test_palette_change_after_render(self):
+        tg = _make_solid_tilegrid(0xFF0000, w=1, h=1)
+        pixels = self._buf()
+        tg._render_to_buffer(pixels, 10, 10, 0, 0)
+        tg.pixel_shader[0] = 0x0000FF
+        tg._render_to_buffer(pixels, 10, 10, 0, 0)
+        self.assertEqual(tuple(pixels[0:4]), (0, 0, 0xFF, 0xFF))
+
+    def test_full_width_block(self):
+        tg = _make_solid_tilegrid(0x123456, w=10, h=3, y=2)
+        pixels = self._buf()
+        tg._render_to_buffer(pixels, 10, 10, 0, 0)
+        self.assertEqual(pixels[:2 * 40], bytearray(2 * 40))
+        self.assertEqual(pixels[2 * 40:5 * 40], bytes([0x12, 0x34, 0x56, 0xFF]) * 30)
+        self.assertEqual(pixels[5 * 40:], bytearray(5 * 40))
+
+
+# ---------------------------------------------------------------------------
+# Multi-tile TileGrid
+# ---------------------------------------------------------------------------
+
+def _tile_sheet():
+    """A 4x2 bitmap holding two 2x2 tiles: 0 = solid red, 1 = blue with a
+    transparent top-left pixel."""
+    palette = displayio.Palette(3)
+    palette[0] = 0xFF0000
+    palette[1] = 0x0000FF
+    palette.make_transparent(2)
+    bitmap = displayio.Bitmap(4, 2, 3)
+    for y in range(2):
+        for x in range(2, 4):
+            bitmap[x, y] = 1
+    bitmap[2, 0] = 2
+    return bitmap, palette
+
+
+class TestTileGridTiles(unittest.TestCase):
+
+    def _grid(self, **kwargs):
+        bitmap, palette = _tile_sheet()
+        return displayio.TileGrid(
+            bitmap, pixel_shader=palette, width=3, height=1,
+            tile_width=2, tile_height=2, **kwargs
+        )
+
+    def test_properties_and_default_tile(self):
+        tg = self._grid(default_tile=1)
+        self.assertEqual((tg.width, tg.height), (3, 1))
+        self.assertEqual((tg.tile_width, tg.tile_height), (2, 2))
+        self.assertEqual([tg[i] for i in range(3)], [1, 1, 1])
+
+    def test_set_and_render_tiles(self):
+        tg = self._grid()
+        tg[1, 0] = 1
+        pixels = bytearray(6 * 2 * 4)
+        tg._render_to_buffer(pixels, 6, 2, 0, 0)
+        self.assertEqual(tg[1], 1)
+        self.assertEqual(_pixel_grid(pixels, 6, 2), ["RR.BRR", "RRBBRR"])
+
+    def test_scaled_and_clipped_tiles(self):
+        tg = self._grid(x=-1)
+        tg[0, 0] = 1
+        g = displayio.Group(scale=2)
+        g.append(tg)
+        pixels = bytearray(6 * 4 * 4)
+        g._render_to_buffer(pixels, 6, 4, 0, 0)
+        self.assertEqual(_pixel_grid(pixels, 6, 4), [
+            "BBRRRR", "BBRRRR", "BBRRRR", "BBRRRR",
+        ])
+
+    def test_repeated_tiles_share_cache(self):
+        _use_backend(self, "python")
+        tg = self._grid()
+        tg._render_to_buffer(bytearray(6 * 2 * 4), 6, 2, 0, 0)
+        self.assertEqual(list(tg._tile_cache[1]), [(0, 1)])
+        tg.pixel_shader[0] = 0x00FF00
+        pixels = bytearray(6 * 2 * 4)
+        tg._render_to_buffer(pixels, 6, 2, 0, 0)
+        self.assertEqual(tuple(pixels[0:4]), (0, 0xFF, 0, 0xFF))
+
+    def test_tile_change_damages_cell(self):
+        tg = self._grid()
+        display = _RecordingDisplay()
+        display.show(tg)
+        display.refresh()
+        tg[2, 0] = 1
+        display.refresh()
+        self.assertEqual(display.uploads[-1], [(4, 0, 6, 2)])
+        self.assertEqual(display._buffer, _full_render(tg))
+
+    def test_invalid_tiles(self):
+        bitmap, palette = _tile_sheet()
+        with self.assertRaises(ValueError):
+            displayio.TileGrid(bitmap, pixel_shader=palette, tile_width=3)
+        tg = self._grid()
+        with self.assertRaises(ValueError):
+            tg[0, 0] = 2
+        with self.assertRaises(IndexError):
+            tg[3, 0] = 0
 
 # ---------------------------------------------------------------------------
 # Group._render_to_buffer  (pure Python)
@@ -340,5 +552,1107 @@ class TestGroup(unittest.TestCase):
         self.assertEqual(pixels[2], 0xFF)    # B
 
 
+# ---------------------------------------------------------------------------
+# Group bounding boxes and off-screen culling
+# ---------------------------------------------------------------------------
+
+class TestGroupBounds(unittest.TestCase):
+
+    def setUp(self):
+        self.tg = _make_solid_tilegrid(0xFF0000, w=2, h=3, x=1, y=1)
+        self.inner = displayio.Group(x=10, y=20)
+        self.inner.append(self.tg)
+        self.outer = displayio.Group()
+        self.outer.append(self.inner)
+
+    def test_bounds_union_of_children(self):
+        self.inner.append(_make_solid_tilegrid(0, w=1, h=1, x=5, y=0))
+        self.assertEqual(self.inner._content_bounds(), (1, 0, 6, 4))
+        self.assertEqual(self.outer._content_bounds(), (11, 20, 16, 24))
+
+    def test_child_move_invalidates_ancestors(self):
+        self.assertEqual(self.outer._content_bounds(), (11, 21, 13, 24))
+        self.tg.x = 4
+        self.assertEqual(self.outer._content_bounds(), (14, 21, 16, 24))
+
+    def test_group_move_keeps_own_bounds(self):
+        self.outer._content_bounds()
+        self.inner.x = 0
+        self.assertTrue(self.inner._bounds_valid)
+        self.assertFalse(self.outer._bounds_valid)
+        self.assertEqual(self.outer._content_bounds(), (1, 21, 3, 24))
+
+    def test_hidden_and_removed_children_excluded(self):
+        self.tg.hidden = True
+        self.assertIsNone(self.outer._content_bounds())
+        self.tg.hidden = False
+        self.inner.remove(self.tg)
+        self.assertIsNone(self.outer._content_bounds())
+        self.assertEqual(self.tg._parents, [])
+
+    def test_offscreen_subtree_not_visited(self):
+        self.inner.x = 100
+        visited = []
+        self.tg._collect_layers = lambda *args: visited.append(args)
+        layers = []
+        self.outer._collect_layers(layers, 0, 0, (0, 0, 10, 10))
+        self.assertEqual((layers, visited), ([], []))
+
+    def test_display_damages_layer_scrolled_offscreen(self):
+        display = _RecordingDisplay(width=40, height=40)
+        display.show(self.outer)
+        display.refresh()
+        self.inner.x = 100
+        display.refresh()
+        self.assertEqual(display.uploads[-1], [(11, 21, 13, 24)])
+        self.assertEqual(sum(display._buffer), 0)
+
+# ---------------------------------------------------------------------------
+# Group.scale
+# ---------------------------------------------------------------------------
+
+def _pixel_grid(pixels, w, h):
+    """Return rows of 'R'/'B'/'.' describing red, blue and empty pixels."""
+    names = {(0xFF, 0, 0): "R", (0, 0, 0xFF): "B", (0, 0, 0): "."}
+    return [
+        "".join(
+            names[tuple(pixels[(y * w + x) * 4:(y * w + x) * 4 + 3])]
+            for x in range(w)
+        )
+        for y in range(h)
+    ]
+
+
+class TestGroupScale(unittest.TestCase):
+
+    def _checker(self):
+        palette = displayio.Palette(2)
+        palette[0] = 0xFF0000
+        palette[1] = 0x0000FF
+        bitmap = displayio.Bitmap(2, 2, 2)
+        bitmap[1, 0] = 1
+        bitmap[0, 1] = 1
+        return displayio.TileGrid(bitmap, pixel_shader=palette, x=1, y=0)
+
+    def test_scale_replicates_pixels(self):
+        g = displayio.Group(scale=2, x=1)
+        g.append(self._checker())
+        pixels = bytearray(8 * 4 * 4)
+        g._render_to_buffer(pixels, 8, 4, 0, 0)
+        self.assertEqual(_pixel_grid(pixels, 8, 4), [
+            "...RRBB.",
+            "...RRBB.",
+            "...BBRR.",
+            "...BBRR.",
+        ])
+
+    def test_nested_scales_multiply(self):
+        inner = displayio.Group(scale=2, x=1)
+        inner.append(_make_solid_tilegrid(0xFF0000, w=1, h=1))
+        outer = displayio.Group(scale=2)
+        outer.append(inner)
+        pixels = bytearray(8 * 8 * 4)
+        outer._render_to_buffer(pixels, 8, 8, 0, 0)
+        self.assertEqual(_pixel_grid(pixels, 8, 4)[0], "..RRRR..")
+        self.assertEqual(outer._content_bounds(), (1, 0, 3, 2))
+
+    def test_scaled_clipping(self):
+        g = displayio.Group(scale=3, x=-4, y=-1)
+        g.append(self._checker())
+        pixels = bytearray(4 * 4 * 4)
+        g._render_to_buffer(pixels, 4, 4, 0, 0)
+        self.assertEqual(_pixel_grid(pixels, 4, 4), [
+            "RRBB",
+            "RRBB",
+            "BBRR",
+            "BBRR",
+        ])
+
+    def test_transparent_scaled(self):
+        tg = self._checker()
+        tg.pixel_shader.make_transparent(0)
+        g = displayio.Group(scale=2)
+        g.append(tg)
+        pixels = bytearray(6 * 2 * 4)
+        g._render_to_buffer(pixels, 6, 2, 0, 0)
+        self.assertEqual(_pixel_grid(pixels, 6, 2), ["....BB", "....BB"])
+
+    def test_invalid_scale(self):
+        with self.assertRaises(ValueError):
+            displayio.Group(scale=0)
+        with self.assertRaises(ValueError):
+            displayio.Group().scale = 1.5
+
+    def test_scaled_bitmap_change_damages_scaled_area(self):
+        tg = self._checker()
+        g = displayio.Group(scale=2)
+        g.append(tg)
+        display = _RecordingDisplay()
+        display.show(g)
+        display.refresh()
+        tg.bitmap[0, 1] = 0
+        display.refresh()
+        self.assertEqual(display.uploads[-1], [(2, 2, 4, 4)])
+        self.assertEqual(display._buffer, _full_render(g))
+
+# ---------------------------------------------------------------------------
+# Occlusion culling
+# ---------------------------------------------------------------------------
+
+def _record_draws(layer):
+    """Wrap *layer*._draw so the clip areas it is asked to paint are kept."""
+    clips = []
+    draw = layer._draw
+
+    def recording_draw(pixels, buf_width, x, y, clip, scale=1):
+        clips.append(clip)
+        draw(pixels, buf_width, x, y, clip, scale)
+
+    layer._draw = recording_draw
+    return clips
+
+
+class TestOcclusion(unittest.TestCase):
+
+    def _scene(self, top):
+        bottom = _make_solid_tilegrid(0xFF0000, w=64, h=64)
+        group = displayio.Group()
+        group.append(bottom)
+        group.append(top)
+        return group, _record_draws(bottom)
+
+    def test_opaque_layer_hides_region_below(self):
+        top = _make_solid_tilegrid(0x0000FF, w=64, h=32)
+        group, clips = self._scene(top)
+        pixels = bytearray(64 * 64 * 4)
+        group._render_to_buffer(pixels, 64, 64, 0, 0)
+        self.assertEqual(clips, [(0, 32, 64, 64)])
+        self.assertEqual(pixels[2], 0xFF)                 # blue on top
+        self.assertEqual(pixels[(40 * 64) * 4], 0xFF)     # red below it
+
+    def test_fully_covered_layer_not_drawn(self):
+        top = _make_solid_tilegrid(0x0000FF, w=64, h=64)
+        group, clips = self._scene(top)
+        group._render_to_buffer(bytearray(64 * 64 * 4), 64, 64, 0, 0)
+        self.assertEqual(clips, [])
+
+    def test_transparent_layer_does_not_occlude(self):
+        top = _make_solid_tilegrid(0x0000FF, w=64, h=64)
+        top.pixel_shader.make_transparent(0)
+        group, clips = self._scene(top)
+        group._render_to_buffer(bytearray(64 * 64 * 4), 64, 64, 0, 0)
+        self.assertEqual(clips, [(0, 0, 64, 64)])
+
+    def test_unused_transparent_entry_still_occludes(self):
+        palette = displayio.Palette(2)
+        palette.make_transparent(1)
+        bitmap = displayio.Bitmap(64, 64, 2)
+        top = displayio.TileGrid(bitmap, pixel_shader=palette)
+        group, clips = self._scene(top)
+        group._render_to_buffer(bytearray(64 * 64 * 4), 64, 64, 0, 0)
+        self.assertEqual(clips, [])
+        bitmap[5, 5] = 1
+        group._render_to_buffer(bytearray(64 * 64 * 4), 64, 64, 0, 0)
+        self.assertEqual(clips, [(0, 0, 64, 64)])
+
+    def test_out_of_range_values_paint_opaque_black(self):
+        # Every draw path paints what _opaque_area promises, so the
+        # culled layer below never shows through.
+        backends = ["python"] + (["numpy"] if displayio._numpy else [])
+        for backend, (width, height) in [
+                (b, size) for b in backends
+                for size in ((1, 1), (2, 2))]:
+            with self.subTest(backend=backend, tiles=width * height):
+                _use_backend(self, backend)
+                palette = displayio.Palette(2)
+                bitmap = displayio.Bitmap(64 // width, 64 // height, 4)
+                bitmap.fill(3)
+                top = displayio.TileGrid(
+                    bitmap, pixel_shader=palette, width=width,
+                    height=height,
+                )
+                group, _ = self._scene(top)
+                pixels = bytearray(64 * 64 * 4)
+                group._render_to_buffer(pixels, 64, 64, 0, 0)
+                self.assertEqual(pixels, b"\x00\x00\x00\xff" * 64 * 64)
+
+    def test_nested_groups_occlude_across_levels(self):
+        bottom = _make_solid_tilegrid(0xFF0000, w=64, h=64)
+        clips = _record_draws(bottom)
+        inner = displayio.Group(x=0, y=32)
+        inner.append(_make_solid_tilegrid(0x00FF00, w=64, h=32))
+        group = displayio.Group()
+        group.append(bottom)
+        group.append(inner)
+        group._render_to_buffer(bytearray(64 * 64 * 4), 64, 64, 0, 0)
+        self.assertEqual(clips, [(0, 0, 64, 32)])
+
+# ---------------------------------------------------------------------------
+# Display dirty-rectangle tracking  (pure Python; canvas upload recorded)
+# ---------------------------------------------------------------------------
+
+class _RecordingDisplay(displayio.Display):
+    """Display whose canvas upload just records the uploaded areas."""
+
+    def __init__(self, width=10, height=10):
+        canvas = types.SimpleNamespace(width=width, height=height)
+        super().__init__(canvas, auto_refresh=False)
+        self.uploads = []
+
+    def _present(self, areas):
+        self.uploads.append(list(areas))
+
+
+def _full_render(group, w=10, h=10):
+    pixels = bytearray(w * h * 4)
+    group._render_to_buffer(pixels, w, h, 0, 0)
+    return pixels
+
+
+class TestDisplayDamage(unittest.TestCase):
+
+    def setUp(self):
+        self.display = _RecordingDisplay()
+        self.group = displayio.Group()
+        self.tg = _make_solid_tilegrid(0xFF0000, w=2, h=2, x=1, y=1)
+        self.group.append(self.tg)
+        self.display.show(self.group)
+        self.display.refresh()
+
+    def assertUploaded(self, areas):
+        self.assertEqual(self.display.uploads[-1], areas)
+        self.assertEqual(self.display._buffer, _full_render(self.group))
+
+    def test_first_refresh_is_full_screen(self):
+        self.assertUploaded([(0, 0, 10, 10)])
+
+    def test_no_change_uploads_nothing(self):
+        count = len(self.display.uploads)
+        self.display.refresh()
+        self.assertEqual(len(self.display.uploads), count)
+
+    def test_bitmap_pixel_damages_one_pixel(self):
+        self.tg.bitmap[1, 0] = 0
+        self.display.refresh()
+        self.assertUploaded([(2, 1, 3, 2)])
+
+    def test_move_damages_old_and_new_area(self):
+        self.tg.x = 6
+        self.display.refresh()
+        self.assertEqual(
+            sorted(self.display.uploads[-1]), [(1, 1, 3, 3), (6, 1, 8, 3)]
+        )
+        self.assertEqual(self.display._buffer, _full_render(self.group))
+
+    def test_palette_change_damages_whole_tilegrid(self):
+        self.tg.pixel_shader[0] = 0x00FF00
+        self.display.refresh()
+        self.assertUploaded([(1, 1, 3, 3)])
+
+    def test_palette_swap_damages_whole_tilegrid(self):
+        green = displayio.Palette(1)
+        green[0] = 0x00FF00
+        self.assertEqual(green._version, self.tg.pixel_shader._version)
+        self.tg.pixel_shader = green
+        self.display.refresh()
+        self.assertUploaded([(1, 1, 3, 3)])
+        off = (1 * 10 + 1) * 4
+        self.assertEqual(
+            bytes(self.display._buffer[off:off + 4]), b"\x00\xff\x00\xff"
+        )
+
+    def test_bitmap_swap_damages_old_and_new_size(self):
+        bitmap = displayio.Bitmap(3, 1, 2)
+        bitmap.fill(0)
+        bitmap[2, 0] = 1
+        self.tg.bitmap = bitmap
+        self.assertEqual(self.tg.tile_width, 3)
+        self.display.refresh()
+        self.assertUploaded([(1, 1, 4, 3)])
+
+    def test_bitmap_swap_checks_tile_size(self):
+        grid = displayio.TileGrid(
+            displayio.Bitmap(4, 2, 2), pixel_shader=displayio.Palette(2),
+            width=2, tile_width=2,
+        )
+        with self.assertRaises(ValueError):
+            grid.bitmap = displayio.Bitmap(3, 2, 2)
+        grid.bitmap = displayio.Bitmap(2, 4, 2)
+        self.assertEqual((grid.tile_width, grid.tile_height), (2, 2))
+
+    def test_bitmap_swap_to_larger_sheet(self):
+        grid = displayio.TileGrid(
+            displayio.Bitmap(4, 2, 2), pixel_shader=displayio.Palette(2),
+            width=2, tile_width=2,
+        )
+        grid[1, 0] = 1
+        grid.bitmap = displayio.Bitmap(2 * 300, 2, 2)
+        grid[0, 0] = 299
+        self.assertEqual((grid[0, 0], grid[1, 0]), (299, 1))
+
+    def test_remove_damages_old_area(self):
+        self.group.remove(self.tg)
+        self.display.refresh()
+        self.assertUploaded([(1, 1, 3, 3)])
+        self.assertEqual(sum(self.display._buffer), 0)
+
+    def test_hidden_group_damages_children(self):
+        self.group.hidden = True
+        self.display.refresh()
+        self.assertUploaded([(1, 1, 3, 3)])
+
+    def test_insert_below_repaints_overlap(self):
+        below = _make_solid_tilegrid(0x0000FF, w=4, h=1, x=0, y=1)
+        self.group.insert(0, below)
+        self.display.refresh()
+        self.assertUploaded([(0, 1, 4, 2)])
+        off = (1 * 10 + 1) * 4
+        self.assertEqual(self.display._buffer[off], 0xFF)  # red stays on top
+
+    def test_canvas_resize_reallocates_and_redraws(self):
+        self.display._canvas.width = 12
+        self.display.refresh()
+        self.assertEqual(self.display.width, 12)
+        self.assertEqual(len(self.display._buffer), 12 * 10 * 4)
+        self.assertEqual(self.display.uploads[-1], [(0, 0, 12, 10)])
+
+
+class TestDrawList(unittest.TestCase):
+
+    def setUp(self):
+        self.display = _RecordingDisplay()
+        self.group = displayio.Group()
+        self.inner = displayio.Group(x=1)
+        self.tg = _make_solid_tilegrid(0xFF0000, w=2, h=2, x=1, y=1)
+        self.inner.append(self.tg)
+        self.group.append(self.inner)
+        self.display.show(self.group)
+        self.display.refresh()
+        self.walks = 0
+        collect = self.group._collect_layers
+
+        def counting(*args):
+            self.walks += 1
+            return collect(*args)
+
+        self.group._collect_layers = counting
+
+    def test_unchanged_layout_skips_traversal(self):
+        self.display.refresh()
+        self.tg.bitmap[0, 0] = 0
+        self.display.refresh()
+        self.assertEqual(self.walks, 0)
+        self.assertEqual(self.display.uploads[-1], [(2, 1, 3, 2)])
+        self.assertEqual(self.display._buffer, _full_render(self.group))
+
+    def test_move_recompiles(self):
+        self.inner.x = 3
+        self.display.refresh()
+        self.assertEqual(self.walks, 1)
+        self.assertEqual(self.display._drawn[id(self.tg)][1:3], (4, 1))
+        self.display.refresh()
+        self.assertEqual(self.walks, 1)
+
+    def test_structure_change_recompiles(self):
+        other = _make_solid_tilegrid(0x0000FF, w=1, h=1, x=8, y=8)
+        self.inner.append(other)
+        self.display.refresh()
+        self.assertEqual(self.walks, 1)
+        self.assertIn(id(other), self.display._drawn)
+        self.assertEqual(self.display.uploads[-1], [(9, 8, 10, 9)])
+
+    def test_layer_shown_twice_always_traverses(self):
+        self.group.append(self.tg)
+        self.display.refresh()
+        self.display.refresh()
+        self.assertEqual(self.walks, 2)
+
+
+class TestGroupCache(unittest.TestCase):
+
+    def _scene(self, cache):
+        """A cached (or plain) panel: an opaque frame, a part-transparent
+        tilegrid on top and a nested group, inside a scaled root."""
+        root = displayio.Group(scale=2)
+        panel = displayio.Group(x=1, y=1, cache=cache)
+        panel.append(_make_solid_tilegrid(0x0000FF, w=3, h=3))
+        palette = displayio.Palette(2)
+        palette[1] = 0xFF0000
+        palette.make_transparent(0)
+        bitmap = displayio.Bitmap(2, 2, 2)
+        bitmap[0, 0] = 1
+        inner = displayio.Group(x=1, y=1)
+        inner.append(displayio.TileGrid(bitmap, pixel_shader=palette))
+        panel.append(inner)
+        root.append(panel)
+        return root, panel, inner, bitmap
+
+    def _display(self, cache):
+        display = _RecordingDisplay()
+        root, panel, inner, bitmap = self._scene(cache)
+        display.show(root)
+        display.refresh()
+        return display, root, panel, inner, bitmap
+
+    def assertMatchesUncached(self, display, change):
+        reference, *parts = self._display(False)
+        change(*parts[1:])
+        reference.refresh()
+        self.assertEqual(display._buffer, reference._buffer)
+
+    def test_renders_like_uncached_group(self):
+        cached, *_ = self._display(True)
+        plain, *_ = self._display(False)
+        self.assertEqual(cached._buffer, plain._buffer)
+
+    def test_subtree_drawn_as_one_layer(self):
+        display, *_ = self._display(True)
+        self.assertEqual(len(display._drawn), 1)
+        layer = next(iter(display._drawn.values()))
+        self.assertEqual(layer[4], (2, 2, 8, 8))
+
+    def test_bitmap_change_repaints_changed_area(self):
+        display, root, panel, inner, bitmap = self._display(True)
+        cache = panel._cache
+        pixels = cache._pixels
+        bitmap[1, 1] = 1
+        display.refresh()
+        self.assertIs(cache._pixels, pixels)
+        self.assertEqual(display.uploads[-1], [(6, 6, 8, 8)])
+        self.assertMatchesUncached(
+            display, lambda panel, inner, bitmap: bitmap.__setitem__((1, 1), 1)
+        )
+
+    def test_child_move_rebuilds_cache(self):
+        display, root, panel, inner, bitmap = self._display(True)
+        inner.x = 2
+        display.refresh()
+        self.assertEqual(display.uploads[-1], [(2, 2, 10, 8)])
+        self.assertMatchesUncached(
+            display, lambda panel, inner, bitmap: setattr(inner, "x", 2)
+        )
+
+    def test_no_change_reuses_cache(self):
+        display, root, panel, inner, bitmap = self._display(True)
+        version = panel._cache._version
+        display.refresh()
+        self.assertEqual(panel._cache._version, version)
+        self.assertEqual(len(display.uploads), 1)
+
+    def test_opaque_cache_occludes(self):
+        display, root, panel, inner, bitmap = self._display(True)
+        self.assertEqual(panel._cache._opaque_area(2, 2), (2, 2, 8, 8))
+        panel.pop(0)
+        display.refresh()
+        self.assertIsNone(panel._cache._opaque_area(4, 4))
+
+    def test_disable_cache(self):
+        display, root, panel, inner, bitmap = self._display(True)
+        panel.cache = False
+        self.assertFalse(panel.cache)
+        display.refresh()
+        self.assertEqual(len(display._drawn), 2)
+        self.assertMatchesUncached(display, lambda *parts: None)
+
+
+# ---------------------------------------------------------------------------
+# Render backends
+# ---------------------------------------------------------------------------
+
+class TestRenderBackend(unittest.TestCase):
+
+    def test_select_python(self):
+        _use_backend(self, "python")
+        self.assertEqual(displayio.get_render_backend(), "python")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            displayio.set_render_backend("opengl")
+
+    def test_numpy_unavailable(self):
+        with mock.patch.object(displayio, "_numpy", None):
+            with self.assertRaises(ValueError):
+                displayio.set_render_backend("numpy")
+
+
+@unittest.skipIf(displayio._numpy is None, "NumPy is not installed")
+class TestNumpyBackend(unittest.TestCase):
+    """The NumPy backend must produce byte-identical framebuffers."""
+
+    def _render_both(self, build, w=24, h=16):
+        frames = []
+        for name in ("python", "numpy"):
+            _use_backend(self, name)
+            pixels = bytearray(b"\x11" * (w * h * 4))
+            build()._render_to_buffer(pixels, w, h, 0, 0)
+            frames.append(pixels)
+        self.assertEqual(frames[0], frames[1])
+
+    def _bitmap(self, value_count, w, h, seed):
+        bitmap = displayio.Bitmap(w, h, value_count)
+        for i in range(w * h):
+            bitmap[i] = (i * 7 + seed) * 31 % value_count
+        return bitmap
+
+    def _palette(self, n, transparent=()):
+        palette = displayio.Palette(n)
+        for i in range(n):
+            palette[i] = (i * 0x3F1D27) & 0xFFFFFF
+        for i in transparent:
+            palette.make_transparent(i)
+        return palette
+
+    def test_every_depth_scale_and_clip(self):
+        for value_count in (2, 4, 16, 256, 300):
+            for scale in (1, 2, 3):
+                for transparent in ((), (1,)):
+                    def build():
+                        group = displayio.Group(scale=scale, x=-3, y=-2)
+                        group.append(displayio.TileGrid(
+                            self._bitmap(value_count, 9, 7, value_count),
+                            pixel_shader=self._palette(
+                                min(value_count, 5), transparent
+                            ),
+                            x=1, y=1,
+                        ))
+                        return group
+                    with self.subTest(value_count=value_count, scale=scale,
+                                      transparent=transparent):
+                        self._render_both(build)
+
+    def test_tile_sheet(self):
+        def build():
+            tg = displayio.TileGrid(
+                self._bitmap(4, 8, 6, 1), pixel_shader=self._palette(3, (0,)),
+                width=5, height=3, tile_width=2, tile_height=3, x=-1,
+            )
+            for i in range(15):
+                tg[i] = i * 5 % 8
+            group = displayio.Group(scale=2)
+            group.append(tg)
+            return group
+        self._render_both(build)
+
+    def test_cached_group_and_display(self):
+        frames = []
+        for name in ("python", "numpy"):
+            _use_backend(self, name)
+            display = displayio.HeadlessDisplay(20, 12, auto_refresh=False)
+            panel = displayio.Group(x=2, y=1, cache=True)
+            bitmap = self._bitmap(4, 6, 5, 3)
+            panel.append(displayio.TileGrid(
+                bitmap, pixel_shader=self._palette(4, (2,)),
+            ))
+            display.show(panel)
+            display.refresh()
+            bitmap[1, 1] = 2
+            panel.x = 5
+            display.refresh()
+            frames.append(bytes(display.framebuffer))
+        self.assertEqual(frames[0], frames[1])
+
+
+# ---------------------------------------------------------------------------
+# Display canvas upload  (Pyodide bridge replaced by stand-ins)
+# ---------------------------------------------------------------------------
+
+class _FakeBufferView:
+    def __init__(self, buffer):
+        self.data = types.SimpleNamespace(byteLength=len(buffer), buffer=buffer)
+        self.released = False
+
+    def release(self):
+        self.released = True
+
+
+class _FakeProxy:
+    def __init__(self, obj):
+        self.obj = obj
+
+    def getBuffer(self, kind):
+        return _FakeBufferView(self.obj)
+
+    def destroy(self):
+        pass
+
+
+class _FakeContext:
+    def __init__(self):
+        self.calls = []
+
+    def putImageData(self, img, dx, dy, x, y, w, h):
+        self.calls.append((img, (x, y, w, h)))
+
+
+class TestDisplayUpload(unittest.TestCase):
+
+    def setUp(self):
+        self.images = []
+
+        def new_image(data, w, h):
+            img = types.SimpleNamespace(data=data, width=w, height=h)
+            self.images.append(img)
+            return img
+
+        js = types.SimpleNamespace(
+            ImageData=types.SimpleNamespace(new=new_image)
+        )
+        ffi = types.SimpleNamespace(create_proxy=_FakeProxy)
+        patcher = mock.patch.dict(sys.modules, {
+            "js": js,
+            "pyodide": types.SimpleNamespace(ffi=ffi),
+            "pyodide.ffi": ffi,
+        })
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.ctx = _FakeContext()
+        self.canvas = types.SimpleNamespace(
+            width=10, height=10, getContext=lambda kind: self.ctx
+        )
+        self.display = displayio.Display(self.canvas, auto_refresh=False)
+
+    def test_image_data_views_framebuffer_and_is_reused(self):
+        tg = _make_solid_tilegrid(0xFF0000, w=2, h=2)
+        group = displayio.Group()
+        group.append(tg)
+        self.display.show(group)
+        self.display.refresh()
+        tg.bitmap[0, 0] = 0
+        tg.pixel_shader[0] = 0x00FF00
+        self.display.refresh()
+        self.assertEqual(len(self.images), 1)
+        self.assertIs(self.images[0].data.buffer, self.display._buffer)
+        self.assertEqual(
+            [rect for _, rect in self.ctx.calls], [(0, 0, 10, 10), (0, 0, 2, 2)]
+        )
+
+    def test_resize_recreates_image_data(self):
+        self.display.show(displayio.Group())
+        self.display.refresh()
+        self.canvas.width = 20
+        self.display.refresh()
+        self.assertEqual(len(self.images), 2)
+        self.assertEqual(self.images[1].width, 20)
+        self.assertIs(self.images[1].data.buffer, self.display._buffer)
+
+
+class TestRefreshScheduling(unittest.TestCase):
+
+    def setUp(self):
+        self.frames = []
+        js = types.SimpleNamespace(requestAnimationFrame=self.frames.append)
+        ffi = types.SimpleNamespace(create_proxy=lambda func: func)
+        patcher = mock.patch.dict(sys.modules, {
+            "js": js,
+            "pyodide": types.SimpleNamespace(ffi=ffi),
+            "pyodide.ffi": ffi,
+        })
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.now = 100.0
+        patcher = mock.patch.object(
+            displayio.time, "monotonic", lambda: self.now
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.display = _RecordingDisplay()
+        self.addCleanup(setattr, self.display, "_auto_refresh", False)
+        self.tg = _make_solid_tilegrid(0xFF0000, w=2, h=2, x=1, y=1)
+        self.group = displayio.Group()
+        self.group.append(self.tg)
+        self.display.show(self.group)
+        self.display.refresh()
+
+    def _run_frames(self):
+        frames = self.frames[:]
+        del self.frames[:]
+        for callback in frames:
+            callback(0.0)
+
+    def test_auto_refresh_draws_changes_once_per_frame(self):
+        self.display.auto_refresh = True
+        self._run_frames()
+        uploads = len(self.display.uploads)
+        self.tg.x = 3
+        self.tg.pixel_shader[0] = 0x00FF00
+        self.tg.bitmap[0, 0] = 0
+        self.assertEqual(len(self.frames), 1)
+        self._run_frames()
+        self.assertEqual(len(self.display.uploads), uploads + 1)
+        self.assertEqual(self.display._buffer, _full_render(self.group))
+        # Idle until the next change.
+        self._run_frames()
+        self.assertEqual(len(self.display.uploads), uploads + 1)
+        self.tg.y = 2
+        self.assertEqual(len(self.frames), 1)
+
+    def test_manual_display_requests_no_frames(self):
+        self.tg.x = 3
+        self.assertEqual(self.frames, [])
+
+    def test_target_frame_rate_defers_refresh(self):
+        self.now += 1
+        self.tg.x = 3
+        self.assertTrue(self.display.refresh(target_frames_per_second=20))
+        uploads = len(self.display.uploads)
+        for x in (4, 5):
+            self.tg.x = x
+            self.assertFalse(
+                self.display.refresh(target_frames_per_second=20)
+            )
+        self.assertEqual(len(self.frames), 1)
+        self.now += 0.02
+        self._run_frames()
+        self.assertEqual(len(self.display.uploads), uploads)
+        self.now += 0.03
+        self._run_frames()
+        self.assertEqual(len(self.display.uploads), uploads + 1)
+        self.assertEqual(self.display._buffer, _full_render(self.group))
+        self.assertEqual(self.frames, [])
+
+    def test_without_target_refreshes_immediately(self):
+        self.tg.x = 3
+        self.assertTrue(self.display.refresh())
+        self.tg.x = 4
+        self.assertTrue(self.display.refresh())
+        self.assertEqual(self.display._buffer, _full_render(self.group))
+
+    def test_minimum_frame_rate(self):
+        self.now += 2
+        with self.assertRaises(RuntimeError):
+            self.display.refresh(
+                target_frames_per_second=30, minimum_frames_per_second=1
+            )
+
+
+class TestAsyncRefresh(unittest.TestCase):
+
+    def setUp(self):
+        self.proxies = []
+
+        def create_proxy(func):
+            self.proxies.append(func)
+            return func
+
+        def request_animation_frame(callback):
+            asyncio.get_running_loop().call_soon(callback, 0.0)
+
+        js = types.SimpleNamespace(
+            requestAnimationFrame=request_animation_frame
+        )
+        ffi = types.SimpleNamespace(create_proxy=create_proxy)
+        patcher = mock.patch.dict(sys.modules, {
+            "js": js,
+            "pyodide": types.SimpleNamespace(ffi=ffi),
+            "pyodide.ffi": ffi,
+        })
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.display = _RecordingDisplay()
+        self.addCleanup(setattr, self.display, "_auto_refresh", False)
+        self.tg = _make_solid_tilegrid(0xFF0000, w=2, h=2, x=1, y=1)
+        self.group = displayio.Group()
+        self.group.append(self.tg)
+        self.display.show(self.group)
+        self.display.refresh()
+
+    def test_next_frame_drives_animation(self):
+        async def animate():
+            self.display.auto_refresh = True
+            for x in range(5):
+                self.tg.x = x
+                self.tg.pixel_shader[0] = 0x100000 * x
+                await self.display.next_frame()
+                self.assertEqual(
+                    self.display._buffer, _full_render(self.group)
+                )
+
+        asyncio.run(animate())
+        # One long-lived proxy serves every frame.
+        self.assertEqual(len(self.proxies), 1)
+
+    def test_refresh_async_yields_between_bands(self):
+        patcher = mock.patch.object(displayio, "_ASYNC_CHUNK_PIXELS", 10)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(len(self.display.uploads))
+                await asyncio.sleep(0)
+
+        async def main():
+            ticker = asyncio.create_task(tick())
+            self.tg.x = 0
+            self.display.show(self.group)  # redraw all ten rows
+            refresh = asyncio.create_task(
+                self.display.refresh_async(budget=0)
+            )
+            await asyncio.sleep(0)
+            # Refreshes while it renders wait for the next frame.
+            self.assertFalse(self.display.refresh())
+            self.assertTrue(await refresh)
+            ticker.cancel()
+            await self.display.next_frame()
+
+        uploads = len(self.display.uploads)
+        asyncio.run(main())
+        self.assertGreater(ticks.count(uploads), 1)
+        self.assertEqual(len(self.display.uploads), uploads + 1)
+        self.assertEqual(self.display._buffer, _full_render(self.group))
+        stats = self.display.refresh_stats
+        self.assertEqual(stats["max_slices"], 10)
+
+    def test_progressive_uploads_each_slice(self):
+        patcher = mock.patch.object(displayio, "_ASYNC_CHUNK_PIXELS", 20)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.display.show(self.group)
+        uploads = len(self.display.uploads)
+        asyncio.run(self.display.refresh_async(budget=0, progressive=True))
+        self.assertEqual(
+            self.display.uploads[uploads:],
+            [[(0, y, 10, y + 2)] for y in range(0, 10, 2)],
+        )
+        self.assertEqual(self.display._buffer, _full_render(self.group))
+        self.assertEqual(self.display.refresh_stats["last_slices"], 5)
+
+    def test_budget_groups_bands_into_slices(self):
+        patcher = mock.patch.object(displayio, "_ASYNC_CHUNK_PIXELS", 10)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.display.show(self.group)
+        asyncio.run(self.display.refresh_async(budget=10000))
+        stats = self.display.refresh_stats
+        self.assertEqual(stats["last_slices"], 1)
+        self.assertGreater(stats["frame_ms"], 0)
+
+    def test_refresh_budget_keeps_show_from_blocking(self):
+        patcher = mock.patch.object(displayio, "_ASYNC_CHUNK_PIXELS", 10)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.display.refresh_budget = 0
+        group = displayio.Group()
+        group.append(_make_solid_tilegrid(0x00FF00, w=10, h=10))
+
+        async def main():
+            self.display.auto_refresh = True
+            self.display.show(group)
+            # Nothing is drawn until the event loop runs the refresh.
+            self.assertNotEqual(self.display._buffer, _full_render(group))
+            await self.display._refresh_task
+            self.assertEqual(self.display._buffer, _full_render(group))
+
+        frames = self.display.refresh_stats["frames"]
+        asyncio.run(main())
+        stats = self.display.refresh_stats
+        self.assertEqual(stats["frames"], frames + 1)
+        self.assertEqual(stats["last_slices"], 10)
+
+    def test_cancelled_refresh_redraws(self):
+        patcher = mock.patch.object(displayio, "_ASYNC_CHUNK_PIXELS", 10)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        async def main():
+            self.tg.x = 6
+            self.display.show(self.group)
+            refresh = asyncio.create_task(
+                self.display.refresh_async(budget=0)
+            )
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            refresh.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await refresh
+
+        asyncio.run(main())
+        self.assertTrue(self.display.refresh())
+        self.assertEqual(self.display._buffer, _full_render(self.group))
+
+    def test_swapping_groups_while_rendering(self):
+        patcher = mock.patch.object(displayio, "_ASYNC_CHUNK_PIXELS", 10)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        group = displayio.Group()
+        group.append(_make_solid_tilegrid(0x0000FF, w=3, h=3, x=4, y=2))
+
+        async def main():
+            self.tg.x = 6
+            self.display.show(self.group)
+            refresh = asyncio.create_task(
+                self.display.refresh_async(budget=0)
+            )
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            self.display.root_group = group
+            self.assertTrue(await refresh)
+
+        asyncio.run(main())
+        self.assertTrue(self.display.refresh())
+        self.assertEqual(self.display._buffer, _full_render(group))
+
+
+# ---------------------------------------------------------------------------
+# HeadlessDisplay  (full refresh path under CPython)
+# ---------------------------------------------------------------------------
+
+class TestHeadlessDisplay(unittest.TestCase):
+
+    def setUp(self):
+        self.display = displayio.HeadlessDisplay(4, 3)
+        self.tg = _make_solid_tilegrid(0xFF8000, w=2, h=1, x=1, y=1)
+        self.group = displayio.Group()
+        self.group.append(self.tg)
+
+    def test_show_auto_refreshes(self):
+        self.display.show(self.group)
+        self.assertIs(self.display.root_group, self.group)
+        off = (1 * 4 + 1) * 4
+        self.assertEqual(
+            bytes(self.display.framebuffer[off:off + 4]), b"\xff\x80\x00\xff"
+        )
+
+    def test_manual_refresh_when_auto_refresh_off(self):
+        display = displayio.HeadlessDisplay(4, 3, auto_refresh=False)
+        display.show(self.group)
+        self.assertEqual(sum(display.framebuffer), 0)
+        display.refresh()
+        self.assertEqual(bytes(display.framebuffer), bytes(_full_render(self.group, 4, 3)))
+
+    def test_refresh_picks_up_changes(self):
+        self.display.show(self.group)
+        self.tg.x = 2
+        self.display.refresh()
+        self.assertEqual(bytes(self.display.framebuffer), bytes(_full_render(self.group, 4, 3)))
+
+    def test_timer_refreshes_after_changes(self):
+        self.addCleanup(self.display.close)
+        self.display.show(self.group)
+        self.tg.x = 2
+        self.tg.pixel_shader[0] = 0x0080FF
+        expected = bytes(_full_render(self.group, 4, 3))
+        for _ in range(100):
+            if bytes(self.display.framebuffer) == expected:
+                break
+            time.sleep(0.01)
+        self.assertEqual(bytes(self.display.framebuffer), expected)
+        self.display.close()
+        self.assertFalse(self.display.auto_refresh)
+
+    def test_next_frame_under_asyncio(self):
+        self.addCleanup(self.display.close)
+        self.display.show(self.group)
+
+        async def animate():
+            for x in range(3):
+                self.tg.x = x
+                await self.display.next_frame()
+                self.assertEqual(
+                    bytes(self.display.framebuffer),
+                    bytes(_full_render(self.group, 4, 3)),
+                )
+            waiter = asyncio.ensure_future(self.display.next_frame())
+            await asyncio.sleep(0)
+            self.display.close()
+            with self.assertRaises(asyncio.CancelledError):
+                await waiter
+
+        asyncio.run(animate())
+
+    def test_save_ppm(self):
+        self.display.show(self.group)
+        out = io.BytesIO()
+        self.display.save_ppm(out)
+        data = out.getvalue()
+        header = b"P6\n4 3\n255\n"
+        self.assertTrue(data.startswith(header))
+        rgb = data[len(header):]
+        self.assertEqual(len(rgb), 4 * 3 * 3)
+        self.assertEqual(rgb[(1 * 4 + 1) * 3:(1 * 4 + 1) * 3 + 3], b"\xff\x80\x00")
+        self.assertEqual(rgb[0:3], b"\x00\x00\x00")
+
+    def test_save_png(self):
+        self.display.show(self.group)
+        out = io.BytesIO()
+        self.display.save_png(out)
+        data = out.getvalue()
+        self.assertEqual(data[:8], b"\x89PNG\r\n\x1a\n")
+        width, height = struct.unpack(">II", data[16:24])
+        self.assertEqual((width, height), (4, 3))
+        idat_len = struct.unpack(">I", data[33:37])[0]
+        self.assertEqual(data[37:41], b"IDAT")
+        raw = zlib.decompress(data[41:41 + idat_len])
+        rows = [raw[y * 17 + 1:(y + 1) * 17] for y in range(3)]
+        self.assertEqual(b"".join(rows), bytes(self.display.framebuffer))
+
+
+class TestParallelHeadlessDisplay(unittest.TestCase):
+
+    def _scene(self):
+        palette = displayio.Palette(3)
+        palette[0] = 0x102030
+        palette[1] = 0xF0E0D0
+        palette[2] = 0x00FF00
+        palette.make_transparent(2)
+        bitmap = displayio.Bitmap(40, 30, 3)
+        for i in range(40 * 30):
+            bitmap[i] = i * 7 % 3
+        root = displayio.Group()
+        root.append(displayio.TileGrid(bitmap, pixel_shader=palette))
+        panel = displayio.Group(scale=3, x=17, y=11, cache=True)
+        panel.append(displayio.TileGrid(bitmap, pixel_shader=palette, x=5))
+        root.append(panel)
+        return root, bitmap
+
+    def _frames(self, workers):
+        with displayio.HeadlessDisplay(
+            320, 240, auto_refresh=False, workers=workers
+        ) as display:
+            root, bitmap = self._scene()
+            display.show(root)
+            display.refresh()
+            self.assertEqual(display._pool is not None, workers is not None)
+            frames = [bytes(display.framebuffer)]
+            bitmap[3, 3] = 2
+            display.refresh()
+            frames.append(bytes(display.framebuffer))
+            root.x = 4
+            display.refresh()
+            frames.append(bytes(display.framebuffer))
+            return frames, display
+
+    def test_matches_serial_rendering(self):
+        parallel, display = self._frames(3)
+        serial, _ = self._frames(None)
+        self.assertEqual(parallel, serial)
+        self.assertIsNone(display._pool)
+        self.assertIsNone(display._shared)
+
+    def test_small_damage_renders_in_process(self):
+        display = displayio.HeadlessDisplay(8, 8, workers=2)
+        display.show(_make_solid_tilegrid(0xFF0000))
+        self.assertIsNone(display._pool)
+        display.close()
+
+    def test_unclosed_display_frees_workers(self):
+        from multiprocessing import shared_memory
+
+        display = displayio.HeadlessDisplay(
+            320, 240, auto_refresh=False, workers=2
+        )
+        display.show(self._scene()[0])
+        display.refresh()
+        pool = display._pool
+        name = display._shared.name
+        del display
+        gc.collect()
+        with self.assertRaises(RuntimeError):
+            pool.submit(int)
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
 if __name__ == "__main__":
     unittest.main()
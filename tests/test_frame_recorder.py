@@ -0,0 +1,201 @@
+"""
+Unit tests for frame_recorder.py: delta capture from Display.refresh and
+animated PNG / GIF export.
+"""
+
+import io
+import os
+import struct
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import displayio
+import frame_recorder
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+def _chunks(png):
+    """Yield ``(type, data)`` for each chunk of PNG bytes *png*."""
+    at = 8
+    while at < len(png):
+        (length,) = struct.unpack(">I", png[at:at + 4])
+        yield png[at + 4:at + 8], png[at + 8:at + 8 + length]
+        at += 12 + length
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFrameRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = _Clock()
+        self.display = displayio.HeadlessDisplay(16, 8, auto_refresh=False)
+        self.bitmap = displayio.Bitmap(16, 8, 4)
+        palette = displayio.Palette(4)
+        palette[0] = 0x000000
+        palette[1] = 0xFF0000
+        palette[2] = 0x00FF00
+        palette[3] = 0x0000FF
+        palette.make_transparent(3)
+        group = displayio.Group()
+        group.append(displayio.TileGrid(self.bitmap, pixel_shader=palette))
+        self.display.show(group)
+        self.display.refresh()
+        self.recorder = frame_recorder.FrameRecorder(
+            self.display, clock=self.clock
+        )
+        self.recorder.start()
+
+    def _step(self, changes, seconds=0.5):
+        self.clock.now += seconds
+        for (x, y), value in changes.items():
+            self.bitmap[x, y] = value
+        self.display.refresh()
+        return bytes(self.display.framebuffer)
+
+    def test_delta_trimmed_to_changed_pixels(self):
+        self.bitmap.fill(0)
+        self.bitmap[3, 2] = 1
+        self.bitmap[5, 4] = 1
+        self.display.refresh()
+        (_, rects), = self.recorder._deltas
+        self.assertEqual([rect[:4] for rect in rects], [(3, 2, 6, 5)])
+
+    def test_unchanged_refresh_not_recorded(self):
+        self.bitmap[1, 1] = 1
+        self.bitmap[1, 1] = 0
+        self.display.refresh()
+        self.assertEqual(self.recorder.frame_count, 1)
+
+    def test_frames_replay_deltas(self):
+        expected = [bytes(self.display.framebuffer)]
+        expected.append(self._step({(0, 0): 1, (15, 7): 2}))
+        expected.append(self._step({(8, 3): 3}, seconds=2))
+        self.clock.now += 1
+        self.recorder.stop()
+        frames = list(self.recorder.frames())
+        self.assertEqual([rgba for rgba, _ in frames], expected)
+        self.assertEqual([seconds for _, seconds in frames], [0.5, 2, 1])
+        self.assertEqual(self.recorder.duration, 3.5)
+
+    def test_stop_detaches(self):
+        self.recorder.stop()
+        self._step({(0, 0): 1})
+        self.assertFalse(self.recorder.recording)
+        self.assertEqual(self.recorder.frame_count, 1)
+
+    def test_memory_follows_changes(self):
+        for n in range(200):
+            self._step({(n % 16, 0): 1 + n // 16 % 2})
+        self.recorder.stop()
+        self.assertEqual(self.recorder.frame_count, 201)
+        for _, rects in self.recorder._deltas:
+            self.assertEqual([rect[2] - rect[0] for rect in rects], [1])
+        self.assertLess(self.recorder.nbytes, 201 * 16 * 8 * 4 // 10)
+
+    def test_nothing_recorded(self):
+        recorder = frame_recorder.FrameRecorder(self.display)
+        with self.assertRaises(ValueError):
+            recorder.save_apng(io.BytesIO())
+
+    def test_apng_frames_are_deltas(self):
+        self._step({(4, 1): 1, (6, 2): 2})
+        self._step({(10, 5): 1})
+        self.recorder.stop()
+        out = io.BytesIO()
+        self.recorder.save_apng(out)
+        chunks = list(_chunks(out.getvalue()))
+        kinds = [kind for kind, _ in chunks]
+        self.assertEqual(kinds[:2], [b"IHDR", b"acTL"])
+        self.assertEqual(struct.unpack(">II", chunks[1][1]), (3, 0))
+        controls = [
+            struct.unpack(">IIIIIHHBB", data)
+            for kind, data in chunks if kind == b"fcTL"
+        ]
+        self.assertEqual([c[0] for c in controls], [0, 1, 3])
+        self.assertEqual(
+            [c[1:5] for c in controls],
+            [(16, 8, 0, 0), (3, 2, 4, 1), (1, 1, 10, 5)],
+        )
+        self.assertEqual(controls[1][5:7], (500, 1000))
+        self.assertEqual(kinds.count(b"fdAT"), 2)
+
+    def test_long_delays(self):
+        self.assertEqual(frame_recorder._apng_delay(1500), (1500, 1000))
+        self.assertEqual(frame_recorder._apng_delay(3_600_000), (3600, 1))
+
+    @unittest.skipIf(Image is None, "Pillow is not installed")
+    def test_exports_decode_to_recorded_frames(self):
+        self._step({(0, 0): 1, (15, 7): 2})
+        self._step({(8, 3): 3, (9, 3): 2})
+        self.clock.now += 1000  # longer than one GIF frame can last
+        self.recorder.stop()
+        frames = [rgba for rgba, _ in self.recorder.frames()]
+
+        out = io.BytesIO()
+        self.recorder.save_apng(out)
+        image = Image.open(io.BytesIO(out.getvalue()))
+        for index, rgba in enumerate(frames):
+            image.seek(index)
+            self.assertEqual(image.convert("RGBA").tobytes(), rgba)
+
+        out = io.BytesIO()
+        self.recorder.save_gif(out, background=0x123456)
+        image = Image.open(io.BytesIO(out.getvalue()))
+        self.assertEqual(image.n_frames, len(frames) + 1)
+        for index, rgba in enumerate(frames):
+            image.seek(index)
+            expected = b"".join(
+                rgba[at:at + 3] if rgba[at + 3] else b"\x12\x34\x56"
+                for at in range(0, len(rgba), 4)
+            )
+            self.assertEqual(image.convert("RGB").tobytes(), expected)
+
+
+class TestGif(unittest.TestCase):
+
+    @unittest.skipIf(Image is None, "Pillow is not installed")
+    def test_lzw_round_trip(self):
+        # Long enough to fill the code table and restart it.
+        indices = [(n * 7919 >> 3) % 200 for n in range(20000)]
+        pixels = b"".join(
+            bytes((i, 255 - i, i // 2, 255)) for i in indices
+        )
+        frame = frame_recorder._gif_frame(
+            (0, 0, 200, 100), pixels, None, 0, 10
+        )
+        image = Image.open(io.BytesIO(
+            b"GIF89a" + struct.pack("<HHBBB", 200, 100, 0, 0, 0)
+            + frame + b"\x3b"
+        ))
+        self.assertEqual(
+            image.convert("RGBA").tobytes(), pixels
+        )
+
+    def test_many_colours_use_fixed_palette(self):
+        pixels = b"".join(
+            bytes((i & 0xFF, i >> 1, 0, 255)) for i in range(512)
+        )
+        frame = frame_recorder._gif_frame(
+            (0, 0, 32, 16), pixels, None, 0, 10
+        )
+        # Image descriptor flags: local table of 256 entries, the 3-3-2
+        # palette.
+        self.assertEqual(frame[8 + 9], 0x87)
+        self.assertEqual(frame[18 + 3:18 + 6], b"\x00\x00\x55")
+
+
+if __name__ == "__main__":
+    unittest.main()
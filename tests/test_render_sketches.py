@@ -0,0 +1,162 @@
+"""
+Unit tests for tools/render_sketches.py: the virtual clock, the browser
+stand-ins and rendering sketches to frame files.
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tools"))
+
+import render_sketches
+
+_EXAMPLES = os.path.join(os.path.dirname(__file__), "..", "examples")
+
+# Shows a 4x4 bitmap on board.DISPLAY and flips its corner pixel on every
+# second 500 ms tick.
+_BLINK = """
+import board, displayio, js
+
+bitmap = displayio.Bitmap(4, 4, 2)
+palette = displayio.Palette(2)
+palette[1] = 0xFF0000
+group = displayio.Group()
+group.append(displayio.TileGrid(bitmap, pixel_shader=palette))
+board.DISPLAY.show(group)
+ticks = 0
+
+def tick():
+    global ticks
+    ticks += 1
+    if ticks % 2 == 0:
+        bitmap[0, 0] = 1 - bitmap[0, 0]
+
+js.setInterval(tick, 500)
+"""
+
+
+class TestClock(unittest.TestCase):
+
+    def test_timers_run_in_due_order(self):
+        clock = render_sketches.Clock()
+        calls = []
+        clock.set_interval(lambda: calls.append(("i", clock.now)), 300)
+        clock.set_timeout(lambda: calls.append(("t", clock.now)), 400)
+        clock.advance(700)
+        self.assertEqual(calls, [("i", 300), ("t", 400), ("i", 600)])
+        self.assertEqual(clock.now, 700)
+
+    def test_clear_inside_callback(self):
+        clock = render_sketches.Clock()
+        calls = []
+
+        def tick():
+            calls.append(clock.now)
+            clock.clear(timer)
+
+        timer = clock.set_interval(tick, 100)
+        clock.advance(1000)
+        self.assertEqual(calls, [100])
+
+    def test_animation_frame_gets_timestamp(self):
+        clock = render_sketches.Clock()
+        stamps = []
+        clock.advance(20)
+        clock.request_animation_frame(stamps.append)
+        clock.advance(100)
+        self.assertAlmostEqual(stamps[0], 2000 / 60)
+
+
+class TestRenderSketch(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.out = directory.name
+        self.sketch = os.path.join(self.out, "blink.py")
+        with open(self.sketch, "w") as f:
+            f.write(_BLINK)
+
+    def _frames(self, result):
+        return [os.path.basename(path) for path in result["frames"]]
+
+    def test_board_display_frames(self):
+        result = render_sketches.render_sketch(
+            self.sketch, self.out, frames=4, interval=500, size=(4, 4)
+        )
+        self.assertEqual(result["sketch"], "blink")
+        self.assertEqual(len(result["frames"]), 4)
+        with open(result["frames"][0], "rb") as f:
+            self.assertEqual(f.read(8), b"\x89PNG\r\n\x1a\n")
+
+    def test_changed_only(self):
+        result = render_sketches.render_sketch(
+            self.sketch, self.out, frames=6, interval=500, size=(4, 4),
+            changed_only=True,
+        )
+        self.assertEqual(
+            self._frames(result),
+            ["frame_00000.png", "frame_00002.png", "frame_00004.png"],
+        )
+
+    def test_canvas_sketch_with_entry_is_deterministic(self):
+        sketch = os.path.join(_EXAMPLES, "radiator.py") + ":run"
+        frames = []
+        for name in ("a", "b"):
+            result = render_sketches.render_sketch(
+                sketch, os.path.join(self.out, name), frames=3,
+                interval=1500, size=(480, 320), changed_only=True,
+            )
+            self.assertEqual(len(result["frames"]), 3)
+            contents = []
+            for path in result["frames"]:
+                with open(path, "rb") as f:
+                    contents.append(f.read())
+            frames.append(contents)
+        self.assertEqual(frames[0], frames[1])
+        self.assertNotEqual(frames[0][0], frames[0][1])
+
+    def test_browser_modules_are_restored(self):
+        before = sys.modules.get("js")
+        render_sketches.render_sketch(self.sketch, self.out, size=(4, 4))
+        self.assertIs(sys.modules.get("js"), before)
+
+
+class TestMain(unittest.TestCase):
+
+    def test_parallel_report(self):
+        with tempfile.TemporaryDirectory() as out:
+            sketches = []
+            for name, source in (("one", _BLINK), ("two", _BLINK),
+                                 ("bad", "raise ValueError('boom')")):
+                path = os.path.join(out, name + ".py")
+                with open(path, "w") as f:
+                    f.write(source)
+                sketches.append(path)
+            report = os.path.join(out, "report.json")
+            with redirect_stdout(io.StringIO()) as stdout:
+                status = render_sketches.main(
+                    sketches + ["--frames", "2", "--size", "4x4", "--jobs",
+                                "2", "--out", out, "--json", report]
+                )
+            self.assertEqual(status, 1)
+            self.assertIn("ValueError: boom", stdout.getvalue())
+            with open(report) as f:
+                results = {entry["sketch"]: entry for entry in json.load(f)}
+            self.assertEqual(len(results["one"]["frames"]), 2)
+            self.assertEqual(len(results["two"]["frames"]), 2)
+            self.assertGreater(results["one"]["seconds"], 0)
+            self.assertIn("error", results[sketches[2]])
+            self.assertEqual(
+                sorted(os.listdir(os.path.join(out, "one"))),
+                ["frame_00000.png", "frame_00001.png"],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
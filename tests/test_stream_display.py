@@ -0,0 +1,242 @@
+"""
+Unit tests for stream_display.py: rectangle encodings, streaming to a
+loopback viewer, backpressure and the WebSocket transport.
+"""
+
+import base64
+import hashlib
+import os
+import random
+import socket
+import struct
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import displayio
+import stream_display
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestEncoding(unittest.TestCase):
+
+    def _round_trip(self, buffer, width, area, encoding):
+        kind, payload = stream_display._encode_rect(
+            buffer, width, area, encoding
+        )
+        x1, y1, x2, y2 = area
+        decoded = stream_display._decode_rect(
+            kind, payload, (x2 - x1) * (y2 - y1)
+        )
+        expected = b"".join(
+            bytes(buffer[(y * width + x1) * 4:(y * width + x2) * 4])
+            for y in range(y1, y2)
+        )
+        self.assertEqual(decoded, expected)
+        return kind, payload
+
+    def test_round_trips(self):
+        rng = random.Random(3)
+        colours = [bytes(rng.randrange(256) for _ in range(4))
+                   for _ in range(5)]
+        buffer = b"".join(
+            colours[min(4, x // 7)] for _ in range(12) for x in range(40)
+        )
+        for encoding in ("raw", "rle", "palette", "auto"):
+            with self.subTest(encoding=encoding):
+                self._round_trip(buffer, 40, (3, 2, 37, 11), encoding)
+
+    def test_long_runs_split(self):
+        buffer = b"\x01\x02\x03\xff" * 600
+        kind, payload = self._round_trip(buffer, 600, (0, 0, 600, 1), "rle")
+        self.assertEqual(kind, stream_display._RLE)
+        self.assertEqual(len(payload), 3 * 5)
+
+    def test_auto_picks_smallest(self):
+        flat = b"\x00\x00\xff\xff" * 64
+        kind, _ = stream_display._encode_rect(flat, 8, (0, 0, 8, 8), "auto")
+        self.assertEqual(kind, stream_display._RLE)
+        stripes = b"".join(
+            bytes((x % 3 * 80, 0, 0, 255)) for _ in range(8) for x in range(8)
+        )
+        kind, _ = stream_display._encode_rect(
+            stripes, 8, (0, 0, 8, 8), "auto"
+        )
+        self.assertEqual(kind, stream_display._PALETTE)
+        noise = random.Random(1).randbytes(64 * 4)
+        kind, _ = stream_display._encode_rect(noise, 8, (0, 0, 8, 8), "auto")
+        self.assertEqual(kind, stream_display._RAW)
+
+    def test_palette_falls_back_to_raw(self):
+        noise = random.Random(2).randbytes(300 * 4)
+        kind, _ = self._round_trip(noise, 300, (0, 0, 300, 1), "palette")
+        self.assertEqual(kind, stream_display._RAW)
+
+    def test_unknown_encoding(self):
+        with self.assertRaises(ValueError):
+            stream_display.StreamDisplay(4, 4, encoding="jpeg")
+
+
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.display = stream_display.StreamDisplay(
+            32, 16, auto_refresh=False
+        )
+        self.addCleanup(self.display.close)
+        self.bitmap = displayio.Bitmap(32, 16, 4)
+        palette = displayio.Palette(4)
+        for index, colour in enumerate(
+                (0x000000, 0xFF0000, 0x00FF00, 0x0000FF)):
+            palette[index] = colour
+        group = displayio.Group()
+        group.append(displayio.TileGrid(self.bitmap, pixel_shader=palette))
+        self.display.show(group)
+        self.display.refresh()
+
+    def _viewer(self):
+        viewer = stream_display.StreamViewer(*self.display.address)
+        self.addCleanup(viewer.close)
+        self.assertTrue(viewer.wait(1))
+        return viewer
+
+    def _synced(self, viewer):
+        return _wait_until(
+            lambda: bytes(viewer.pixels) == bytes(self.display.framebuffer)
+        )
+
+    def test_viewer_mirrors_framebuffer(self):
+        viewer = self._viewer()
+        self.assertEqual((viewer.width, viewer.height), (32, 16))
+        self.assertTrue(self._synced(viewer))
+        first = viewer.bytes_received
+        self.bitmap[5, 5] = 1
+        self.display.refresh()
+        self.assertTrue(viewer.wait(2))
+        self.assertTrue(self._synced(viewer))
+        # Only the damaged pixel travels: header, one rectangle, one raw
+        # pixel.
+        self.assertEqual(viewer.bytes_received - first, 7 + 13 + 4)
+
+    def test_several_viewers(self):
+        viewers = [self._viewer() for _ in range(3)]
+        self.bitmap.fill(2)
+        self.display.refresh()
+        for viewer in viewers:
+            self.assertTrue(self._synced(viewer))
+        self.assertEqual(self.display.viewer_count, 3)
+
+    def test_viewers_share_encoding(self):
+        viewers = [self._viewer() for _ in range(3)]
+        for viewer in viewers:
+            self.assertTrue(self._synced(viewer))
+        self.bitmap[4, 4] = 3
+        with mock.patch.object(
+            stream_display, "_encode_rect", wraps=stream_display._encode_rect
+        ) as encode:
+            self.display.refresh()
+        self.assertEqual(encode.call_count, 1)
+        for viewer in viewers:
+            self.assertTrue(self._synced(viewer))
+
+    def test_slow_viewer_is_coalesced(self):
+        viewer = self._viewer()
+        self.assertTrue(_wait_until(
+            lambda: self.display.stats()["latency_ms"] > 0
+        ))
+        viewer.pause()
+        for n in range(20):
+            self.bitmap[n, 0] = 1 + n % 3
+            self.display.refresh()
+        stats = self.display.stats()
+        # The first frame plus at most two in flight, the rest merged.
+        self.assertLessEqual(stats["frames"], 3)
+        self.assertGreaterEqual(stats["coalesced"], 18)
+        viewer.resume()
+        self.assertTrue(self._synced(viewer))
+        stats = self.display.stats()
+        self.assertLessEqual(stats["frames"], 4)
+        self.assertGreater(stats["bytes_per_frame"], 0)
+        self.assertGreaterEqual(stats["latency_max_ms"], stats["latency_ms"])
+
+    def test_disconnect(self):
+        viewer = self._viewer()
+        viewer.close()
+        self.assertTrue(_wait_until(lambda: self.display.viewer_count == 0))
+        self.bitmap[0, 0] = 1
+        self.display.refresh()
+
+    def test_oversized_message_drops_viewer(self):
+        sock = socket.create_connection(self.display.address)
+        self.addCleanup(sock.close)
+        sock.sendall(stream_display._TCP_HELLO)
+        self.assertTrue(_wait_until(lambda: self.display.viewer_count == 1))
+        # Claims a 2 GiB message; the server must not wait to buffer it.
+        sock.sendall(struct.pack("<I", 1 << 31) + b"A")
+        self.assertTrue(_wait_until(lambda: self.display.viewer_count == 0))
+        sock.settimeout(5)
+        while sock.recv(65536):
+            pass
+
+    def test_websocket(self):
+        sock = socket.create_connection(self.display.address)
+        self.addCleanup(sock.close)
+        key = base64.b64encode(b"0123456789abcdef")
+        sock.sendall(
+            b"GET / HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n"
+            b"Connection: Upgrade\r\nSec-WebSocket-Key: " + key
+            + b"\r\nSec-WebSocket-Version: 13\r\n\r\n"
+        )
+        file = sock.makefile("rb")
+        self.addCleanup(file.close)
+        self.assertIn(b" 101 ", file.readline())
+        headers = []
+        while True:
+            line = file.readline()
+            if line == b"\r\n":
+                break
+            headers.append(line.strip())
+        accept = base64.b64encode(hashlib.sha1(
+            key + b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+        ).digest())
+        self.assertIn(b"Sec-WebSocket-Accept: " + accept, headers)
+
+        def read_message():
+            first, second = file.read(2)
+            self.assertEqual(first, 0x82)
+            size = second & 0x7F
+            if size == 126:
+                (size,) = struct.unpack(">H", file.read(2))
+            elif size == 127:
+                (size,) = struct.unpack(">Q", file.read(8))
+            return file.read(size)
+
+        self.assertEqual(read_message(), b"H" + struct.pack("<HH", 32, 16))
+        frame = read_message()
+        self.assertEqual(frame[:1], b"F")
+        sequence = struct.unpack_from("<I", frame, 1)[0]
+        # Client frames are masked.
+        mask = b"\x01\x02\x03\x04"
+        ack = b"A" + struct.pack("<I", sequence)
+        sock.sendall(
+            bytes((0x82, 0x80 | len(ack))) + mask
+            + bytes(b ^ mask[i & 3] for i, b in enumerate(ack))
+        )
+        self.assertTrue(_wait_until(
+            lambda: self.display.stats()["latency_ms"] > 0
+        ))
+
+
+if __name__ == "__main__":
+    unittest.main()
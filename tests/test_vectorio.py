@@ -0,0 +1,223 @@
+"""
+Unit tests for vectorio.py: shape rasterization and its integration with
+displayio.Group and Display damage tracking, under CPython.
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import displayio
+import vectorio
+
+
+def _palette(*colors):
+    palette = displayio.Palette(len(colors))
+    for index, color in enumerate(colors):
+        palette[index] = color
+    return palette
+
+
+def _mask(shape, w, h, offset_x=0, offset_y=0):
+    """Render *shape* alone and return rows of '#' (painted) and '.'."""
+    group = displayio.Group(x=offset_x, y=offset_y)
+    group.append(shape)
+    pixels = bytearray(w * h * 4)
+    group._render_to_buffer(pixels, w, h, 0, 0)
+    return [
+        "".join(
+            "#" if pixels[(y * w + x) * 4 + 3] else "." for x in range(w)
+        )
+        for y in range(h)
+    ]
+
+
+class TestRectangle(unittest.TestCase):
+
+    def test_fills_area(self):
+        rect = vectorio.Rectangle(
+            pixel_shader=_palette(0xFF0000), width=3, height=2, x=1, y=1
+        )
+        self.assertEqual(_mask(rect, 5, 4), [".....", ".###.", ".###.", "....."])
+
+    def test_colour(self):
+        rect = vectorio.Rectangle(
+            pixel_shader=_palette(0, 0x123456), width=1, height=1,
+            color_index=1,
+        )
+        pixels = bytearray(4)
+        rect._render_to_buffer(pixels, 1, 1, 0, 0)
+        self.assertEqual(bytes(pixels), b"\x12\x34\x56\xff")
+
+    def test_transparent_colour_draws_nothing(self):
+        palette = _palette(0xFF0000)
+        palette.make_transparent(0)
+        rect = vectorio.Rectangle(pixel_shader=palette, width=2, height=2)
+        self.assertEqual(_mask(rect, 2, 2), ["..", ".."])
+        self.assertIsNone(rect._opaque_area(0, 0))
+
+    def test_opaque_area(self):
+        rect = vectorio.Rectangle(
+            pixel_shader=_palette(0xFF0000), width=4, height=3
+        )
+        self.assertEqual(rect._opaque_area(2, 1, 2), (2, 1, 10, 7))
+
+    def test_size_validation(self):
+        with self.assertRaises(ValueError):
+            vectorio.Rectangle(pixel_shader=_palette(0), width=0, height=2)
+
+
+class TestCircle(unittest.TestCase):
+
+    def test_matches_pixel_test(self):
+        radius = 6
+        circle = vectorio.Circle(
+            pixel_shader=_palette(0xFF0000), radius=radius, x=7, y=7
+        )
+        expected = [
+            "".join(
+                "#" if (x - 7) ** 2 + (y - 7) ** 2 <= radius * radius else "."
+                for x in range(15)
+            )
+            for y in range(15)
+        ]
+        self.assertEqual(_mask(circle, 15, 15), expected)
+
+    def test_bounds_follow_radius(self):
+        circle = vectorio.Circle(pixel_shader=_palette(0), radius=3, x=10, y=5)
+        self.assertEqual(circle._area_in_parent(), (7, 2, 14, 9))
+        circle.radius = 1
+        self.assertEqual(circle._area_in_parent(), (9, 4, 12, 7))
+
+    def test_span_memory_is_per_row(self):
+        circle = vectorio.Circle(pixel_shader=_palette(0), radius=50)
+        self.assertEqual(len(circle._row_spans()), 101)
+
+    def test_clipped_at_buffer_edge(self):
+        circle = vectorio.Circle(pixel_shader=_palette(0), radius=2)
+        self.assertEqual(_mask(circle, 3, 3), ["###", "##.", "#.."])
+
+
+class TestPolygon(unittest.TestCase):
+
+    def test_triangle(self):
+        triangle = vectorio.Polygon(
+            pixel_shader=_palette(0xFF0000),
+            points=[(0, 0), (4, 0), (0, 4)],
+        )
+        self.assertEqual(_mask(triangle, 4, 4), ["###.", "##..", "#...", "...."])
+
+    def test_offset(self):
+        square = vectorio.Polygon(
+            pixel_shader=_palette(0), points=[(0, 0), (2, 0), (2, 2), (0, 2)],
+            x=1, y=1,
+        )
+        self.assertEqual(_mask(square, 4, 4), ["....", ".##.", ".##.", "...."])
+
+    def test_concave(self):
+        # A "U": two prongs joined along the bottom.
+        shape = vectorio.Polygon(
+            pixel_shader=_palette(0),
+            points=[(0, 0), (2, 0), (2, 2), (3, 2), (3, 0), (5, 0),
+                    (5, 4), (0, 4)],
+        )
+        self.assertEqual(
+            _mask(shape, 5, 4), ["##.##", "##.##", "#####", "#####"]
+        )
+
+    def test_adjacent_polygons_do_not_overlap(self):
+        left = vectorio.Polygon(
+            pixel_shader=_palette(0), points=[(0, 0), (3, 0), (1, 4), (0, 4)]
+        )
+        right = vectorio.Polygon(
+            pixel_shader=_palette(0), points=[(3, 0), (4, 0), (4, 4), (1, 4)]
+        )
+        for row_left, row_right in zip(_mask(left, 4, 4), _mask(right, 4, 4)):
+            for a, b in zip(row_left, row_right):
+                self.assertNotEqual((a, b), ("#", "#"))
+                self.assertIn("#", (a, b))
+
+    def test_points_update(self):
+        polygon = vectorio.Polygon(
+            pixel_shader=_palette(0), points=[(0, 0), (1, 0), (1, 1)]
+        )
+        polygon.points = [(0, 0), (3, 0), (3, 2), (0, 2)]
+        self.assertEqual(_mask(polygon, 3, 2), ["###", "###"])
+
+    def test_too_few_points(self):
+        with self.assertRaises(ValueError):
+            vectorio.Polygon(pixel_shader=_palette(0), points=[(0, 0), (1, 1)])
+
+
+class TestShapesInGroups(unittest.TestCase):
+
+    def test_scaled_group(self):
+        group = displayio.Group(scale=2, x=1)
+        group.append(vectorio.Rectangle(
+            pixel_shader=_palette(0), width=1, height=1, x=1, y=0,
+        ))
+        display = displayio.HeadlessDisplay(6, 3, auto_refresh=False)
+        display.show(group)
+        display.refresh()
+        fb = display.framebuffer
+        painted = [
+            "".join("#" if fb[(y * 6 + x) * 4 + 3] else "." for x in range(6))
+            for y in range(3)
+        ]
+        self.assertEqual(painted, ["...##.", "...##.", "......"])
+
+    def test_group_bounds_include_shapes(self):
+        group = displayio.Group()
+        circle = vectorio.Circle(pixel_shader=_palette(0), radius=2, x=5, y=5)
+        group.append(circle)
+        self.assertEqual(group._content_bounds(), (3, 3, 8, 8))
+        circle.x = 10
+        self.assertEqual(group._content_bounds(), (8, 3, 13, 8))
+
+    def test_moving_shape_damages_old_and_new_area(self):
+        display = displayio.HeadlessDisplay(100, 100, auto_refresh=False)
+        group = displayio.Group()
+        circle = vectorio.Circle(pixel_shader=_palette(0xFF0000), radius=3,
+                                 x=10, y=10)
+        group.append(circle)
+        display.show(group)
+        display.refresh()
+        circle.x = 20
+        self.assertEqual(
+            sorted(display._collect_damage()),
+            [(7, 7, 14, 14), (17, 7, 24, 14)],
+        )
+
+    def test_colour_change_damages_shape(self):
+        display = displayio.HeadlessDisplay(50, 50, auto_refresh=False)
+        group = displayio.Group()
+        rect = vectorio.Rectangle(pixel_shader=_palette(0, 1), width=4,
+                                  height=4, x=5, y=6)
+        group.append(rect)
+        display.show(group)
+        display.refresh()
+        rect.color_index = 1
+        self.assertEqual(display._collect_damage(), [(5, 6, 9, 10)])
+
+    def test_rectangle_occludes_layers_below(self):
+        display = displayio.HeadlessDisplay(40, 40, auto_refresh=False)
+        group = displayio.Group()
+        bitmap = displayio.Bitmap(40, 40, 1)
+        tilegrid = displayio.TileGrid(bitmap, pixel_shader=_palette(0x00FF00))
+        group.append(tilegrid)
+        group.append(vectorio.Rectangle(
+            pixel_shader=_palette(0xFF0000), width=40, height=40,
+        ))
+        drawn = []
+        original = tilegrid._draw
+        tilegrid._draw = lambda *args: drawn.append(args) or original(*args)
+        display.show(group)
+        display.refresh()
+        self.assertEqual(drawn, [])
+        self.assertEqual(bytes(display.framebuffer[:4]), b"\xff\x00\x00\xff")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,225 @@
+"""
+Unit tests for worker_display.py and for displayio running in a Web
+Worker, with stand-ins for the worker's ``js`` globals, transferable
+buffers and ``OffscreenCanvas``.
+"""
+
+import os
+import sys
+import types
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import displayio
+import worker_display
+
+
+class _ArrayBuffer:
+    def __init__(self, size):
+        self.data = bytearray(size)
+        self.detached = False
+
+
+class _Uint8ClampedArray:
+    def __init__(self, size):
+        self.buffer = _ArrayBuffer(size)
+
+    @classmethod
+    def new(cls, size):
+        return cls(size)
+
+    def assign(self, data):
+        self.buffer.data[:] = data
+
+
+class _Worker:
+    """The worker's ``js`` globals; postMessage hands frames to the page."""
+
+    def __init__(self):
+        self.frames = []
+        self.timeouts = []
+        self.messages = []
+        self.requestAnimationFrame = self.frames.append
+        self.Uint8ClampedArray = _Uint8ClampedArray
+        self.Object = types.SimpleNamespace(fromEntries=dict)
+        self.ImageData = types.SimpleNamespace(
+            new=lambda data, width, height: types.SimpleNamespace(
+                data=data, width=width, height=height
+            )
+        )
+
+    def setTimeout(self, callback, ms):
+        self.timeouts.append((callback, ms))
+
+    def postMessage(self, message, transfer):
+        # Structured clone: transferred buffers move to the page.
+        received = {
+            "type": message["type"],
+            "rects": [
+                rect[:4] + [bytes(rect[4].buffer.data)]
+                for rect in message["rects"]
+            ],
+        }
+        for buffer in transfer:
+            buffer.detached = True
+        self.messages.append((received, message, transfer))
+
+
+def _to_js(obj, dict_converter=None):
+    if isinstance(obj, dict) and dict_converter is not None:
+        return dict_converter(
+            (key, _to_js(value, dict_converter)) for key, value in obj.items()
+        )
+    if isinstance(obj, list):
+        return [_to_js(item, dict_converter) for item in obj]
+    return obj
+
+
+def _install(test, js):
+    ffi = types.SimpleNamespace(create_proxy=_Proxy, to_js=_to_js)
+    patcher = mock.patch.dict(sys.modules, {
+        "js": js,
+        "pyodide": types.SimpleNamespace(ffi=ffi),
+        "pyodide.ffi": ffi,
+    })
+    patcher.start()
+    test.addCleanup(patcher.stop)
+
+
+class _Proxy:
+    def __init__(self, obj):
+        self._obj = obj
+
+    def __call__(self, *args):
+        return self._obj(*args)
+
+    def getBuffer(self, kind):
+        memory = memoryview(self._obj)
+        data = types.SimpleNamespace(memory=memory, byteLength=len(memory))
+        return types.SimpleNamespace(data=data, release=memory.release)
+
+    def destroy(self):
+        self._obj = None
+
+
+def _scene(width, height):
+    bitmap = displayio.Bitmap(width, height, 4)
+    palette = displayio.Palette(4)
+    for index, colour in enumerate((0x000000, 0xFF0000, 0x00FF00, 0x0000FF)):
+        palette[index] = colour
+    group = displayio.Group()
+    group.append(displayio.TileGrid(bitmap, pixel_shader=palette))
+    return group, bitmap
+
+
+class TestTransferDisplay(unittest.TestCase):
+
+    def setUp(self):
+        self.js = _Worker()
+        _install(self, self.js)
+        self.display = worker_display.TransferDisplay(
+            16, 8, auto_refresh=False
+        )
+        self.addCleanup(self.display.close)
+        self.group, self.bitmap = _scene(16, 8)
+        self.display.show(self.group)
+        self.display.refresh()
+        self.page = bytearray(16 * 8 * 4)
+
+    def _paint(self):
+        """Paint the posted frames onto the page's canvas."""
+        for received, _, _ in self.js.messages:
+            for x, y, width, height, pixels in received["rects"]:
+                for row in range(height):
+                    at = ((y + row) * 16 + x) * 4
+                    self.page[at:at + width * 4] = (
+                        pixels[row * width * 4:(row + 1) * width * 4]
+                    )
+        del self.js.messages[:]
+
+    def test_page_mirrors_framebuffer(self):
+        for n in range(5):
+            self.bitmap[3 * n, n] = 1 + n % 3
+            self.bitmap[15 - n, 7 - n] = 3
+            self.display.refresh()
+            sent = self.js.messages[:]
+            self._paint()
+            self.assertEqual(self.page, self.display.framebuffer)
+            for _, message, transfer in sent:
+                buffers = [rect[4].buffer for rect in message["rects"]]
+                self.assertEqual(transfer, buffers)
+                self.assertTrue(all(buffer.detached for buffer in buffers))
+
+    def test_only_damage_is_posted(self):
+        del self.js.messages[:]
+        self.bitmap[5, 2] = 1
+        self.display.refresh()
+        (received, _, _), = self.js.messages
+        self.assertEqual(
+            received["rects"], [[5, 2, 1, 1, b"\xff\x00\x00\xff"]]
+        )
+
+    def test_custom_post(self):
+        del self.js.messages[:]
+        posted = []
+        display = worker_display.TransferDisplay(
+            4, 4, post=lambda message, transfer: posted.append(message)
+        )
+        self.addCleanup(display.close)
+        display.show(_scene(4, 4)[0])
+        self.assertEqual(len(posted), 1)
+        self.assertEqual(self.js.messages, [])
+
+    def test_auto_refresh_uses_animation_frames(self):
+        self.display.auto_refresh = True
+        self.assertEqual(len(self.js.frames), 1)
+        self.assertIsNone(self.display._timer)
+        self.js.frames.pop()(0.0)
+        del self.js.messages[:]
+        self.bitmap[0, 0] = 2
+        self.bitmap[1, 0] = 2
+        self.assertEqual(len(self.js.frames), 1)
+        self.js.frames.pop()(0.0)
+        self.assertEqual(len(self.js.messages), 1)
+
+
+class _OffscreenCanvas:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.uploads = []
+
+    def getContext(self, kind):
+        return types.SimpleNamespace(putImageData=self._put)
+
+    def _put(self, image, dx, dy, x, y, w, h):
+        self.uploads.append((x, y, w, h))
+
+
+class TestOffscreenCanvas(unittest.TestCase):
+
+    def setUp(self):
+        self.js = _Worker()
+        # A worker in a browser without worker animation frames.
+        del self.js.requestAnimationFrame
+        _install(self, self.js)
+
+    def test_display_draws_on_offscreen_canvas(self):
+        canvas = _OffscreenCanvas(300, 150)
+        display = displayio.Display(canvas, width=16, height=8)
+        self.addCleanup(setattr, display, "_auto_refresh", False)
+        group, bitmap = _scene(16, 8)
+        display.show(group)
+        self.assertEqual(canvas.uploads, [(0, 0, 16, 8)])
+        bitmap[2, 3] = 1
+        # Frames fall back to timeouts.
+        (callback, ms), = self.js.timeouts
+        self.assertAlmostEqual(ms, 1000 / 60)
+        callback()
+        self.assertEqual(canvas.uploads[-1], (2, 3, 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
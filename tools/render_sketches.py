@@ -0,0 +1,440 @@
+"""
+render_sketches - Render displayio sketches to PNG frame sequences.
+
+Runs sketches written for the browser under plain CPython: a stand-in
+``js`` module provides the ``<canvas id="display">`` element, ``ImageData``
+and the timer functions, and ``board.DISPLAY`` is a
+:class:`displayio.HeadlessDisplay`.  Timers run on a virtual clock, so the
+same sketch always produces the same frames, however long it takes to
+render them.
+
+Usage::
+
+    python tools/render_sketches.py sketch.py --frames 30 --out frames/
+    python tools/render_sketches.py examples/radiator.py:run \\
+        --interval 1500 --frames 10 --size 800x480 --changed-only
+    python tools/render_sketches.py sketches/*.py --jobs 4
+
+A sketch is executed as ``__main__`` with a global ``canvas`` (as in the
+playground); a sketch given as ``path.py:function`` then has *function*
+called, for sketches that set themselves up in a function.  Frame 0 is
+captured once the sketch has run; every further frame advances the
+clock by *interval* milliseconds, running the timers that fall due in
+order.  A
+frame comes from ``board.DISPLAY`` when the sketch showed a group on it,
+otherwise from the canvas.  Frames are written to
+``<out>/<sketch name>/frame_NNNNN.png``, numbered by frame so that
+``--changed-only`` leaves gaps where nothing changed.
+
+Each sketch runs in its own worker process (on Python 3.11 and later;
+earlier versions reuse workers, so a sketch's peak memory includes the
+sketches run before it in the same worker); the report lists the frames
+written, the time spent running and rendering the sketch (PNG encoding
+excluded) and the worker's peak resident memory.
+"""
+
+import argparse
+import concurrent.futures
+import heapq
+import json
+import os
+import runpy
+import sys
+import time
+import types
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_HERE, "..", "src"))
+
+import board  # noqa: E402
+import displayio  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Browsers run timers no more often than this (milliseconds).
+_MIN_DELAY = 1
+_FRAME_MS = 1000 / 60
+
+
+# ---------------------------------------------------------------------------
+# Virtual clock
+# ---------------------------------------------------------------------------
+
+class Clock:
+    """Deterministic stand-in for the browser's timers.
+
+    Time only moves in :meth:`advance`, which runs the callbacks falling
+    due in order of due time, then of scheduling.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self._queue = []
+        # timer id -> repeat interval (None for one-shot timers).
+        self._active = {}
+        self._next_id = 1
+
+    def _schedule(self, due, callback, args, repeat):
+        timer_id = self._next_id
+        self._next_id += 1
+        self._active[timer_id] = repeat
+        heapq.heappush(self._queue, (due, timer_id, callback, args))
+        return timer_id
+
+    def set_timeout(self, callback, delay=0, *args):
+        delay = max(float(delay or 0), _MIN_DELAY)
+        return self._schedule(self.now + delay, callback, args, None)
+
+    def set_interval(self, callback, delay=0, *args):
+        delay = max(float(delay or 0), _MIN_DELAY)
+        return self._schedule(self.now + delay, callback, args, delay)
+
+    def request_animation_frame(self, callback):
+        due = (self.now // _FRAME_MS + 1) * _FRAME_MS
+        return self._schedule(due, callback, None, None)
+
+    def clear(self, timer_id):
+        self._active.pop(timer_id, None)
+
+    def advance(self, ms):
+        """Move the clock *ms* milliseconds on, running due callbacks."""
+        end = self.now + ms
+        queue = self._queue
+        while queue and queue[0][0] <= end:
+            due, timer_id, callback, args = heapq.heappop(queue)
+            if timer_id not in self._active:
+                continue
+            self.now = due
+            repeat = self._active[timer_id]
+            if repeat is None:
+                del self._active[timer_id]
+            else:
+                # Re-armed under the same id, before the callback can
+                # clear it.
+                heapq.heappush(
+                    queue, (due + repeat, timer_id, callback, args)
+                )
+            if args is None:
+                callback(due)
+            else:
+                callback(*args)
+        self.now = end
+
+
+# ---------------------------------------------------------------------------
+# Browser stand-ins
+# ---------------------------------------------------------------------------
+
+class _Canvas:
+    """An HTML canvas element holding RGBA pixels; resizing clears it."""
+
+    def __init__(self, width, height):
+        self._width = width
+        self._height = height
+        self.pixels = bytearray(width * height * 4)
+
+    def _resize(self, width, height):
+        self._width = int(width)
+        self._height = int(height)
+        self.pixels = bytearray(self._width * self._height * 4)
+
+    @property
+    def width(self):
+        return self._width
+
+    @width.setter
+    def width(self, value):
+        self._resize(value, self._height)
+
+    @property
+    def height(self):
+        return self._height
+
+    @height.setter
+    def height(self, value):
+        self._resize(self._width, value)
+
+    def getContext(self, kind):
+        return _Context(self)
+
+
+class _Context:
+    """The subset of ``CanvasRenderingContext2D`` displayio uses."""
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+
+    def putImageData(self, image, dx, dy, x=0, y=0, w=None, h=None):
+        canvas = self.canvas
+        src = image.data.memory
+        if w is None:
+            w, h = image.width, image.height
+        # Clip the dirty rectangle to the image and the canvas.
+        x1 = max(x, 0, -dx)
+        y1 = max(y, 0, -dy)
+        x2 = min(x + w, image.width, canvas.width - dx)
+        y2 = min(y + h, image.height, canvas.height - dy)
+        if x1 >= x2 or y1 >= y2:
+            return
+        src_stride = image.width * 4
+        dst_stride = canvas.width * 4
+        size = (x2 - x1) * 4
+        for row in range(y1, y2):
+            src_at = row * src_stride + x1 * 4
+            dst_at = (row + dy) * dst_stride + (x1 + dx) * 4
+            canvas.pixels[dst_at:dst_at + size] = src[src_at:src_at + size]
+
+    def clearRect(self, x, y, w, h):
+        canvas = self.canvas
+        x1, y1 = max(x, 0), max(y, 0)
+        x2, y2 = min(x + w, canvas.width), min(y + h, canvas.height)
+        if x1 >= x2:
+            return
+        blank = bytes((x2 - x1) * 4)
+        for row in range(y1, y2):
+            at = (row * canvas.width + x1) * 4
+            canvas.pixels[at:at + len(blank)] = blank
+
+
+class _Uint8ClampedArray:
+    def __init__(self, obj):
+        self.memory = memoryview(obj).cast("B")
+        self.byteLength = len(self.memory)
+
+
+class _BufferView:
+    def __init__(self, obj):
+        self.data = _Uint8ClampedArray(obj)
+
+    def release(self):
+        self.data.memory.release()
+
+
+class _Proxy:
+    """``pyodide.ffi.create_proxy`` result: callable, with buffer views."""
+
+    def __init__(self, obj):
+        self._obj = obj
+
+    def __call__(self, *args):
+        return self._obj(*args)
+
+    def getBuffer(self, kind="u8"):
+        return _BufferView(self._obj)
+
+    def destroy(self):
+        self._obj = None
+
+
+def _browser_modules(clock, canvas):
+    """Return the stand-in ``js``, ``pyodide`` and ``pyodide.ffi``
+    modules."""
+    js = types.ModuleType("js")
+    js.document = types.SimpleNamespace(
+        getElementById=lambda element_id: canvas
+        if element_id == "display" else None
+    )
+    js.ImageData = types.SimpleNamespace(
+        new=lambda data, width, height: types.SimpleNamespace(
+            data=data, width=width, height=height
+        )
+    )
+    js.performance = types.SimpleNamespace(now=lambda: clock.now)
+    js.console = types.SimpleNamespace(log=print)
+    js.setTimeout = clock.set_timeout
+    js.setInterval = clock.set_interval
+    js.requestAnimationFrame = clock.request_animation_frame
+    js.clearTimeout = js.clearInterval = clock.clear
+    js.cancelAnimationFrame = clock.clear
+
+    ffi = types.ModuleType("pyodide.ffi")
+    ffi.create_proxy = _Proxy
+    ffi.to_js = lambda obj, **kwargs: obj
+    pyodide = types.ModuleType("pyodide")
+    pyodide.ffi = ffi
+    return {"js": js, "pyodide": pyodide, "pyodide.ffi": ffi}
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+class _BoardDisplay(displayio.HeadlessDisplay):
+    """``board.DISPLAY``: takes its animation frames from the virtual
+    clock instead of a timer thread."""
+
+    def __init__(self, width, height, clock):
+        self._clock = clock
+        super().__init__(width, height)
+
+    def _request_frame(self):
+        self._clock.request_animation_frame(self._on_frame)
+
+
+def _capture(canvas, display):
+    """Return ``(width, height, rgba)`` of the sketch's current frame."""
+    if display.root_group is not None:
+        # Changes made by timers that ran just now would show on the
+        # next animation frame.
+        if display.auto_refresh:
+            display.refresh()
+        return display.width, display.height, bytes(display.framebuffer)
+    return canvas.width, canvas.height, bytes(canvas.pixels)
+
+
+def _peak_memory():
+    """Peak resident memory of this process in bytes, or None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _split_sketch(sketch):
+    """Split ``path.py:function`` into ``(path, function)``."""
+    path, sep, entry = sketch.rpartition(":")
+    if sep and path.endswith(".py") and entry.isidentifier():
+        return path, entry
+    return sketch, None
+
+
+def render_sketch(sketch, out_dir, *, frames=1, interval=1000,
+                  changed_only=False, size=(320, 240)):
+    """Run *sketch* (``path.py`` or ``path.py:function``) and write its
+    frames under *out_dir*.
+
+    Returns a dict with the sketch name, the frames written, the render
+    time in seconds and the peak resident memory in bytes.
+    """
+    path, entry = _split_sketch(sketch)
+    path = os.path.abspath(path)
+    name = os.path.splitext(os.path.basename(path))[0]
+    frame_dir = os.path.join(out_dir, name)
+    os.makedirs(frame_dir, exist_ok=True)
+
+    clock = Clock()
+    canvas = _Canvas(*size)
+    display = _BoardDisplay(*size, clock)
+    saved = {key: sys.modules.get(key) for key in ("js", "pyodide",
+                                                    "pyodide.ffi")}
+    sys.modules.update(_browser_modules(clock, canvas))
+    sys.path.insert(0, os.path.dirname(path))
+    board._set_display(display)
+    written = []
+    elapsed = 0.0
+    try:
+        start = time.perf_counter()
+        namespace = runpy.run_path(
+            path, init_globals={"canvas": canvas}, run_name="__main__"
+        )
+        if entry is not None:
+            namespace[entry]()
+        previous = None
+        for index in range(frames):
+            if index:
+                clock.advance(interval)
+            width, height, rgba = _capture(canvas, display)
+            elapsed += time.perf_counter() - start
+            if not changed_only or rgba != previous:
+                file = os.path.join(frame_dir, "frame_%05d.png" % index)
+                with open(file, "wb") as f:
+                    f.write(displayio._encode_png(rgba, width, height))
+                written.append(file)
+            previous = rgba
+            start = time.perf_counter()
+    finally:
+        board._set_display(None)
+        display.close()
+        sys.path.remove(os.path.dirname(path))
+        for key, module in saved.items():
+            if module is None:
+                sys.modules.pop(key, None)
+            else:
+                sys.modules[key] = module
+    return {
+        "sketch": name,
+        "frames": written,
+        "seconds": elapsed,
+        "peak_bytes": _peak_memory(),
+    }
+
+
+def render_all(sketches, out_dir, *, jobs=None, **options):
+    """Render each of *sketches* in its own worker process, *jobs* at a
+    time.
+
+    Yields ``(sketch, result)`` as sketches finish, where *result* is the
+    dict returned by :func:`render_sketch` or the exception the sketch
+    raised.
+    """
+    pool_options = {}
+    if sys.version_info >= (3, 11):
+        pool_options["max_tasks_per_child"] = 1
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs, **pool_options) as pool:
+        futures = {
+            pool.submit(render_sketch, sketch, out_dir, **options): sketch
+            for sketch in sketches
+        }
+        for future in concurrent.futures.as_completed(futures):
+            error = future.exception()
+            yield futures[future], error or future.result()
+
+
+def _parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("sketches", nargs="+", metavar="sketch",
+                        help="sketch .py file, optionally followed by "
+                             ":function to call after it has run")
+    parser.add_argument("--out", default="frames",
+                        help="output directory (default: frames)")
+    parser.add_argument("--frames", type=int, default=1,
+                        help="frames per sketch (default: 1)")
+    parser.add_argument("--interval", type=float, default=1000,
+                        help="virtual milliseconds between frames "
+                             "(default: 1000)")
+    parser.add_argument("--size", type=_parse_size, default=(320, 240),
+                        help="canvas size WxH (default: 320x240)")
+    parser.add_argument("--changed-only", action="store_true",
+                        help="skip frames identical to the previous one")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(),
+                        help="sketches rendered in parallel "
+                             "(default: CPU count)")
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args(argv)
+
+    report = []
+    print("%-24s %7s %10s %10s" % ("sketch", "frames", "ms", "peak MiB"))
+    for sketch, result in render_all(
+            args.sketches, args.out, jobs=args.jobs, frames=args.frames,
+            interval=args.interval,
+            changed_only=args.changed_only, size=args.size):
+        if isinstance(result, Exception):
+            print("%-24s failed: %s: %s" % (
+                sketch, type(result).__name__, result))
+            report.append({"sketch": sketch, "error": repr(result)})
+            continue
+        peak = result["peak_bytes"]
+        print("%-24s %7d %10.1f %10s" % (
+            result["sketch"], len(result["frames"]),
+            result["seconds"] * 1e3,
+            "-" if peak is None else "%.1f" % (peak / 2 ** 20),
+        ))
+        report.append(result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if any("error" in result for result in report) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())